@@ -0,0 +1,124 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""A probabilistic filter for ruling out that accessions are in use."""
+
+import math
+import os
+import struct
+from collections.abc import Iterable
+from hashlib import blake2b
+from pathlib import Path
+
+# Identifies files containing a serialized filter:
+_MAGIC = b"MDAF"
+# Magic, capacity, number of bits, number of hash functions, number of accessions:
+_HEADER = struct.Struct("<4sQQQQ")
+
+
+class AccessionFilterError(RuntimeError):
+    """Raised when a filter cannot be loaded."""
+
+
+class AccessionFilter:
+    """A Bloom filter over accessions.
+
+    A lookup never yields a false negative, i.e. if an accession is reported to be
+    absent, it is definitely not in use. Accessions reported as present must be
+    checked against the exact store, since they might be false positives. The
+    probability of a false positive stays below the configured error rate as long
+    as the number of added accessions does not exceed the capacity.
+    """
+
+    def __init__(self, *, capacity: int, error_rate: float):
+        """Create an empty filter dimensioned for the given capacity and error rate."""
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self._bit_count = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._hash_count = max(1, round(self._bit_count / capacity * math.log(2)))
+        self._bits = bytearray((self._bit_count + 7) // 8)
+        self.count = 0
+
+    def _positions(self, accession: str) -> Iterable[int]:
+        """Get the bit positions for the given accession using double hashing."""
+        digest = blake2b(accession.encode("utf-8"), digest_size=16).digest()
+        hash_a = int.from_bytes(digest[:8], "little")
+        hash_b = int.from_bytes(digest[8:], "little") | 1
+        bit_count = self._bit_count
+        return (
+            (hash_a + index * hash_b) % bit_count for index in range(self._hash_count)
+        )
+
+    def add(self, accession: str) -> None:
+        """Add an accession to the filter."""
+        bits = self._bits
+        for position in self._positions(accession):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, accession: object) -> bool:
+        """Check whether the given accession might be in use."""
+        if not isinstance(accession, str):
+            return False
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(accession)
+        )
+
+    @property
+    def is_full(self) -> bool:
+        """Whether more accessions have been added than the filter is dimensioned for."""
+        return self.count > self.capacity
+
+    def save(self, path: Path) -> None:
+        """Persist the filter to the given path. The file is replaced atomically."""
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "wb") as file:
+            file.write(
+                _HEADER.pack(
+                    _MAGIC, self.capacity, self._bit_count, self._hash_count, self.count
+                )
+            )
+            file.write(self._bits)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "AccessionFilter":
+        """Load a filter persisted to the given path.
+
+        Raises:
+            AccessionFilterError: If the file does not contain a valid filter.
+        """
+        try:
+            with open(path, "rb") as file:
+                header = file.read(_HEADER.size)
+                bits = file.read()
+        except OSError as error:
+            raise AccessionFilterError(f"Cannot read filter at {path}.") from error
+
+        if len(header) != _HEADER.size:
+            raise AccessionFilterError(f"No valid filter at {path}.")
+        magic, capacity, bit_count, hash_count, count = _HEADER.unpack(header)
+        if magic != _MAGIC or len(bits) != (bit_count + 7) // 8:
+            raise AccessionFilterError(f"No valid filter at {path}.")
+
+        accession_filter = cls.__new__(cls)
+        accession_filter._bit_count = bit_count
+        accession_filter._hash_count = hash_count
+        accession_filter._bits = bytearray(bits)
+        accession_filter.capacity = capacity
+        accession_filter.count = count
+        return accession_filter
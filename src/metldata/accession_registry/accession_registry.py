@@ -16,14 +16,21 @@
 
 """Handling of the accession handler."""
 
+import logging
 import secrets
+import threading
+from collections import deque
 from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
 from metldata.accession_registry.accession_store import AccessionStore
 
+log = logging.getLogger(__name__)
+
 
 class AccessionRegistryConfig(BaseSettings):
     """Config parameters and their defaults."""
@@ -43,6 +50,102 @@ class AccessionRegistryConfig(BaseSettings):
 
     suffix_length: int = Field(8, description="Length of the numeric ID suffix.")
 
+    accession_pool_size: int = Field(
+        default=0,
+        description=(
+            "The number of accessions that are generated and registered in advance"
+            + " per resource type, so that requested accessions can be taken from"
+            + " memory. Set to 0 to disable the pools."
+        ),
+        ge=0,
+    )
+    accession_pool_refill_threshold: int = Field(
+        default=0,
+        description=(
+            "A pool is refilled in the background as soon as fewer accessions than"
+            + " this number remain in it."
+        ),
+        ge=0,
+    )
+    accession_reservations_path: Path | None = Field(
+        default=None,
+        description=(
+            "A file for tracking the accessions that have been registered for a pool"
+            + " but not handed out yet, so that they can be reclaimed when the"
+            + " registry is restarted. Each concurrently running registry needs its own"
+            + " file. If not set, unused reservations are lost on shutdown."
+        ),
+    )
+
+
+class ReservationLog:
+    """An append-only log tracking which pre-registered accessions have been
+    reserved for a pool and which of them have been handed out since.
+    """
+
+    def __init__(self, *, path: Path):
+        """Open the log at the given path, creating it if it does not exist."""
+        self._path = path
+        self._path.touch()
+
+    def unused(self) -> dict[str, list[str]]:
+        """Get the reserved but unused accessions by resource type in the order they
+        have been reserved.
+        """
+        unused: dict[str, dict[str, None]] = {}
+        with open(self._path, encoding="utf-8") as log:
+            for line in log:
+                if not line.endswith("\n"):
+                    # ignore an incomplete last line
+                    break
+                action, resource_type, accession = line.rstrip("\n").split("\t")
+                accessions = unused.setdefault(resource_type, {})
+                if action == "reserved":
+                    accessions[accession] = None
+                else:
+                    accessions.pop(accession, None)
+
+        return {
+            resource_type: list(accessions)
+            for resource_type, accessions in unused.items()
+            if accessions
+        }
+
+    def compact(self) -> dict[str, list[str]]:
+        """Rewrite the log to only contain the unused reservations, which are
+        returned.
+        """
+        unused = self.unused()
+        self._path.write_text(
+            "".join(
+                f"reserved\t{resource_type}\t{accession}\n"
+                for resource_type, accessions in unused.items()
+                for accession in accessions
+            ),
+            encoding="utf-8",
+        )
+        return unused
+
+    def _append(self, *, action: str, resource_type: str, accessions: list[str]):
+        """Append entries with the given action for the given accessions."""
+        with open(self._path, "a", encoding="utf-8") as log:
+            log.write(
+                "".join(
+                    f"{action}\t{resource_type}\t{accession}\n"
+                    for accession in accessions
+                )
+            )
+
+    def reserve(self, *, resource_type: str, accessions: list[str]) -> None:
+        """Track that the given accessions have been reserved."""
+        self._append(
+            action="reserved", resource_type=resource_type, accessions=accessions
+        )
+
+    def use(self, *, resource_type: str, accessions: list[str]) -> None:
+        """Track that the given reserved accessions have been handed out."""
+        self._append(action="used", resource_type=resource_type, accessions=accessions)
+
 
 class AccessionRegistry:
     """Main class handling the accession registry."""
@@ -65,9 +168,37 @@ class AccessionRegistry:
     def __init__(
         self, *, config: AccessionRegistryConfig, accession_store: AccessionStore
     ):
-        """Initialize with config."""
+        """Initialize with config.
+
+        If pools are enabled, unused reservations tracked by a previous registry
+        using the same reservation log are reclaimed into the pools.
+        """
         self._config = config
         self._accession_store = accession_store
+        # serializes the access to the store, which might be used for refills:
+        self._store_lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        self._pools: dict[str, deque[str]] = {
+            resource_type: deque() for resource_type in config.prefix_mapping
+        }
+        self._refills: dict[str, Future] = {}
+        self._refill_executor: ThreadPoolExecutor | None = None
+        self._reservation_log: ReservationLog | None = None
+
+        if config.accession_pool_size:
+            self._refill_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="accession-pool-refill"
+            )
+            if config.accession_reservations_path:
+                self._reservation_log = ReservationLog(
+                    path=config.accession_reservations_path
+                )
+                for (
+                    resource_type,
+                    accessions,
+                ) in self._reservation_log.compact().items():
+                    if resource_type in self._pools:
+                        self._pools[resource_type].extend(accessions)
 
     def _assert_resource_type_exists(self, *, resource_type: str) -> None:
         """Checks whether the specified resource type is in the prefix mapping, raises
@@ -84,26 +215,167 @@ class AccessionRegistry:
         self._assert_resource_type_exists(resource_type=resource_type)
 
         prefix = self._config.prefix_mapping[resource_type]
-        suffix = "".join(
-            str(secrets.randbelow(10)) for _ in range(self._config.suffix_length)
-        )
+        suffix_length = self._config.suffix_length
+        suffix = str(secrets.randbelow(10**suffix_length)).zfill(suffix_length)
 
         return prefix + suffix
 
     def get_accession(self, *, resource_type: str) -> str:
         """Generates and registers a new accession for a resource of the specified type."""
-        for _ in range(10):
-            # try 10 times to generate a new accession:
-            accession = self._generate_accession(resource_type=resource_type)
+        return self.get_accessions(resource_type=resource_type, count=1)[0]
+
+    def get_accessions(self, *, resource_type: str, count: int) -> list[str]:
+        """Generates and registers the given number of new accessions for resources
+        of the specified type.
+
+        If pools are enabled, the accessions are taken from the pool of the resource
+        type as far as possible. Only the remaining accessions are generated on
+        demand.
+        """
+        self._assert_resource_type_exists(resource_type=resource_type)
+        if count <= 0:
+            return []
+
+        if not self._config.accession_pool_size:
+            return self._register_accessions(resource_type=resource_type, count=count)
+
+        accessions = self._take_from_pool(resource_type=resource_type, count=count)
+        if len(accessions) < count:
+            accessions.extend(
+                self._register_accessions(
+                    resource_type=resource_type, count=count - len(accessions)
+                )
+            )
+        return accessions
+
+    def _take_from_pool(self, *, resource_type: str, count: int) -> list[str]:
+        """Take up to the given number of accessions from the pool of the given
+        resource type and schedule a refill if the pool runs low.
+        """
+        with self._pool_lock:
+            pool = self._pools[resource_type]
+            accessions = [pool.popleft() for _ in range(min(count, len(pool)))]
+            if self._reservation_log and accessions:
+                self._reservation_log.use(
+                    resource_type=resource_type, accessions=accessions
+                )
+            if (
+                len(pool) < max(self._config.accession_pool_refill_threshold, 1)
+                and self._refill_executor is not None
+                and self._pop_completed_refill(resource_type=resource_type)
+            ):
+                self._refills[resource_type] = self._refill_executor.submit(
+                    self.refill_pool, resource_type=resource_type
+                )
+        return accessions
+
+    def _pop_completed_refill(self, *, resource_type: str) -> bool:
+        """Remove the refill of the pool of the given resource type if it has
+        completed. A failed refill is logged, so that the pool can be refilled again.
+        Returns whether no refill is pending anymore.
+
+        Must be called while holding the pool lock.
+        """
+        refill = self._refills.get(resource_type)
+        if refill is None:
+            return True
+        if not refill.done():
+            return False
+
+        del self._refills[resource_type]
+        error = refill.exception()
+        if error is not None:
+            log.warning(
+                "Refilling the accession pool of resource type '%s' failed.",
+                resource_type,
+                exc_info=error,
+            )
+        return True
+
+    def refill_pool(self, *, resource_type: str) -> None:
+        """Fill the pool of the given resource type up to the configured size with
+        newly generated and registered accessions.
+        """
+        with self._pool_lock:
+            missing = self._config.accession_pool_size - len(self._pools[resource_type])
+        accessions = self._register_accessions(
+            resource_type=resource_type, count=missing
+        )
+        with self._pool_lock:
+            if self._reservation_log and accessions:
+                self._reservation_log.reserve(
+                    resource_type=resource_type, accessions=accessions
+                )
+            self._pools[resource_type].extend(accessions)
+
+    def close(self) -> None:
+        """Wait for pending refills of the pools to complete. Afterwards, the pools
+        are no longer refilled, accessions are generated on demand once they are
+        empty.
+
+        Unused reservations are kept in the reservation log, if any, so that they
+        can be reclaimed by the next registry using it.
+
+        Raises:
+            AccessionGenerationError: if a pending refill of a pool failed.
+        """
+        with self._pool_lock:
+            refill_executor = self._refill_executor
+            self._refill_executor = None
+        if refill_executor is not None:
+            refill_executor.shutdown(wait=True)
+
+        with self._pool_lock:
+            refills = list(self._refills.items())
+            self._refills.clear()
+        for resource_type, refill in refills:
+            error = refill.exception()
+            if error is not None:
+                raise self.AccessionGenerationError(
+                    "Refilling the accession pool of resource type"
+                    + f" '{resource_type}' failed: {error}"
+                ) from error
+
+    def _register_accessions(self, *, resource_type: str, count: int) -> list[str]:
+        """Generates and registers the given number of new accessions.
+
+        The candidates are generated in batches and checked against the store at
+        once. All new accessions are then saved to the store in a single write.
+        """
+        if count <= 0:
+            return []
+
+        # a dict is used as an insertion-ordered set:
+        accessions: dict[str, None] = {}
+        failed_attempts = 0
+        with self._store_lock:
+            while failed_attempts < 10:
+                # try until 10 attempts in a row did not yield any new accession:
+                candidates = {
+                    self._generate_accession(resource_type=resource_type)
+                    for _ in range(count - len(accessions))
+                }.difference(accessions)
+                new_accessions = candidates - self._accession_store.existing(
+                    accessions=candidates
+                )
+                failed_attempts = 0 if new_accessions else failed_attempts + 1
+                accessions.update(dict.fromkeys(sorted(new_accessions)))
+                if len(accessions) < count:
+                    continue
 
-            try:
-                self._accession_store.save(accession=accession)
-            except AccessionStore.AccessionAlreadyExistsError:
-                continue
+                try:
+                    self._accession_store.save_many(accessions=list(accessions))
+                except AccessionStore.AccessionAlreadyExistsError:
+                    # accessions have been registered concurrently, replace them:
+                    for accession in self._accession_store.existing(
+                        accessions=accessions
+                    ):
+                        del accessions[accession]
+                    continue
 
-            return accession
+                return list(accessions)
 
         raise self.AccessionGenerationError(
-            "Tried and failed 10 times to generate a new accession that is not used"
-            + " already. The accession space might be exhausted."
+            "Tried and failed 10 times in a row to generate new accessions that are"
+            + " not used already. The accession space might be exhausted."
         )
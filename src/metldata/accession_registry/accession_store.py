@@ -16,11 +16,29 @@
 
 """Storing and exploring existing accessions."""
 
+import fcntl
+import json
+import os
+import sqlite3
+from collections.abc import Iterable
+from enum import Enum
 from pathlib import Path
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
+from metldata.accession_registry.accession_filter import (
+    AccessionFilter,
+    AccessionFilterError,
+)
+
+
+class AccessionStoreBackend(Enum):
+    """Backends for persisting accessions."""
+
+    TEXT = "text"
+    SQLITE = "sqlite"
+
 
 class AccessionStoreConfig(BaseSettings):
     """Config parameters and their defaults."""
@@ -28,10 +46,61 @@ class AccessionStoreConfig(BaseSettings):
     accession_store_path: Path = Field(
         ..., description="A file for storing the already registered accessions."
     )
+    accession_store_backend: AccessionStoreBackend = Field(
+        default=AccessionStoreBackend.TEXT,
+        description=(
+            "The backend used for storing accessions. With 'text', the accessions are"
+            + " stored in a text file with one accession per line. With 'sqlite', they"
+            + " are stored in an SQLite database, which is recommended for very large"
+            + " registries. Existing text files can be migrated using"
+            + " `migrate_accession_store`."
+        ),
+    )
+    accession_store_timeout: float = Field(
+        default=30,
+        description=(
+            "The number of seconds to wait for a concurrent writer to release the"
+            + " SQLite database before failing."
+        ),
+        gt=0,
+    )
+    accession_store_filter: bool = Field(
+        default=False,
+        description=(
+            "Whether to maintain a Bloom filter over the accessions of an SQLite"
+            + " store in a sidecar file next to the database. Lookups of accessions"
+            + " that the filter rules out do not touch the database. The filter is"
+            + " rebuilt from the database if it is missing or outdated."
+        ),
+    )
+    accession_store_filter_capacity: int = Field(
+        default=1_000_000,
+        description=(
+            "The number of accessions the filter is initially dimensioned for. The"
+            + " filter is rebuilt with a larger capacity once it is exceeded."
+        ),
+        gt=0,
+    )
+    accession_store_filter_error_rate: float = Field(
+        default=0.001,
+        description=(
+            "The targeted probability of a lookup in the filter requiring a lookup in"
+            + " the database although the accession is not in use."
+        ),
+        gt=0,
+        lt=1,
+    )
 
 
 class AccessionStore:
-    """A class for storing and querying existing accessions."""
+    """A class for storing and querying existing accessions.
+
+    The accessions are persisted in a text file used as append-only log. The
+    accessions in the file are indexed in memory, so that lookups do not require
+    scanning the file. Accessions appended to the file by other store instances are
+    added to the index on the next lookup. Writes are serialized across processes
+    using an advisory lock on the file.
+    """
 
     class AccessionAlreadyExistsError(RuntimeError):
         """Raised when an accession already exists."""
@@ -43,15 +112,235 @@ class AccessionStore:
     def __init__(self, *, config: AccessionStoreConfig):
         """Initialize with config parameters."""
         self._config = config
+        self._accessions: set[str] = set()
+        # the number of bytes of the file that have been indexed:
+        self._indexed_size = 0
+
+    def _update_index(self) -> None:
+        """Index all complete lines that have been appended to the file since it has
+        been indexed the last time.
+        """
+        with open(self._config.accession_store_path, "rb") as store:
+            store.seek(self._indexed_size)
+            appended = store.read()
+
+        complete_size = appended.rfind(b"\n") + 1
+        self._accessions.update(
+            accession.strip()
+            for accession in appended[:complete_size].decode("utf-8").splitlines()
+        )
+        self._accessions.discard("")
+        self._indexed_size += complete_size
+
+    def exists(self, *, accession: str) -> bool:
+        """Checks whether the given accession is already in use."""
+        if accession in self._accessions:
+            return True
+
+        self._update_index()
+        return accession in self._accessions
+
+    def existing(self, *, accessions: Iterable[str]) -> set[str]:
+        """Returns the subset of the given accessions that is already in use."""
+        self._update_index()
+        return self._accessions.intersection(accessions)
+
+    def save(self, *, accession: str) -> None:
+        """Save a new accession.
+
+        Raises:
+            AccessionAlreadyExistsError: If the given accession already exists.
+        """
+        self.save_many(accessions=[accession])
+
+    def save_many(self, *, accessions: list[str]) -> None:
+        """Save multiple new accessions with a single write. Either all or none of
+        the accessions are saved.
+
+        The file is exclusively locked while checking for existing accessions and
+        appending the new ones, so that concurrent writers in other processes
+        cannot register the same accessions.
+
+        Raises:
+            AccessionAlreadyExistsError: If any of the given accessions already exists.
+        """
+        with open(self._config.accession_store_path, "ab") as store:
+            fcntl.flock(store, fcntl.LOCK_EX)
+            try:
+                existing = self.existing(accessions=accessions)
+                if existing:
+                    raise self.AccessionAlreadyExistsError(accession=min(existing))
+
+                store.write(
+                    "".join(f"{accession}\n" for accession in accessions).encode(
+                        "utf-8"
+                    )
+                )
+                store.flush()
+                os.fsync(store.fileno())
+            finally:
+                fcntl.flock(store, fcntl.LOCK_UN)
+        self._accessions.update(accessions)
+
+    def close(self) -> None:
+        """Release the resources held by the store."""
+
+
+class SqliteAccessionStore(AccessionStore):
+    """A class for storing and querying existing accessions in an SQLite database.
+
+    The accessions are the primary key of the table storing them, so that lookups
+    and uniqueness checks are handled by the index of the database. Since each
+    batch of accessions is inserted in a single transaction, multiple processes can
+    safely use the same database concurrently. Optionally, lookups are pre-filtered
+    by an AccessionFilter persisted next to the database. The filter is only trusted
+    as long as no other connection has modified the database since the filter was
+    synchronized with it, which is tracked via the data version of the database.
+    Otherwise, the filter is reloaded from its file, if another store persisted it in
+    the meantime, or rebuilt from the database before the next lookup.
+    """
+
+    def __init__(self, *, config: AccessionStoreConfig):
+        """Initialize with config parameters."""
+        super().__init__(config=config)
+        # the store may be used from a background thread refilling accession pools,
+        # which is serialized by the registry:
+        self._connection = sqlite3.connect(
+            config.accession_store_path,
+            timeout=config.accession_store_timeout,
+            check_same_thread=False,
+        )
+        # allow concurrent readers while another process is writing:
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS accessions"
+                " (accession TEXT PRIMARY KEY) WITHOUT ROWID"
+            )
+
+        self._filter: AccessionFilter | None = None
+        self._filter_data_version: int | None = None
+        self._filter_path = config.accession_store_path.with_name(
+            config.accession_store_path.name + ".filter"
+        )
+        if config.accession_store_filter:
+            self._filter = self._load_filter()
+
+    def _count(self) -> int:
+        """Count the accessions in the database."""
+        return self._connection.execute("SELECT COUNT(*) FROM accessions").fetchone()[0]
+
+    def _get_data_version(self) -> int:
+        """Get the data version of the database, which changes whenever another
+        connection commits a modification.
+        """
+        return self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def _get_current_filter(self) -> AccessionFilter | None:
+        """Get the filter, if any, synchronized with all accessions in the database.
+        If another connection has modified the database since the filter was
+        synchronized with it, the filter is reloaded or rebuilt first.
+        """
+        if (
+            self._filter is not None
+            and self._filter_data_version != self._get_data_version()
+        ):
+            self._filter = self._load_filter()
+        return self._filter
+
+    def _load_filter(self) -> AccessionFilter:
+        """Load the persisted filter or rebuild it if it is missing or outdated."""
+        self._filter_data_version = self._get_data_version()
+        try:
+            accession_filter = AccessionFilter.load(self._filter_path)
+        except AccessionFilterError:
+            return self.rebuild_filter()
+
+        if accession_filter.count != self._count() or accession_filter.is_full:
+            return self.rebuild_filter()
+
+        return accession_filter
+
+    def rebuild_filter(self) -> AccessionFilter:
+        """Rebuild the filter from the accessions in the database and persist it."""
+        # determined first, so that concurrent modifications mark the filter outdated:
+        self._filter_data_version = self._get_data_version()
+        count = self._count()
+        accession_filter = AccessionFilter(
+            capacity=max(self._config.accession_store_filter_capacity, 2 * count),
+            error_rate=self._config.accession_store_filter_error_rate,
+        )
+        for (accession,) in self._connection.execute(
+            "SELECT accession FROM accessions"
+        ):
+            accession_filter.add(accession)
+
+        accession_filter.save(self._filter_path)
+        self._filter = accession_filter
+        return accession_filter
+
+    def _add_to_filter(self, accessions: Iterable[str]) -> None:
+        """Add the given accessions, which have been newly added to the database, to
+        the filter.
+        """
+        if self._filter is None:
+            return
+
+        for accession in accessions:
+            self._filter.add(accession)
+        if self._filter.is_full:
+            self.rebuild_filter()
+
+    def import_accessions(self, *, accessions: Iterable[str]) -> int:
+        """Import the given accessions in a single transaction. Accessions that
+        already exist are skipped.
+
+        Returns:
+            The number of imported accessions.
+        """
+        with self._connection:
+            cursor = self._connection.executemany(
+                "INSERT OR IGNORE INTO accessions (accession) VALUES (?)",
+                ((accession,) for accession in accessions),
+            )
+        if self._filter is not None:
+            self.rebuild_filter()
+        return cursor.rowcount
 
     def exists(self, *, accession: str) -> bool:
         """Checks whether the given accession is already in use."""
-        with open(self._config.accession_store_path, encoding="utf-8") as store:
-            for existing_accession in store:
-                if accession == existing_accession.strip():
-                    return True
+        accession_filter = self._get_current_filter()
+        if accession_filter is not None and accession not in accession_filter:
+            return False
+
+        cursor = self._connection.execute(
+            "SELECT 1 FROM accessions WHERE accession = ?", (accession,)
+        )
+        return cursor.fetchone() is not None
 
-        return False
+    def existing(self, *, accessions: Iterable[str]) -> set[str]:
+        """Returns the subset of the given accessions that is already in use."""
+        accession_filter = self._get_current_filter()
+        if accession_filter is not None:
+            accessions = [
+                accession for accession in accessions if accession in accession_filter
+            ]
+            if not accessions:
+                return set()
+
+        return self._lookup_existing(accessions)
+
+    def _lookup_existing(self, accessions: Iterable[str]) -> set[str]:
+        """Returns the subset of the given accessions that is in the database
+        without consulting the filter.
+        """
+        # the accessions are passed as a single JSON array parameter:
+        cursor = self._connection.execute(
+            "SELECT accession FROM accessions"
+            " WHERE accession IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(accessions)),),
+        )
+        return {row[0] for row in cursor}
 
     def save(self, *, accession: str) -> None:
         """Save a new accession.
@@ -59,8 +348,64 @@ class AccessionStore:
         Raises:
             AccessionAlreadyExistsError: If the given accession already exists.
         """
-        if self.exists(accession=accession):
-            raise self.AccessionAlreadyExistsError(accession=accession)
+        self.save_many(accessions=[accession])
+
+    def save_many(self, *, accessions: list[str]) -> None:
+        """Save multiple new accessions in a single transaction. Either all or none
+        of the accessions are saved.
+
+        Raises:
+            AccessionAlreadyExistsError: If any of the given accessions already exists.
+        """
+        try:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO accessions (accession) VALUES (?)",
+                    ((accession,) for accession in accessions),
+                )
+        except sqlite3.IntegrityError as error:
+            existing = self._lookup_existing(accessions)
+            # the accessions were saved by another store not updating this filter:
+            self._add_to_filter(
+                accession
+                for accession in existing
+                if self._filter is not None and accession not in self._filter
+            )
+            raise self.AccessionAlreadyExistsError(
+                accession=min(existing or accessions)
+            ) from error
+
+        self._add_to_filter(accessions)
+
+    def close(self) -> None:
+        """Persist the filter, if any, and close the connection to the database."""
+        if self._filter is not None:
+            self._filter.save(self._filter_path)
+        self._connection.close()
+
+
+def get_accession_store(*, config: AccessionStoreConfig) -> AccessionStore:
+    """Get an accession store using the backend specified in the config."""
+    if config.accession_store_backend == AccessionStoreBackend.SQLITE:
+        return SqliteAccessionStore(config=config)
+    return AccessionStore(config=config)
+
+
+def migrate_accession_store(
+    *, text_store_path: Path, config: AccessionStoreConfig
+) -> int:
+    """Migrate the accessions of the text file at the given path into the SQLite
+    database specified in the config. Accessions that already exist in the database
+    are skipped.
+
+    Returns:
+        The number of migrated accessions.
+    """
+    with open(text_store_path, encoding="utf-8") as store:
+        accessions = sorted({line.strip() for line in store} - {""})
 
-        with open(self._config.accession_store_path, "a", encoding="utf-8") as store:
-            store.write(f"{accession}\n")
+    accession_store = SqliteAccessionStore(config=config)
+    try:
+        return accession_store.import_accessions(accessions=accessions)
+    finally:
+        accession_store.close()
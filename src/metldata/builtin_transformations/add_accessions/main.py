@@ -21,6 +21,7 @@ from metldata.builtin_transformations.add_accessions.config import (
 )
 from metldata.builtin_transformations.add_accessions.metadata_transform import (
     add_accessions_to_metadata,
+    compile_rewrite_plans,
     get_references,
 )
 from metldata.builtin_transformations.add_accessions.model_transform import (
@@ -54,8 +55,11 @@ class AccessionAdditionMetadataTransformer(
         self._anchor_points_by_target = get_anchors_points_by_target(
             model=self._original_model
         )
-        self._references = get_references(
-            metadata_model=self._original_model,
+        self._rewrite_plans = compile_rewrite_plans(
+            references=get_references(
+                metadata_model=self._original_model,
+                anchor_points_by_target=self._anchor_points_by_target,
+            ),
             anchor_points_by_target=self._anchor_points_by_target,
         )
 
@@ -74,7 +78,7 @@ class AccessionAdditionMetadataTransformer(
             metadata=metadata,
             accession_slot_name=self._config.accession_slot_name,
             accession_map=annotation.accession_map,
-            references=self._references,
+            rewrite_plans=self._rewrite_plans,
             anchor_points_by_target=self._anchor_points_by_target,
         )
 
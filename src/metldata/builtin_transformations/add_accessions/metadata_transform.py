@@ -17,12 +17,13 @@
 """Logic for transforming metadata."""
 
 from collections import defaultdict
+from dataclasses import dataclass
 from typing import TypeAlias
 
 from pydantic import Json
 
 from metldata.metadata_utils import lookup_self_id
-from metldata.model_utils.anchors import AnchorPoint, lookup_anchor_point
+from metldata.model_utils.anchors import AnchorPoint
 from metldata.model_utils.essentials import MetadataModel
 from metldata.submission_registry.models import AccessionMap
 from metldata.transform.base import MetadataTransformationError
@@ -50,20 +51,77 @@ def get_references(
     return references
 
 
+# A type for direct accession lookups:
+# The first key is the name of an anchored class, the second key is the user-specified
+# alias of a resource of that class. The value is the accession of that resource.
+AccessionTable: TypeAlias = dict[str, dict[str, str]]
+
+
+@dataclass(frozen=True)
+class ClassRewritePlan:
+    """A plan for adding accessions to all resources of one anchored class.
+
+    Attributes:
+        class_name: The name of the anchored class.
+        root_slot: The slot in the metadata root that contains the resources.
+        identifier_slot: The slot that contains the user-specified alias.
+        references: References from this to other anchored classes. The keys are
+            the names of the slots that contain the references, the values are the
+            names of the referenced classes.
+    """
+
+    class_name: str
+    root_slot: str
+    identifier_slot: str
+    references: dict[str, str]
+
+
+def compile_rewrite_plans(
+    *, references: References, anchor_points_by_target: dict[str, AnchorPoint]
+) -> list[ClassRewritePlan]:
+    """Compile a rewrite plan for each anchored class. This depends only on the model
+    and can therefore be reused across submissions.
+    """
+    return [
+        ClassRewritePlan(
+            class_name=class_name,
+            root_slot=anchor_point.root_slot,
+            identifier_slot=anchor_point.identifier_slot,
+            references=dict(references.get(class_name, {})),
+        )
+        for class_name, anchor_point in anchor_points_by_target.items()
+    ]
+
+
+def build_accession_table(
+    *, accession_map: AccessionMap, anchor_points_by_target: dict[str, AnchorPoint]
+) -> AccessionTable:
+    """Build a table for looking up accessions directly by class name and alias from
+    the accession map of a submission, which is keyed by root slots.
+
+    Raises:
+        MetadataTransformationError:
+            if the accession map lacks the accessions of an anchored class.
+    """
+    accession_table: AccessionTable = {}
+    for class_name, anchor_point in anchor_points_by_target.items():
+        accessions = accession_map.get(anchor_point.root_slot)
+        if accessions is None:
+            raise MetadataTransformationError(
+                f"Could not find accession mapping for target class {class_name}."
+            )
+        accession_table[class_name] = accessions
+
+    return accession_table
+
+
 def lookup_accession(
-    *,
-    target_class: str,
-    old_identifier: str,
-    accession_map: AccessionMap,
-    anchor_points_by_target: dict[str, AnchorPoint],
+    *, target_class: str, old_identifier: str, accessions: dict[str, str]
 ) -> str:
     """Lookup the accession for the a resource with the given identifier of the given
-    class.
+    class in the accessions of that class.
     """
-    anchor_point = lookup_anchor_point(
-        class_name=target_class, anchor_points_by_target=anchor_points_by_target
-    )
-    accession = accession_map.get(anchor_point.root_slot, {}).get(old_identifier)
+    accession = accessions.get(old_identifier)
     if not accession:
         raise MetadataTransformationError(
             f"Could not find accession for '{old_identifier}' of class"
@@ -72,69 +130,62 @@ def lookup_accession(
     return accession
 
 
-def add_accession_to_resource(  # noqa: PLR0913
+def add_accession_to_resource(
+    *,
     resource: Json,
-    class_name: str,
-    old_identifier_slot: str,
+    plan: ClassRewritePlan,
     accession_slot_name: str,
-    accession_map: AccessionMap,
-    references: dict[str, str],
-    anchor_points_by_target: dict[str, AnchorPoint],
+    accession_table: AccessionTable,
 ) -> Json:
     """Add an accession to a resource.
 
     Args:
         resource:
             The resource to which accessions should be added.
-        old_identifier_slot:
-            The name of the slot that contains the old identifier.
-        old_identifier:
-            The old identifier of the resource.
-        accession_map:
-            The accession map that contains the accessions.
-        references:
-            References from this to other anchored classes. The keys are the names of
-            the slots that contain the references, the values are the names of the
-            referenced classes.
+        plan:
+            The rewrite plan for the class of the resource.
+        accession_slot_name:
+            The name of the slot that shall contain the accession.
+        accession_table:
+            The table that contains the accessions by class name and alias.
 
     Raises:
         MetadataTransformationError:
             if the transformation of the metadata fails.
     """
     old_identifier = lookup_self_id(
-        resource=resource, identifier_slot=old_identifier_slot
-    )
-    new_identifier = lookup_accession(
-        target_class=class_name,
-        old_identifier=old_identifier,
-        accession_map=accession_map,
-        anchor_points_by_target=anchor_points_by_target,
+        resource=resource, identifier_slot=plan.identifier_slot
     )
-
-    new_resource: Json = {accession_slot_name: new_identifier}
+    new_resource: Json = {
+        accession_slot_name: lookup_accession(
+            target_class=plan.class_name,
+            old_identifier=old_identifier,
+            accessions=accession_table[plan.class_name],
+        )
+    }
 
     for slot_name, slot_value in resource.items():
-        if slot_name in references:
-            referenced_class = references[slot_name]
-            if isinstance(slot_value, list):
-                new_resource[slot_name] = [
-                    lookup_accession(
-                        target_class=referenced_class,
-                        old_identifier=reference_old_identifier,
-                        accession_map=accession_map,
-                        anchor_points_by_target=anchor_points_by_target,
-                    )
-                    for reference_old_identifier in slot_value
-                ]
-            else:
-                new_resource[slot_name] = lookup_accession(
+        referenced_class = plan.references.get(slot_name)
+        if referenced_class is None:
+            new_resource[slot_name] = slot_value
+            continue
+
+        accessions = accession_table[referenced_class]
+        if isinstance(slot_value, list):
+            new_resource[slot_name] = [
+                lookup_accession(
                     target_class=referenced_class,
-                    old_identifier=slot_value,
-                    accession_map=accession_map,
-                    anchor_points_by_target=anchor_points_by_target,
+                    old_identifier=reference_old_identifier,
+                    accessions=accessions,
                 )
+                for reference_old_identifier in slot_value
+            ]
         else:
-            new_resource[slot_name] = slot_value
+            new_resource[slot_name] = lookup_accession(
+                target_class=referenced_class,
+                old_identifier=slot_value,
+                accessions=accessions,
+            )
 
     return new_resource
 
@@ -144,7 +195,7 @@ def add_accessions_to_metadata(
     metadata: Json,
     accession_slot_name: str,
     accession_map: AccessionMap,
-    references: References,
+    rewrite_plans: list[ClassRewritePlan],
     anchor_points_by_target: dict[str, AnchorPoint],
 ) -> Json:
     """Add an accessions to metadata.
@@ -153,29 +204,19 @@ def add_accessions_to_metadata(
         MetadataTransformationError:
             if the transformation of the metadata fails.
     """
-    modified_metadata = {}
-
-    for target_class_name, anchor_point in anchor_points_by_target.items():
-        target_resources = []
-        target_accession_map = accession_map.get(anchor_point.root_slot)
-        if target_accession_map is None:
-            raise MetadataTransformationError(
-                "Could not find accession mapping for target class"
-                + f" {target_class_name}."
-            )
+    accession_table = build_accession_table(
+        accession_map=accession_map, anchor_points_by_target=anchor_points_by_target
+    )
 
-        for old_resource in metadata[anchor_point.root_slot]:
-            new_resource = add_accession_to_resource(
+    return {
+        plan.root_slot: [
+            add_accession_to_resource(
                 resource=old_resource,
-                class_name=target_class_name,
-                old_identifier_slot=anchor_point.identifier_slot,
+                plan=plan,
                 accession_slot_name=accession_slot_name,
-                accession_map=accession_map,
-                references=references[target_class_name],
-                anchor_points_by_target=anchor_points_by_target,
+                accession_table=accession_table,
             )
-            target_resources.append(new_resource)
-
-        modified_metadata[anchor_point.root_slot] = target_resources
-
-    return modified_metadata
+            for old_resource in metadata[plan.root_slot]
+        ]
+        for plan in rewrite_plans
+    }
@@ -15,6 +15,8 @@
 #
 """This module provides the CachedMetadataModel class."""
 
+from linkml_runtime.linkml_model import SlotDefinition
+
 from metldata.model_utils.anchors import AnchorPoint, get_anchors_points_by_target
 from metldata.model_utils.essentials import MetadataModel
 
@@ -26,9 +28,27 @@ class CachedMetadataModel:
 
     model: MetadataModel
     anchors_points_by_target: dict[str, AnchorPoint]
-    all_class_names: list[str]
+    all_classes: frozenset[str]
 
     def __init__(self, model: MetadataModel):
         self.model = model
         self.anchors_points_by_target = get_anchors_points_by_target(model=model)
-        self.all_classes = list(model.schema_view.all_classes())
+        self.all_classes = frozenset(model.schema_view.all_classes())
+        self._induced_slots: dict[tuple[str, str], SlotDefinition] = {}
+
+    def induced_slot(self, *, slot_name: str, class_name: str) -> SlotDefinition:
+        """Returns the induced definition of the given slot in the given class.
+
+        Unlike the bounded cache of the schema view, the resolved definitions are
+        kept for the lifetime of this object, so that every slot of every class is
+        induced only once, no matter how many paths are resolved against it.
+
+        Raises:
+            ValueError: If the slot does not exist for the class.
+        """
+        key = (slot_name, class_name)
+        slot_def = self._induced_slots.get(key)
+        if slot_def is None:
+            slot_def = self.model.schema_view.induced_slot(slot_name, class_name)
+            self._induced_slots[key] = slot_def
+        return slot_def
@@ -18,7 +18,6 @@
 LinkML-based JSON data graph.
 """
 
-from collections import defaultdict
 from collections.abc import Iterator
 from typing import Any
 
@@ -36,7 +35,10 @@ class DataTraversalError(RuntimeError):
 
 
 def _resolve_path(
-    *, model: MetadataModel, all_classes: list[str], origin: str, slot_names: list[str]
+    *,
+    model: CachedMetadataModel,
+    origin: str,
+    slot_names: list[str],
 ) -> list[SlotDefinition]:
     cur_cls = origin
     resolved_path = []
@@ -47,16 +49,157 @@ def _resolve_path(
                 f" '{slot_names[len(resolved_path)]}', range is type or enum."
             )
         try:
-            slot_def = model.schema_view.induced_slot(slot_name, cur_cls)
+            slot_def = model.induced_slot(slot_name=slot_name, class_name=cur_cls)
         except ValueError as error:
             raise DataTraversalError(
                 f"Unable to find slot '{slot_name}' for class '{cur_cls}'."
             ) from error
         resolved_path.append(slot_def)
-        cur_cls = slot_def.range if slot_def.range in all_classes else None  # type: ignore
+        cur_cls = slot_def.range if slot_def.range in model.all_classes else None  # type: ignore
     return resolved_path
 
 
+class DataSubgraphIndex:
+    """Indexes of the submission data that can be shared by all DataSubgraphs
+    traversing the same submission data, e.g. by all operations of an aggregation.
+
+    The index lazily maps identifiers to objects for every class that needs to be
+    resolved, and memoizes the objects reached from an object via a slot, so that
+    intermediate objects shared by multiple paths, operations, or input elements are
+    resolved only once. Moreover, it memoizes the objects reached from the current
+    origin object via common path prefixes.
+
+    The index references objects directly out of the submission data, which therefore
+    must not be modified while the index is in use.
+    """
+
+    def __init__(self, *, model: CachedMetadataModel, submission_data: Json):
+        """Creates a new DataSubgraphIndex object.
+
+        Args:
+            model (CachedMetadataModel): The LinkML metadata model
+            submission_data (Json): The full submission data, a representation
+            of the LinkML tree root class
+        """
+        self._submission_data = submission_data
+        self._anchor_points: dict[str, AnchorPoint] = model.anchors_points_by_target
+        self._all_classes = model.all_classes
+        self._resources_by_id: dict[str, dict[str, Json]] = {}
+        self._next_nodes: dict[tuple[int, str], list[Any]] = {}
+        self._frontier_origin: Json | None = None
+        self._frontiers: dict[tuple[str, ...], list[Any]] = {}
+
+    def _get_resources_by_id(self, class_name: str) -> dict[str, Json]:
+        """Returns a mapping from identifiers to objects for the given class."""
+        resources_by_id = self._resources_by_id.get(class_name)
+        if resources_by_id is None:
+            resources_by_id = index_resources_by_id(
+                class_name=class_name,
+                global_metadata=self._submission_data,
+                anchor_points_by_target=self._anchor_points,
+            )
+            self._resources_by_id[class_name] = resources_by_id
+        return resources_by_id
+
+    def _resolve_non_inlined(
+        self, *, identifiers: list[Any], class_name: str
+    ) -> list[Json]:
+        """Resolves a list of identifiers to the corresponding objects based on
+        the provided class name.
+
+        Args:
+            identifiers (list[Any]): A list of identifiers
+            class_name (str): The name of the corresponding class
+
+        Raises:
+            DataTraversalError: Raised when an identifier cannot be resolved.
+
+        Returns:
+            list[Json]: A list of objects corresponding to the identifiers.
+        """
+        resources_by_id = self._get_resources_by_id(class_name)
+        try:
+            return [resources_by_id[next_node] for next_node in identifiers]
+        except KeyError as error:
+            raise DataTraversalError(
+                f"Unable to resolve ID '{error.args[0]}' for class '{class_name}'"
+            ) from error
+
+    def next_nodes(self, *, node: Json, slot_def: SlotDefinition) -> list[Any]:
+        """Returns the data nodes reached from the given node via the given slot.
+
+        Args:
+            node (Json): The data node
+            slot_def (SlotDefinition): The slot to follow
+
+        Raises:
+            KeyError: If the slot is required but not present in the node.
+            DataTraversalError: Raised when an identifier cannot be resolved.
+
+        Returns:
+            list[Any]: The next data nodes in the order in which they are referenced.
+        """
+        key = (id(node), slot_def.name)
+        next_nodes = self._next_nodes.get(key)
+        if next_nodes is not None:
+            return next_nodes
+
+        try:
+            next_nodes = node[slot_def.name]
+        except KeyError:
+            if not slot_def.required:
+                next_nodes = []
+                self._next_nodes[key] = next_nodes
+                return next_nodes
+            raise
+        if not slot_def.multivalued:
+            next_nodes = [next_nodes]
+        # Resolve non-inlined nodes
+        if slot_def.range in self._all_classes and not slot_def.inlined:
+            next_nodes = self._resolve_non_inlined(
+                identifiers=next_nodes,
+                class_name=slot_def.range,
+            )
+
+        self._next_nodes[key] = next_nodes
+        return next_nodes
+
+    def frontier(self, *, origin: Json, path: list[SlotDefinition]) -> list[Any]:
+        """Returns all data nodes reached from the origin via the given path, in the
+        order in which a depth-first traversal of the path reaches them.
+
+        The frontiers of all prefixes of the path are memoized for the current origin,
+        so that paths sharing a common prefix (i.e. a branch in the prefix trie of all
+        traversed paths) traverse that prefix only once per origin. The memoized
+        frontiers are discarded as soon as a different origin is requested.
+
+        Args:
+            origin (Json): The origin data node
+            path (list[SlotDefinition]): The path to follow
+        """
+        if origin is not self._frontier_origin:
+            self._frontier_origin = origin
+            self._frontiers = {(): [origin]}
+
+        prefix = tuple(slot_def.name for slot_def in path)
+        depth = len(prefix)
+        while prefix[:depth] not in self._frontiers:
+            depth -= 1
+
+        frontier = self._frontiers[prefix[:depth]]
+        for slot_def in path[depth:]:
+            # A depth-first traversal pops the next nodes in reverse order:
+            frontier = [
+                next_node
+                for node in frontier
+                for next_node in reversed(self.next_nodes(node=node, slot_def=slot_def))
+            ]
+            depth += 1
+            self._frontiers[prefix[:depth]] = frontier
+
+        return frontier
+
+
 class DataSubgraph:
     """
     Given that LinkML models enable references between objects, any JSON data
@@ -72,9 +215,11 @@ class DataSubgraph:
 
     _model: MetadataModel
     _paths: list[list[SlotDefinition]]
+    _shared_depths: list[int]
     _class_identifiers: dict[str, str | None]
-    _all_classes: list[str]
+    _all_classes: frozenset[str]
     _anchor_points: dict[str, AnchorPoint]
+    _index: DataSubgraphIndex
 
     def _get_class_identifier(self, class_name: str) -> str:
         """Returns the identifier slot name for the given class name.
@@ -96,33 +241,18 @@ class DataSubgraph:
             )
         return slot_name
 
-    def _resolve_non_inlined(
-        self, *, identifiers: list[Any], class_name: str
-    ) -> list[Json]:
-        """Resolves a list of identifiers to the corresponding objects based on
-        the provided class name.
-
-        Args:
-            identifiers (list[Any]): A list of identifiers
-            class_name (str): The name of the corresponding class
-
-        Raises:
-            DataTraversalError: Raised when an identifier cannot be resolved.
-
-        Returns:
-            list[Json]: A list of objects corresponding to the identifiers.
+    def _get_shared_depth(self, path: list[SlotDefinition]) -> int:
+        """Returns the length of the longest prefix of the given path that does not
+        lead to a class that shall be visited only once. As the traversal of such a
+        prefix does not depend on previously visited nodes, it can be shared with
+        other paths.
         """
-        try:
-            return [
-                self._resources_by_id[class_name][next_node]
-                for next_node in identifiers
-            ]
-        except KeyError as error:
-            raise DataTraversalError(
-                f"Unable to resolve ID '{error.args[0]}' for class '{class_name}'"
-            ) from error
+        for depth, slot_def in enumerate(path):
+            if slot_def.range in self._visit_once_classes:
+                return depth
+        return len(path)
 
-    def terminal_nodes(self, data: Json) -> Iterator[Any]:  # noqa: C901
+    def terminal_nodes(self, data: Json) -> Iterator[Any]:
         """Returns a generator for all data nodes corresponding to the model
         path leaves.
 
@@ -136,32 +266,28 @@ class DataSubgraph:
         # represented as (class, id) tuples. Non-identifiable classes cannot be
         # prevented from being re-visited.
         do_not_revisit: set[tuple[str, Any]] = set()
-        # The stack that guides the traversal
-        for path in self._paths:
-            stack: list[tuple[int, Json]] = [(0, data)]
+        for path, shared_depth in zip(self._paths, self._shared_depths, strict=True):
+            # The prefix up to the first class to be visited only once is
+            # traversed via the shared index
+            frontier = self._index.frontier(origin=data, path=path[:shared_depth])
+            if shared_depth == len(path):
+                yield from frontier
+                continue
+            # The stack that guides the traversal of the remaining path
+            stack: list[tuple[int, Json]] = [
+                (shared_depth, node) for node in reversed(frontier)
+            ]
             while stack:
                 depth, node = stack.pop()
                 # Yield if we're at the end of the path
                 if depth == len(path):
                     yield node
                     continue
-                # Otherwise, add intermediate nodes to the stack unless they are None
+                # Otherwise, add intermediate nodes to the stack
                 slot_def = path[depth]
-                try:
-                    next_nodes = node[slot_def.name]
-                except KeyError:
-                    if not slot_def.required:
-                        continue
-                    raise
-                if not slot_def.multivalued:
-                    next_nodes = [next_nodes]
-                # Resolve non-inlined nodes
-                if slot_def.range in self._all_classes and not slot_def.inlined:
-                    next_nodes = self._resolve_non_inlined(
-                        identifiers=next_nodes, class_name=slot_def.range
-                    )
+                next_nodes = self._index.next_nodes(node=node, slot_def=slot_def)
                 # Add elements to stack
-                next_range = path[depth].range
+                next_range = slot_def.range
                 if next_range in self._visit_once_classes:
                     for next_node in next_nodes:
                         next_hash = (
@@ -174,48 +300,22 @@ class DataSubgraph:
                 else:
                     stack.extend((depth + 1, next_node) for next_node in next_nodes)
 
-    def _map_resources_by_id(self, submission_data: Json) -> dict[str, dict[str, Json]]:
-        """Creates a mapping from class names to mappings from class identifiers
-        to objects.
-
-        Args:
-            submission_data (Json): The submission data
+    def _check_paths(self) -> None:
+        """Checks that all intermediate path slots that are not inlined have a class
+        range, so that their identifiers can be resolved.
 
-        Returns:
-            dict[str, dict[str, Json]]: The resulting mapping
+        Raises:
+            DataTraversalError: If an intermediate slot does not have a class range.
         """
-        resources_by_id: defaultdict[str, dict[str, Json]] = defaultdict(dict)
         for path in self._paths:
             for slot_def in path[:-1]:
-                if not slot_def.inlined and slot_def.range not in resources_by_id:
-                    if (
-                        slot_def.range is None
-                        or slot_def.range not in self._all_classes
-                    ):
-                        raise DataTraversalError(
-                            f"Intermediate path slot '{slot_def.name}' does"
-                            " not have a class range."
-                        )
-                    resources_by_id[slot_def.range] = index_resources_by_id(
-                        class_name=slot_def.range,
-                        global_metadata=submission_data,
-                        anchor_points_by_target=self._anchor_points,
+                if not slot_def.inlined and slot_def.range not in self._all_classes:
+                    raise DataTraversalError(
+                        f"Intermediate path slot '{slot_def.name}' does"
+                        " not have a class range."
                     )
-            slot_def = path[-1]
-            if (
-                slot_def.range in self._all_classes
-                and not slot_def.inlined
-                and slot_def.range not in resources_by_id
-            ):
-                resources_by_id[slot_def.range] = index_resources_by_id(
-                    class_name=slot_def.range,
-                    global_metadata=submission_data,
-                    anchor_points_by_target=self._anchor_points,
-                )
-
-        return resources_by_id
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         *,
         model: CachedMetadataModel,
@@ -223,6 +323,7 @@ class DataSubgraph:
         origin: str,
         path_strings: list[str],
         visit_once_classes: list[str] | None = None,
+        index: DataSubgraphIndex | None = None,
     ):
         """Creates a new DataSubgraph object.
 
@@ -233,21 +334,32 @@ class DataSubgraph:
             model_paths (list[ModelPath]): A list of model paths
             visit_once_classes (Optional[list[str]], optional): List of classes
             for which objects shall be traversed only once. Defaults to None.
+            index (Optional[DataSubgraphIndex], optional): An index of the
+            submission data to be shared with other DataSubgraphs traversing the
+            same submission data. Defaults to None, in which case a new index is
+            created.
         """
         self._model = model.model
         self._anchor_points = model.anchors_points_by_target
-        self._visit_once_classes = visit_once_classes if visit_once_classes else []
-        self._all_classes = list(self._model.schema_view.all_classes())
+        self._visit_once_classes = (
+            frozenset(visit_once_classes) if visit_once_classes else frozenset()
+        )
+        self._all_classes = model.all_classes
         self._paths = [
             _resolve_path(
-                model=self._model,
+                model=model,
                 origin=origin,
                 slot_names=path_string.split("."),
-                all_classes=self._all_classes,
             )
             for path_string in path_strings
         ]
-        self._resources_by_id = self._map_resources_by_id(submission_data)
+        self._check_paths()
+        self._shared_depths = [self._get_shared_depth(path) for path in self._paths]
+        self._index = (
+            index
+            if index is not None
+            else DataSubgraphIndex(model=model, submission_data=submission_data)
+        )
         self._class_identifiers = {
             cls_name: ap.identifier_slot for cls_name, ap in self._anchor_points.items()
         }
@@ -18,7 +18,7 @@
 
 from abc import ABC, abstractmethod
 from collections import Counter
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from operator import itemgetter
 from typing import Any
 
@@ -28,6 +28,13 @@ from metldata.builtin_transformations.aggregate.models import (
 )
 from metldata.transform.base import MetadataTransformationError
 
+try:
+    import numpy
+except ImportError:
+    NUMPY_AVAILABLE = False
+else:
+    NUMPY_AVAILABLE = True
+
 _FUNCTION_REGISTRY: dict[str, type["AggregationFunction"]] = {}
 
 
@@ -51,6 +58,26 @@ class AggregationFunction(ABC):
         """Transforms input data."""
 
 
+class BatchAggregationFunction(AggregationFunction, ABC):
+    """An abstract class for aggregation functions that aggregate all input values
+    at once rather than consuming them one at a time.
+
+    The input values are gathered into a sequence, which allows for vectorized
+    implementations that are used if NumPy is installed (e.g. via the "vectorized"
+    extra of this package).
+    """
+
+    @classmethod
+    @abstractmethod
+    def func_batch(cls, values: Sequence[Any]) -> Any:
+        """Transforms a batch of input data."""
+
+    @classmethod
+    def func(cls, data: Iterable[Any]) -> Any:
+        """Transforms input data by gathering it into a batch."""
+        return cls.func_batch(list(data))
+
+
 def register_function(func: type[AggregationFunction]) -> type[AggregationFunction]:
     """Registers a function in the aggregation function registry."""
     _FUNCTION_REGISTRY[func.__name__] = func
@@ -114,7 +141,7 @@ class IntegerCopyAggregation(CopyAggregation):
 
 
 @register_function
-class CountAggregation(AggregationFunction):
+class CountAggregation(BatchAggregationFunction):
     """Transformation that returns the count of elements for a given sequence of
     values.
     """
@@ -124,12 +151,12 @@ class CountAggregation(AggregationFunction):
     result_multivalued = False
 
     @classmethod
-    def func(cls, data: Iterable[Any]) -> int:  # noqa: D102
-        return sum(1 for _ in data)
+    def func_batch(cls, values: Sequence[Any]) -> int:  # noqa: D102
+        return len(values)
 
 
 @register_function
-class IntegerSumAggregation(AggregationFunction):
+class IntegerSumAggregation(BatchAggregationFunction):
     """Transformation that returns the sum for a given sequence of integer
     values.
     """
@@ -139,15 +166,27 @@ class IntegerSumAggregation(AggregationFunction):
     result_multivalued = False
 
     @classmethod
-    def func(cls, data: Iterable[int]) -> int:  # noqa: D102
-        return sum(data)
+    def func_batch(cls, values: Sequence[int]) -> int:  # noqa: D102
+        # not vectorized, since NumPy integers are bounded and would silently
+        # overflow, while the built-in sum is exact and already runs in C:
+        return sum(values)
 
 
-class ElementCountAggregation(AggregationFunction, ABC):
+class ElementCountAggregation(BatchAggregationFunction, ABC):
     """Aggregation that returns the counts of unique elements in the given data."""
 
     result_multivalued = True
 
+    @classmethod
+    def _count_elements(cls, values: Sequence[Any]) -> list[tuple[Any, int]]:
+        """Returns (value, count) tuples for all unique values sorted by value."""
+        if NUMPY_AVAILABLE and values:
+            unique_values, counts = numpy.unique(
+                numpy.asarray(values), return_counts=True
+            )
+            return list(zip(unique_values.tolist(), counts.tolist(), strict=True))
+        return sorted(Counter(values).items(), key=itemgetter(0))
+
 
 @register_function
 class StringElementCountAggregation(ElementCountAggregation):
@@ -164,14 +203,13 @@ class StringElementCountAggregation(ElementCountAggregation):
     )
 
     @classmethod
-    def func(cls, data: Iterable[Any]) -> list[dict[str, Any]]:  # noqa: D102
-        return sorted(
-            (
-                {"value": "unknown" if value is None else str(value), "count": count}
-                for value, count in Counter(data).items()
-            ),
-            key=itemgetter("value"),
-        )
+    def func_batch(cls, values: Sequence[Any]) -> list[dict[str, Any]]:  # noqa: D102
+        return [
+            {"value": value, "count": count}
+            for value, count in cls._count_elements(
+                ["unknown" if value is None else str(value) for value in values]
+            )
+        ]
 
 
 @register_function
@@ -189,15 +227,13 @@ class IntegerElementCountAggregation(ElementCountAggregation):
     )
 
     @classmethod
-    def func(cls, data: Iterable[Any]) -> list[dict[str, Any]]:  # noqa: D102
-        return sorted(
-            (
-                {"value": int(value), "count": count}
-                for value, count in Counter(data).items()
-                if value is not None
-            ),
-            key=itemgetter("value"),
-        )
+    def func_batch(cls, values: Sequence[Any]) -> list[dict[str, Any]]:  # noqa: D102
+        return [
+            {"value": value, "count": count}
+            for value, count in cls._count_elements(
+                [int(value) for value in values if value is not None]
+            )
+        ]
 
 
 def transformation_by_name(name: str) -> type[AggregationFunction]:
@@ -16,15 +16,77 @@
 
 """Metadata transformation functionality for the aggregate transformation."""
 
+from collections.abc import Iterable
+from typing import Any
+
 from metldata.builtin_transformations.aggregate.cached_model import CachedMetadataModel
-from metldata.builtin_transformations.aggregate.config import Aggregation
-from metldata.builtin_transformations.aggregate.data_subgraph import DataSubgraph
+from metldata.builtin_transformations.aggregate.config import (
+    Aggregation,
+    AggregationOperation,
+)
+from metldata.builtin_transformations.aggregate.data_subgraph import (
+    DataSubgraph,
+    DataSubgraphIndex,
+)
 from metldata.builtin_transformations.aggregate.expanding_dict import ExpandingDict
-from metldata.builtin_transformations.aggregate.func import MetadataTransformationError
+from metldata.builtin_transformations.aggregate.func import (
+    BatchAggregationFunction,
+    MetadataTransformationError,
+)
 from metldata.custom_types import Json
 from metldata.model_utils.anchors import AnchorPoint
 
 
+class AggregationOperationError(RuntimeError):
+    """Raised when applying the function of an aggregation operation fails."""
+
+    def __init__(self, *, operation: AggregationOperation, error: Exception):
+        self.operation = operation
+        super().__init__(str(error))
+
+
+def group_operations(
+    operations: list[AggregationOperation],
+) -> list[list[AggregationOperation]]:
+    """Groups aggregation operations that traverse the same subgraph, i.e. that have
+    identical input paths and visit-only-once configurations. The groups and the
+    operations within each group retain the order of the given operations.
+    """
+    groups: dict[tuple[tuple[str, ...], frozenset[str]], list[AggregationOperation]]
+    groups = {}
+    for operation in operations:
+        key = (tuple(operation.input_paths), frozenset(operation.visit_only_once or ()))
+        groups.setdefault(key, []).append(operation)
+    return list(groups.values())
+
+
+def apply_operations(
+    *, operations: list[AggregationOperation], values: Iterable[Any]
+) -> list[Any]:
+    """Applies the aggregation functions of all given operations to the given values.
+
+    The values are gathered once and shared by all functions, so that the input
+    paths of a group of operations are traversed only once. Batch aggregation
+    functions get the gathered values, all other functions a stream over them.
+
+    Returns the aggregated values in the order of the given operations.
+
+    Raises:
+        AggregationOperationError: if the function of an operation fails.
+    """
+    gathered_values = list(values)
+    aggregated_values = []
+    for operation in operations:
+        try:
+            if issubclass(operation.function, BatchAggregationFunction):
+                aggregated_values.append(operation.function.func_batch(gathered_values))
+            else:
+                aggregated_values.append(operation.function.func(iter(gathered_values)))
+        except Exception as error:
+            raise AggregationOperationError(operation=operation, error=error) from error
+    return aggregated_values
+
+
 def execute_aggregation(
     *,
     original_model: CachedMetadataModel,
@@ -37,34 +99,48 @@ def execute_aggregation(
     input_anchor_data = original_data[anchor_point.root_slot]
 
     # A subgraph depends only on the model and the (constant) submission data, not on
-    # the individual input element. Build one subgraph per operation up front and reuse
-    # it across all input elements, instead of rebuilding it - and re-indexing the
-    # entire submission - for every (input element, operation) pair.
+    # the individual input element. Build one subgraph per group of operations with
+    # the same input paths up front and reuse it across all input elements, so that
+    # the subgraph is traversed only once per input element for all operations of the
+    # group. All subgraphs share one index, so that the submission is indexed only
+    # once per aggregation and path prefixes common to multiple groups are traversed
+    # only once.
+    index = DataSubgraphIndex(model=original_model, submission_data=original_data)
+    operation_groups = group_operations(aggregation.operations)
     subgraphs = [
         DataSubgraph(
             model=original_model,
             submission_data=original_data,
             origin=aggregation.input,
-            path_strings=operation.input_paths,
-            visit_once_classes=operation.visit_only_once,
+            path_strings=operations[0].input_paths,
+            visit_once_classes=operations[0].visit_only_once,
+            index=index,
         )
-        for operation in aggregation.operations
+        for operations in operation_groups
     ]
 
     output_data: list[Json] = []
     for input_element in input_anchor_data:
-        result = ExpandingDict()
-        for operation, subgraph in zip(aggregation.operations, subgraphs, strict=True):
+        aggregated_by_operation: dict[int, Any] = {}
+        for operations, subgraph in zip(operation_groups, subgraphs, strict=True):
             try:
-                aggregated = operation.function.func(
-                    subgraph.terminal_nodes(data=input_element)
+                aggregated_values = apply_operations(
+                    operations=operations,
+                    values=subgraph.terminal_nodes(data=input_element),
                 )
-            except Exception as error:
+            except AggregationOperationError as error:
                 raise MetadataTransformationError(
                     "Cannot execute operation:\n"
-                    f"{operation}\nwith input {input_element!r}:\n{error}"
+                    f"{error.operation}\nwith input {input_element!r}:\n{error}"
                 ) from error
-            result.set_path_value(operation.output_path, aggregated)
+            aggregated_by_operation.update(
+                zip(map(id, operations), aggregated_values, strict=True)
+            )
+        result = ExpandingDict()
+        for operation in aggregation.operations:
+            result.set_path_value(
+                operation.output_path, aggregated_by_operation[id(operation)]
+            )
         result[id_slot] = input_element[id_slot]
         output_data.append(result.to_dict())
 
@@ -17,13 +17,15 @@
 """Model transformation for aggregate transformations."""
 
 import itertools
-from collections import defaultdict
+from collections import Counter, defaultdict
 from collections.abc import Iterable
 from dataclasses import asdict
+from typing import Any, NoReturn
 
 from linkml_runtime.linkml_model import ClassDefinition, SlotDefinition
 from stringcase import snakecase
 
+from metldata.builtin_transformations.aggregate.cached_model import CachedMetadataModel
 from metldata.builtin_transformations.aggregate.config import (
     AggregateConfig,
     Aggregation,
@@ -42,11 +44,32 @@ from metldata.transform.base import MetadataModelTransformationError
 
 Path = tuple[str | None, ...]
 
+# marks the end of a path in a trie of paths:
+_PATH_END = object()
+
+
+def _strip_path(path: Path) -> Path:
+    """Removes the trailing None values added to a path by normalization."""
+    end = len(path)
+    while end and path[end - 1] is None:
+        end -= 1
+    return path[:end]
+
+
+def _raise_incompatible_paths(path_a: Path, path_b: Path) -> NoReturn:
+    """Raises an error for two conflicting output paths."""
+    raise MetadataModelTransformationError(
+        "Incompatible output paths:"
+        f" '{'.'.join(str(elem) for elem in path_a)}"
+        f" and {'.'.join(str(elem) for elem in path_b)}."
+    )
+
 
 class PathMatrix:
     """Represents a matrix of data paths."""
 
     __paths: list[Path]
+    __prefix_counts: Counter[Path]
     leaf_slots: list[MinimalNamedSlot]
 
     def path_leaves(self) -> Iterable[str]:
@@ -62,17 +85,26 @@ class PathMatrix:
         no path is a prefix of another path. Note that this implicitly includes
         checking for identical paths.
 
+        The paths are inserted into a trie one after another, so that a conflict
+        is detected when a path passes through or ends at a node of another path.
+
         Raises:
         MetadataModelTransformationError: If one path is a prefix of another.
         """
-        for path_a, path_b in itertools.combinations(self.__paths, r=2):
-            min_len = min(len(path_a), len(path_b))
-            if path_a[:min_len] == path_b[:min_len]:
-                raise MetadataModelTransformationError(
-                    "Incompatible output paths:"
-                    f" '{'.'.join(str(elem) for elem in path_a)}"
-                    f" and {'.'.join(str(elem) for elem in path_b)}."
-                )
+        trie: dict[Any, Any] = {}
+        for path in self.__paths:
+            node = trie
+            for elem in _strip_path(path):
+                if _PATH_END in node:
+                    _raise_incompatible_paths(node[_PATH_END], path)
+                node = node.setdefault(elem, {})
+            if node:
+                # the path is a prefix of (or identical to) an earlier path:
+                other_node = node
+                while _PATH_END not in other_node:
+                    other_node = next(iter(other_node.values()))
+                _raise_incompatible_paths(other_node[_PATH_END], path)
+            node[_PATH_END] = path
 
     def load_leaf_slots(self, leaf_slots: list[MinimalSlot]) -> None:
         """Combines the paths and the specified leaf slots to NamedSlots and
@@ -103,16 +135,28 @@ class PathMatrix:
             path + (None,) * (max_depth - len(path)) for path in self.__paths
         ]
 
+    def _count_prefixes(self, path: Path, increment: int) -> None:
+        """Updates the number of paths sharing each of the prefixes of the given
+        path by the given increment.
+        """
+        path = _strip_path(path)
+        for depth in range(1, len(path) + 1):
+            self.__prefix_counts[path[:depth]] += increment
+
     def add_path(self, path: Path, leaf_slot: MinimalNamedSlot) -> None:
         """Add a path"""
-        for existing_path in self.__paths:
-            if path == existing_path[: len(path)]:
-                raise MetadataModelTransformationError(
-                    f"Cannot add conflicting path {path}."
-                )
+        if self.__prefix_counts[_strip_path(path)]:
+            raise MetadataModelTransformationError(
+                f"Cannot add conflicting path {path}."
+            )
         self.__paths.append(path)
         self.leaf_slots.append(leaf_slot)
-        self.normalize_path_matrix()
+        self._count_prefixes(path, 1)
+        if len(path) > self.max_depth:
+            self.normalize_path_matrix()
+        else:
+            # only the new path needs to be padded to the common length:
+            self.__paths[-1] = path + (None,) * (self.max_depth - len(path))
 
     def load_path_strings(self, paths: list[list[str]]) -> None:
         """Given a list of lists, appends None values to each list until the
@@ -120,6 +164,9 @@ class PathMatrix:
         """
         self.__paths = list(map(Path, paths))
         self.validate_paths()
+        self.__prefix_counts = Counter()
+        for path in self.__paths:
+            self._count_prefixes(path, 1)
         self.normalize_path_matrix()
 
     def compact_path_matrix(self) -> None:
@@ -130,6 +177,7 @@ class PathMatrix:
     def delete_path(self, path: Path) -> None:
         """Deletes the specified path from the path matrix and leaf_slots"""
         idx = self.__paths.index(path)
+        self._count_prefixes(self.__paths[idx], -1)
         del self.__paths[idx]
         del self.leaf_slots[idx]
         self.compact_path_matrix()
@@ -280,7 +328,7 @@ def get_identifier_slot_names(
 
 
 def add_identifier_slots(
-    input_model: MetadataModel,
+    input_model: CachedMetadataModel,
     output_model: MetadataModel,
     origin_map: dict[str, str],
     id_slot_map: dict[str, str],
@@ -289,7 +337,7 @@ def add_identifier_slots(
     name and range is inferred from the original input classes.
 
     Args:
-        input_model (MetadataModel): _description_
+        input_model (CachedMetadataModel): _description_
         output_model (MetadataModel): _description_
         class_map (list[tuple[str, str]]): _description_
 
@@ -302,7 +350,9 @@ def add_identifier_slots(
     output_schema_view = output_model.schema_view
     for in_class_name, out_class_name in origin_map.items():
         slot_name = id_slot_map[out_class_name]
-        input_slot = input_model.schema_view.induced_slot(slot_name, in_class_name)
+        input_slot = input_model.induced_slot(
+            slot_name=slot_name, class_name=in_class_name
+        )
         output_schema_view = upsert_class_slot(
             schema_view=output_schema_view,
             class_name=out_class_name,
@@ -352,7 +402,7 @@ def build_aggregation_model(
     origin_map = {agg.input: agg.output for agg in config.aggregations}
     id_slot_map = get_identifier_slot_names(input_model=model, origin_map=origin_map)
     output_model = add_identifier_slots(
-        input_model=model,
+        input_model=CachedMetadataModel(model=model),
         output_model=output_model,
         origin_map=origin_map,
         id_slot_map=id_slot_map,
@@ -16,49 +16,19 @@
 
 """Logic for transforming metadata."""
 
-from metldata.metadata_utils import get_resources_of_class, upsert_resources_in_metadata
-from metldata.model_utils.anchors import AnchorPoint
+from metldata.metadata_utils import MetadataAnchorMismatchError
+from metldata.model_utils.anchors import AnchorPoint, lookup_anchor_point
 from metldata.transform.base import Json, MetadataModelTransformationError
 
 
-def delete_slot_from_resource(resource: Json, slot_name: str) -> Json:
-    """Delete a slot from a resource. Returns a modified copy of the resource."""
-    if slot_name not in resource:
-        raise MetadataModelTransformationError(
-            f"Slot '{slot_name}' not found in resource '{resource}'"
-        )
-
-    modified_resource = resource.copy()
-    del modified_resource[slot_name]
-    return modified_resource
-
-
-def delete_class_slot(
-    metadata: Json,
-    class_name: str,
-    slot_name: str,
-    anchor_points_by_target: dict[str, AnchorPoint],
-) -> Json:
-    """Delete a slot from a class in the provided metadata. Returns a modified copy of
-    the metadata.
-    """
-    resources = get_resources_of_class(
-        class_name=class_name,
-        global_metadata=metadata,
-        anchor_points_by_target=anchor_points_by_target,
-    )
-
-    modified_resources = [
-        delete_slot_from_resource(resource=resource, slot_name=slot_name)
-        for resource in resources
-    ]
-
-    return upsert_resources_in_metadata(
-        resources=modified_resources,
-        class_name=class_name,
-        global_metadata=metadata,
-        anchor_points_by_target=anchor_points_by_target,
-    )
+def delete_slots_from_resource(resource: Json, slot_names: list[str]) -> None:
+    """Delete the given slots from a resource. The resource is modified in place."""
+    for slot_name in slot_names:
+        if slot_name not in resource:
+            raise MetadataModelTransformationError(
+                f"Slot '{slot_name}' not found in resource '{resource}'"
+            )
+        del resource[slot_name]
 
 
 def delete_class_slots(
@@ -66,14 +36,33 @@ def delete_class_slots(
     slots_to_delete: dict[str, list[str]],
     anchor_points_by_target: dict[str, AnchorPoint],
 ) -> Json:
-    """Delete slots from provided metadata. Returns a modified copy of the metadata."""
-    for class_name, slot_names in slots_to_delete.items():
-        for slot_name in slot_names:
-            metadata = delete_class_slot(
-                metadata=metadata,
-                class_name=class_name,
-                slot_name=slot_name,
-                anchor_points_by_target=anchor_points_by_target,
+    """Delete slots from provided metadata. Returns a modified copy of the metadata.
+
+    Only the resources of classes with slots to delete are copied, shallowly, and
+    all slots of a class are deleted from each copy in a single pass. Everything
+    else is shared with the provided metadata, which is not modified.
+    """
+    root_slots_by_class = {
+        class_name: lookup_anchor_point(
+            class_name=class_name, anchor_points_by_target=anchor_points_by_target
+        ).root_slot
+        for class_name in slots_to_delete
+    }
+    for root_slot in root_slots_by_class.values():
+        if root_slot not in metadata:
+            raise MetadataAnchorMismatchError(
+                f"Could not find root slot of the anchor point '{root_slot}'"
+                + " in the global metadata."
             )
 
-    return metadata
+    modified_metadata = dict(metadata)
+    for class_name, slot_names in slots_to_delete.items():
+        if not slot_names:
+            continue
+        root_slot = root_slots_by_class[class_name]
+        modified_resources = [dict(resource) for resource in metadata[root_slot]]
+        for resource in modified_resources:
+            delete_slots_from_resource(resource=resource, slot_names=slot_names)
+        modified_metadata[root_slot] = modified_resources
+
+    return modified_metadata
@@ -16,6 +16,8 @@
 
 """Models used to describe all inferred references based on existing references."""
 
+from enum import Enum
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -25,6 +27,19 @@ from metldata.builtin_transformations.infer_references.reference import (
 )
 
 
+class ReferenceInferenceEngine(Enum):
+    """The engine used to resolve inferred references in the metadata.
+
+    The "join" engine resolves reference paths as a sequence of relational joins over
+    id-to-ids mappings and has no additional dependencies. The "sparse" engine
+    resolves reference paths using sparse matrix products and is meant for very large
+    submissions. It requires NumPy and SciPy to be installed.
+    """
+
+    JOIN = "join"
+    SPARSE = "sparse"
+
+
 class ReferenceInferenceConfig(BaseSettings):
     """Config containing inferred references for all classes of a metadata model in a
     dictionary-based representation and the option to translate that reference map into
@@ -64,6 +79,15 @@ class ReferenceInferenceConfig(BaseSettings):
         ],
     )
 
+    engine: ReferenceInferenceEngine = Field(
+        default=ReferenceInferenceEngine.JOIN,
+        description=(
+            "The engine used to resolve the inferred references in the metadata."
+            + ' Either "join" (the default) or "sparse", which requires NumPy and'
+            + " SciPy to be installed."
+        ),
+    )
+
     @property
     def inferred_references(self) -> list[InferredReference]:
         """A list of inferred references."""
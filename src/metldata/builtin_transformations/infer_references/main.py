@@ -18,9 +18,11 @@
 
 from metldata.builtin_transformations.infer_references.config import (
     ReferenceInferenceConfig,
+    ReferenceInferenceEngine,
 )
 from metldata.builtin_transformations.infer_references.metadata_transform import (
     add_references_to_metadata,
+    compile_reference_plans,
 )
 from metldata.builtin_transformations.infer_references.model_transform import (
     add_references_to_model,
@@ -54,6 +56,20 @@ class ReferenceInferenceMetadataTransformer(
             model=self._original_model
         )
 
+        self._references = self._config.inferred_references
+        self._resolution_plans = compile_reference_plans(
+            references=self._references,
+            anchor_points_by_target=self._anchor_points_by_target,
+        )
+
+        if self._config.engine == ReferenceInferenceEngine.SPARSE:
+            # imported lazily since the sparse backend has optional dependencies:
+            from metldata.builtin_transformations.infer_references.path.resolve_sparse import (  # noqa: PLC0415
+                check_sparse_backend,
+            )
+
+            check_sparse_backend()
+
     def transform(self, *, metadata: Json, annotation: SubmissionAnnotation) -> Json:
         """Transforms metadata.
 
@@ -67,8 +83,10 @@ class ReferenceInferenceMetadataTransformer(
         """
         return add_references_to_metadata(
             metadata=metadata,
-            references=self._config.inferred_references,
+            references=self._references,
+            plans=self._resolution_plans,
             anchor_points_by_target=self._anchor_points_by_target,
+            engine=self._config.engine,
         )
 
 
@@ -16,9 +16,19 @@
 
 """Logic for transforming metadata."""
 
+from collections.abc import Callable
+
+from metldata.builtin_transformations.infer_references.config import (
+    ReferenceInferenceEngine,
+)
+from metldata.builtin_transformations.infer_references.path.plan import (
+    ResolutionPlan,
+    ResolutionPlanCompilationError,
+    compile_resolution_plan,
+)
 from metldata.builtin_transformations.infer_references.path.resolve import (
-    ResolutionIndex,
-    resolve_reference_for_metadata_resource,
+    PathElementResolutionError,
+    resolve_reference_for_metadata,
 )
 from metldata.builtin_transformations.infer_references.reference import (
     InferredReference,
@@ -29,11 +39,7 @@ from metldata.metadata_utils import (
     lookup_self_id,
     upsert_resources_in_metadata,
 )
-from metldata.model_utils.anchors import (
-    AnchorPoint,
-    AnchorPointNotFoundError,
-    lookup_anchor_point,
-)
+from metldata.model_utils.anchors import AnchorPoint
 from metldata.transform.base import (
     Json,
     MetadataModelTransformationError,
@@ -41,72 +47,72 @@ from metldata.transform.base import (
 )
 
 
+def compile_reference_plans(
+    *,
+    references: list[InferredReference],
+    anchor_points_by_target: dict[str, AnchorPoint],
+) -> list[ResolutionPlan]:
+    """Compile the paths of the provided references into resolution plans.
+
+    Raises:
+        MetadataModelTransformationError:
+            if the path of a reference involves classes without anchor points.
+    """
+    try:
+        return [
+            compile_resolution_plan(
+                reference_path=reference.path,
+                anchor_points_by_target=anchor_points_by_target,
+            )
+            for reference in references
+        ]
+    except ResolutionPlanCompilationError as error:
+        raise MetadataModelTransformationError(
+            f"Cannot resolve inferred references: {error}"
+        ) from error
+
+
 def add_reference_to_metadata_resource(
+    *,
     resource: Json,
-    global_metadata: Json,
     reference: InferredReference,
-    anchor_points_by_target: dict[str, AnchorPoint],
-    index: ResolutionIndex | None = None,
+    source_anchor_point: AnchorPoint,
+    target_ids_by_source: dict[str, list[str]],
 ) -> Json:
     """Add an inferred reference to an individual metadata resource.
 
     Args:
         resource: The metadata resource to modify.
-        global_metadata: The global metadata context to look up references in.
         reference: The inferred reference.
-        anchor_points: The anchor points of the metadata model.
-        index:
-            A resolution index for ``global_metadata``, shared across all resources of
-            the same source class for this reference. Built on demand if omitted.
+        source_anchor_point: The anchor point of the source class of the reference.
+        target_ids_by_source:
+            The resolved reference, mapping the IDs of all resources of the source
+            class to the sorted IDs of the targeted resources.
 
     Raises:
         MetadataTransformationError:
             if the transformation of the metadata fails.
     """
-    try:
-        target_anchor_point = lookup_anchor_point(
-            class_name=reference.target, anchor_points_by_target=anchor_points_by_target
-        )
-    except AnchorPointNotFoundError as error:
-        raise MetadataModelTransformationError(
-            f"Cannot add reference '{reference}' to metadata resource '{resource}'"
-            + " because the target anchor point could not be found."
-        ) from error
-
     if reference.new_slot in resource:
         raise MetadataModelTransformationError(
             f"Cannot add reference '{reference}' to metadata resource '{resource}'"
             + f" because the target slot '{reference.new_slot}' already exists."
         )
 
-    target_resources = resolve_reference_for_metadata_resource(
-        resource=resource,
-        global_metadata=global_metadata,
-        reference_path=reference.path,
-        anchor_points_by_target=anchor_points_by_target,
-        index=index,
-    )
-
-    # get IDs of final target resources:
-    target_ids: set[str] = set()
-    for target_resource in target_resources:
-        try:
-            target_ids.add(
-                lookup_self_id(
-                    resource=target_resource,
-                    identifier_slot=target_anchor_point.identifier_slot,
-                )
-            )
-        except SelfIdLookUpError as error:
-            raise MetadataTransformationError(
-                f"Cannot add reference '{reference}' to metadata resource '{resource}'"
-                + f" because the target resource '{target_resource}' does not have"
-                + f" an identifier in slot '{target_anchor_point.identifier_slot}'."
-            ) from error
+    try:
+        source_id = lookup_self_id(
+            resource=resource, identifier_slot=source_anchor_point.identifier_slot
+        )
+    except SelfIdLookUpError as error:
+        raise MetadataTransformationError(
+            f"Cannot add reference '{reference}' to metadata resource '{resource}'"
+            + " because the resource does not have an identifier in slot"
+            + f" '{source_anchor_point.identifier_slot}'."
+        ) from error
 
     # add the target IDs to the source resource:
     resource_copy = resource.copy()
-    resource_copy[reference.new_slot] = sorted(target_ids)
+    resource_copy[reference.new_slot] = target_ids_by_source[source_id]
 
     return resource_copy
 
@@ -115,9 +121,12 @@ def add_reference_to_metadata(
     *,
     metadata: Json,
     reference: InferredReference,
+    plan: ResolutionPlan,
     anchor_points_by_target: dict[str, AnchorPoint],
+    engine: ReferenceInferenceEngine = ReferenceInferenceEngine.JOIN,
 ) -> Json:
-    """Transform metadata by adding an inferred reference.
+    """Transform metadata by adding an inferred reference using the compiled
+    resolution plan of its path.
 
     Raises:
             MetadataTransformationError:
@@ -129,21 +138,29 @@ def add_reference_to_metadata(
         anchor_points_by_target=anchor_points_by_target,
     )
 
-    # The metadata is only read (not modified) while resolving this reference, so build
-    # the resolution index once and share it across all source resources instead of
-    # rebuilding (and rescanning the relevant classes) for every resource.
-    index = ResolutionIndex(
-        global_metadata=metadata,
-        anchor_points_by_target=anchor_points_by_target,
-    )
+    # Resolve the reference for all source resources at once, so that resources shared
+    # between the neighbourhoods of multiple source resources are traversed only once:
+    resolve: Callable[..., dict[str, list[str]]] = resolve_reference_for_metadata
+    if engine == ReferenceInferenceEngine.SPARSE:
+        # imported lazily since the sparse backend has optional dependencies:
+        from metldata.builtin_transformations.infer_references.path.resolve_sparse import (  # noqa: PLC0415
+            resolve_reference_for_metadata_sparse,
+        )
+
+        resolve = resolve_reference_for_metadata_sparse
+    try:
+        target_ids_by_source = resolve(global_metadata=metadata, plan=plan)
+    except (PathElementResolutionError, SelfIdLookUpError) as error:
+        raise MetadataTransformationError(
+            f"Cannot add reference '{reference}' to metadata: {error}"
+        ) from error
 
     modified_resources = [
         add_reference_to_metadata_resource(
             resource=resource,
-            global_metadata=metadata,
             reference=reference,
-            anchor_points_by_target=anchor_points_by_target,
-            index=index,
+            source_anchor_point=plan.source_anchor_point,
+            target_ids_by_source=target_ids_by_source,
         )
         for resource in resources
     ]
@@ -160,19 +177,32 @@ def add_references_to_metadata(
     *,
     metadata: Json,
     references: list[InferredReference],
+    plans: list[ResolutionPlan],
     anchor_points_by_target: dict[str, AnchorPoint],
+    engine: ReferenceInferenceEngine = ReferenceInferenceEngine.JOIN,
 ) -> Json:
     """Transform metadata and return the transformed one.
 
+    Args:
+        metadata: The metadata to transform.
+        references: The inferred references to add.
+        plans:
+            The resolution plans of the paths of the references as obtained from
+            `compile_reference_plans`, in the same order as the references.
+        anchor_points_by_target: The anchor points of the metadata model.
+        engine: The engine used to resolve the references.
+
     Raises:
         MetadataTransformationError:
             if the transformation of the metadata fails.
     """
-    for reference in references:
+    for reference, plan in zip(references, plans, strict=True):
         metadata = add_reference_to_metadata(
             metadata=metadata,
             reference=reference,
+            plan=plan,
             anchor_points_by_target=anchor_points_by_target,
+            engine=engine,
         )
 
     return metadata
@@ -22,7 +22,7 @@ from metldata.builtin_transformations.infer_references.path.path_str import (
     PATH_PATTERN,
     ValidationError,
     clean_path_str,
-    path_str_to_object_elements,
+    parse_path_str,
 )
 
 
@@ -69,7 +69,7 @@ class ReferencePath:
     def __init__(self, *, path_str: str):
         """Construct reference path from a string-based representation."""
         self.path_str = clean_path_str(path_str=path_str)
-        self.elements = path_str_to_object_elements(path_str=self.path_str)
+        self.elements = list(parse_path_str(self.path_str))
         self.source = self.elements[0].source
         self.target = self.elements[-1].target
 
@@ -105,3 +105,7 @@ class ReferencePath:
             return NotImplemented
 
         return self.path_str == other.path_str
+
+    def __hash__(self):
+        """For usage in sets and as dictionary keys."""
+        return hash(self.path_str)
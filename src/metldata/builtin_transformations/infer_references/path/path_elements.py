@@ -18,7 +18,7 @@
 
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ReferencePathElementType(Enum):
@@ -39,6 +39,8 @@ class ReferencePathElement(BaseModel):
     metadata model as further explained by the ReferencePath.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     type_: ReferencePathElementType = Field(
         ...,
         description=(
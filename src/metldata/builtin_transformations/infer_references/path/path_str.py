@@ -17,6 +17,7 @@
 """Data models"""
 
 import re
+from functools import lru_cache
 
 from metldata.builtin_transformations.infer_references.path.path_elements import (
     ReferencePathElement,
@@ -32,6 +33,7 @@ PATH_RAW_CHAR_PATTERN = r"^[\w><\(\)]+$"
 PATH_PATTERN = (
     rf"^{NAME_PATTERN}{ARROW_PATTERN}({NAME_PATTERN}{ARROW_PATTERN})*{NAME_PATTERN}$"
 )
+PATH_CACHE_SIZE = 1024
 
 
 class ValidationError(RuntimeError):
@@ -189,3 +191,15 @@ def path_str_to_object_elements(path_str: str) -> list[ReferencePathElement]:
     return [
         string_element_to_object(string_element) for string_element in string_elements
     ]
+
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def parse_path_str(path_str: str) -> tuple[ReferencePathElement, ...]:
+    """Translates a path string into a tuple of object-based elements. The path_str is
+    assumed to be cleaned.
+
+    Parsed paths are cached, so that the same path string (which typically occurs
+    repeatedly whenever a config is loaded or a model is transformed) is only validated
+    and decomposed once. The returned elements are immutable and thus safe to share.
+    """
+    return tuple(path_str_to_object_elements(path_str=path_str))
@@ -0,0 +1,100 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Compilation of reference paths into resolution plans."""
+
+from dataclasses import dataclass
+
+from metldata.builtin_transformations.infer_references.path.path import ReferencePath
+from metldata.builtin_transformations.infer_references.path.path_elements import (
+    ReferencePathElement,
+)
+from metldata.model_utils.anchors import (
+    AnchorPoint,
+    AnchorPointNotFoundError,
+    lookup_anchor_point,
+)
+
+
+class ResolutionPlanCompilationError(RuntimeError):
+    """Raised when a reference path cannot be compiled into a resolution plan."""
+
+
+@dataclass(frozen=True)
+class ResolutionStep:
+    """A path element together with the anchor points of its source and target
+    classes.
+    """
+
+    element: ReferencePathElement
+    source_anchor_point: AnchorPoint
+    target_anchor_point: AnchorPoint
+
+
+@dataclass(frozen=True)
+class ResolutionPlan:
+    """A reference path compiled against the anchor points of a metadata model.
+
+    All anchor points (and thereby the root and identifier slots) needed to resolve
+    the path are looked up once during compilation, so that the resolution of the path
+    does not need to look them up again for every resource and every path element.
+    """
+
+    path: ReferencePath
+    steps: tuple[ResolutionStep, ...]
+
+    @property
+    def source_anchor_point(self) -> AnchorPoint:
+        """The anchor point of the source class of the path."""
+        return self.steps[0].source_anchor_point
+
+    @property
+    def target_anchor_point(self) -> AnchorPoint:
+        """The anchor point of the target class of the path."""
+        return self.steps[-1].target_anchor_point
+
+
+def compile_resolution_plan(
+    *, reference_path: ReferencePath, anchor_points_by_target: dict[str, AnchorPoint]
+) -> ResolutionPlan:
+    """Compile a reference path into a resolution plan.
+
+    Raises:
+        ResolutionPlanCompilationError:
+            if an anchor point for a class of the path could not be found.
+    """
+    try:
+        steps = tuple(
+            ResolutionStep(
+                element=element,
+                source_anchor_point=lookup_anchor_point(
+                    class_name=element.source,
+                    anchor_points_by_target=anchor_points_by_target,
+                ),
+                target_anchor_point=lookup_anchor_point(
+                    class_name=element.target,
+                    anchor_points_by_target=anchor_points_by_target,
+                ),
+            )
+            for element in reference_path.elements
+        )
+    except AnchorPointNotFoundError as error:
+        raise ResolutionPlanCompilationError(
+            f"Cannot compile reference path '{reference_path.path_str}': {error}"
+        ) from error
+
+    return ResolutionPlan(path=reference_path, steps=steps)
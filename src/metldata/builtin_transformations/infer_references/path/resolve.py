@@ -14,29 +14,28 @@
 # limitations under the License.
 #
 
+
 """Logic for resolving reference paths for existing metadata."""
 
 from collections import defaultdict
 
-from metldata.builtin_transformations.infer_references.path.path import ReferencePath
 from metldata.builtin_transformations.infer_references.path.path_elements import (
-    ReferencePathElement,
     ReferencePathElementType,
 )
+from metldata.builtin_transformations.infer_references.path.plan import (
+    ResolutionPlan,
+    ResolutionStep,
+)
 from metldata.custom_types import Json
 from metldata.metadata_utils import (
     ForeignIdLookUpError,
+    MetadataAnchorMismatchError,
     MetadataResourceNotFoundError,
     SelfIdLookUpError,
-    index_resources_by_id,
     lookup_foreign_ids,
     lookup_self_id,
 )
-from metldata.model_utils.anchors import (
-    AnchorPoint,
-    AnchorPointNotFoundError,
-    lookup_anchor_point,
-)
+from metldata.model_utils.anchors import AnchorPoint
 
 
 class PathElementResolutionError(RuntimeError):
@@ -57,70 +56,82 @@ class ResolutionIndex:
     of a single inferred reference. The resolved resources are read-only.
     """
 
-    def __init__(
-        self,
-        *,
-        global_metadata: Json,
-        anchor_points_by_target: dict[str, AnchorPoint],
-    ):
+    def __init__(self, *, global_metadata: Json):
         self._global_metadata = global_metadata
-        self._anchor_points = anchor_points_by_target
         self._by_id: dict[str, dict[str, Json]] = {}
         self._back: dict[tuple[str, str], dict[str, set[str]]] = {}
 
-    def resource_by_id(self, *, class_name: str, identifier: str) -> Json:
-        """Return the resource of the given class with the given identifier.
+    def _resources(self, *, anchor_point: AnchorPoint) -> list[Json]:
+        """Return the resources anchored at the given anchor point.
 
         Raises:
-            MetadataResourceNotFoundError: if the resource could not be found.
+            MetadataAnchorMismatchError:
+                if the metadata does not contain the root slot of the anchor point.
         """
-        index = self._by_id.get(class_name)
-        if index is None:
-            index = index_resources_by_id(
-                class_name=class_name,
-                global_metadata=self._global_metadata,
-                anchor_points_by_target=self._anchor_points,
+        resources = self._global_metadata.get(anchor_point.root_slot)
+        if resources is None:
+            raise MetadataAnchorMismatchError(
+                "Could not find root slot of the anchor point"
+                + f" '{anchor_point.root_slot}' in the global metadata."
             )
-            self._by_id[class_name] = index
+
+        return resources
+
+    def _resources_by_id(self, *, anchor_point: AnchorPoint) -> dict[str, Json]:
+        """Return the (lazily built) id->resource map of the anchored class."""
+        index = self._by_id.get(anchor_point.target_class)
+        if index is None:
+            index = {
+                lookup_self_id(
+                    resource=resource, identifier_slot=anchor_point.identifier_slot
+                ): resource
+                for resource in self._resources(anchor_point=anchor_point)
+            }
+            self._by_id[anchor_point.target_class] = index
+
+        return index
+
+    def identifiers(self, *, anchor_point: AnchorPoint) -> list[str]:
+        """Return the identifiers of all resources of the anchored class."""
+        return list(self._resources_by_id(anchor_point=anchor_point))
+
+    def resource_by_id(self, *, anchor_point: AnchorPoint, identifier: str) -> Json:
+        """Return the resource of the anchored class with the given identifier.
+
+        Raises:
+            MetadataResourceNotFoundError: if the resource could not be found.
+        """
+        index = self._resources_by_id(anchor_point=anchor_point)
 
         try:
             return index[identifier]
         except KeyError as error:
             raise MetadataResourceNotFoundError(
                 f"Could not find resource with identifier '{identifier}' of class"
-                + f" '{class_name}' in the global metadata."
+                + f" '{anchor_point.target_class}' in the global metadata."
             ) from error
 
     def back_referencing_ids(
-        self, *, target_class: str, slot: str
+        self, *, target_anchor_point: AnchorPoint, slot: str
     ) -> dict[str, set[str]]:
-        """Map each id referenced via ``slot`` on resources of ``target_class`` to the
-        set of those resources' own identifiers.
+        """Map each id referenced via ``slot`` on resources of the class anchored at
+        ``target_anchor_point`` to the set of those resources' own identifiers.
 
         Raises:
             PathElementResolutionError: if the target class cannot be resolved.
         """
-        key = (target_class, slot)
+        key = (target_anchor_point.target_class, slot)
         index = self._back.get(key)
         if index is not None:
             return index
 
         try:
-            target_anchor_point = lookup_anchor_point(
-                class_name=target_class, anchor_points_by_target=self._anchor_points
-            )
-        except AnchorPointNotFoundError as error:
-            raise PathElementResolutionError(
-                "Cannot resolve path element because of a missing anchor point for"
-                + f" target class '{target_class}'."
-            ) from error
-
-        target_resources = self._global_metadata.get(target_anchor_point.root_slot)
-        if target_resources is None:
+            target_resources = self._resources(anchor_point=target_anchor_point)
+        except MetadataAnchorMismatchError as error:
             raise PathElementResolutionError(
                 "Cannot resolve path element: No target resources found for"
                 + f" root slot '{target_anchor_point.root_slot}'."
-            )
+            ) from error
 
         index = defaultdict(set)
         for target_resource in target_resources:
@@ -136,13 +147,13 @@ class ResolutionIndex:
 
 
 def resolve_target_ids_active_element(
-    *, source_resource: Json, path_element: ReferencePathElement
+    *, source_resource: Json, step: ResolutionStep
 ) -> set[str]:
     """Resolve an active reference path element applied to a metadata resource.
 
     Args:
         source_resource: The metadata resource to which the path element is applied.
-        path_element: The active path element to resolve.
+        step: The resolution step of the active path element to resolve.
 
     Returns:
         A list of target IDs that are targeted by the path element in context of the
@@ -152,12 +163,12 @@ def resolve_target_ids_active_element(
         PathElementResolutionError:
             if the path element cannot be resolved.
     """
-    if path_element.type_ != ReferencePathElementType.ACTIVE:
+    if step.element.type_ != ReferencePathElementType.ACTIVE:
         raise ValueError("Passive path element supplied where active expected.")
 
     try:
         target_ids = lookup_foreign_ids(
-            resource=source_resource, slot=path_element.slot
+            resource=source_resource, slot=step.element.slot
         )
     except ForeignIdLookUpError as error:
         raise PathElementResolutionError(
@@ -171,17 +182,15 @@ def resolve_target_ids_active_element(
 def resolve_target_ids_passive_element(
     *,
     source_resource: Json,
-    path_element: ReferencePathElement,
+    step: ResolutionStep,
     index: ResolutionIndex,
-    anchor_points_by_target: dict[str, AnchorPoint],
 ) -> set[str]:
     """Resolve a passive reference path element applied to a metadata resource.
 
     Args:
         source_resource: The metadata resource to which the path element is applied.
-        path_element: The passive path element to resolve.
+        step: The resolution step of the passive path element to resolve.
         index: The resolution index for the current metadata snapshot.
-        anchor_points_by_target: The anchor points by target class.
 
     Returns:
         A list of target IDs that are targeted by the path element in context of the
@@ -191,35 +200,25 @@ def resolve_target_ids_passive_element(
         PathElementResolutionError:
             if the path element cannot be resolved.
     """
-    if path_element.type_ != ReferencePathElementType.PASSIVE:
+    if step.element.type_ != ReferencePathElementType.PASSIVE:
         raise ValueError("Active path element supplied where passive expected.")
 
-    try:
-        source_anchor_point = lookup_anchor_point(
-            class_name=path_element.source,
-            anchor_points_by_target=anchor_points_by_target,
-        )
-    except AnchorPointNotFoundError as error:
-        raise PathElementResolutionError(
-            "Cannot resolve path element because of a missing anchor point for"
-            + f" source class '{path_element.source}'."
-        ) from error
-
     try:
         source_identifier = lookup_self_id(
             resource=source_resource,
-            identifier_slot=source_anchor_point.identifier_slot,
+            identifier_slot=step.source_anchor_point.identifier_slot,
         )
     except SelfIdLookUpError as error:
         raise PathElementResolutionError(
             f"Cannot resolve path element: '{error}'"
         ) from error
 
-    # Resources of the target class reference source ids via path_element.slot; use the
-    # precomputed reverse index to find, in O(1), which target resources reference this
-    # source - instead of rescanning the whole target class for every source resource.
+    # Resources of the target class reference source ids via the slot of the element;
+    # use the precomputed reverse index to find, in O(1), which target resources
+    # reference this source - instead of rescanning the whole target class for every
+    # source resource.
     back_references = index.back_referencing_ids(
-        target_class=path_element.target, slot=path_element.slot
+        target_anchor_point=step.target_anchor_point, slot=step.element.slot
     )
 
     return set(back_references.get(source_identifier, ()))
@@ -229,8 +228,7 @@ def resolve_path_element(
     *,
     source_resource: Json,
     index: ResolutionIndex,
-    path_element: ReferencePathElement,
-    anchor_points_by_target: dict[str, AnchorPoint],
+    step: ResolutionStep,
 ) -> list[Json]:
     """Resolve a reference path element applied to a metadata resource.
 
@@ -241,16 +239,13 @@ def resolve_path_element(
         PathElementResolutionError:
             if the path element cannot be resolved.
     """
-    if path_element.type_ == ReferencePathElementType.ACTIVE:
+    if step.element.type_ == ReferencePathElementType.ACTIVE:
         target_ids = resolve_target_ids_active_element(
-            source_resource=source_resource, path_element=path_element
+            source_resource=source_resource, step=step
         )
     else:
         target_ids = resolve_target_ids_passive_element(
-            source_resource=source_resource,
-            path_element=path_element,
-            index=index,
-            anchor_points_by_target=anchor_points_by_target,
+            source_resource=source_resource, step=step, index=index
         )
 
     if not target_ids:
@@ -260,8 +255,7 @@ def resolve_path_element(
     for target_id in target_ids:
         try:
             target_resource = index.resource_by_id(
-                class_name=path_element.target,
-                identifier=target_id,
+                anchor_point=step.target_anchor_point, identifier=target_id
             )
         except MetadataResourceNotFoundError as error:
             raise PathElementResolutionError(
@@ -278,8 +272,7 @@ def resolve_reference_for_metadata_resource(
     *,
     resource: Json,
     global_metadata: Json,
-    reference_path: ReferencePath,
-    anchor_points_by_target: dict[str, AnchorPoint],
+    plan: ResolutionPlan,
     index: ResolutionIndex | None = None,
 ) -> list[Json]:
     """Resolve an inferred reference for an individual metadata resource.
@@ -287,8 +280,7 @@ def resolve_reference_for_metadata_resource(
     Args:
         resource: The metadata resource to resolve the reference for.
         global_metadata: The global metadata context to look up references in.
-        reference_path: The path of the inferred reference.
-        anchor_points: The anchor points of the metadata model.
+        plan: The compiled resolution plan of the path of the inferred reference.
         index:
             A resolution index for ``global_metadata``. When resolving the same
             reference for many resources, build the index once and pass it in to avoid
@@ -303,20 +295,14 @@ def resolve_reference_for_metadata_resource(
             if the reference resolution fails.
     """
     if index is None:
-        index = ResolutionIndex(
-            global_metadata=global_metadata,
-            anchor_points_by_target=anchor_points_by_target,
-        )
+        index = ResolutionIndex(global_metadata=global_metadata)
 
     source_resources = [resource]
-    for path_element in reference_path.elements:
+    for step in plan.steps:
         target_resources: list[Json] = []
         for source_resource in source_resources:
             local_target_resources = resolve_path_element(
-                source_resource=source_resource,
-                index=index,
-                path_element=path_element,
-                anchor_points_by_target=anchor_points_by_target,
+                source_resource=source_resource, index=index, step=step
             )
             target_resources.extend(local_target_resources)
 
@@ -325,3 +311,116 @@ def resolve_reference_for_metadata_resource(
         source_resources = target_resources
 
     return source_resources
+
+
+def resolve_adjacency_for_path_element(
+    *,
+    source_ids: set[str],
+    step: ResolutionStep,
+    index: ResolutionIndex,
+) -> dict[str, set[str]]:
+    """Resolve a reference path element for a set of source resources at once.
+
+    Args:
+        source_ids: The identifiers of the source resources to resolve.
+        step: The resolution step of the path element to resolve.
+        index: The resolution index for the current metadata snapshot.
+
+    Returns:
+        A mapping from each of the provided source IDs to the IDs of the target
+        resources that are targeted by the path element.
+
+    Raises:
+        PathElementResolutionError:
+            if the path element cannot be resolved.
+    """
+    if step.element.type_ == ReferencePathElementType.PASSIVE:
+        back_references = index.back_referencing_ids(
+            target_anchor_point=step.target_anchor_point, slot=step.element.slot
+        )
+        return {
+            source_id: back_references.get(source_id, set()) for source_id in source_ids
+        }
+
+    adjacency: dict[str, set[str]] = {}
+    for source_id in source_ids:
+        source_resource = index.resource_by_id(
+            anchor_point=step.source_anchor_point, identifier=source_id
+        )
+        target_ids = resolve_target_ids_active_element(
+            source_resource=source_resource, step=step
+        )
+        for target_id in target_ids:
+            try:
+                index.resource_by_id(
+                    anchor_point=step.target_anchor_point, identifier=target_id
+                )
+            except MetadataResourceNotFoundError as error:
+                raise PathElementResolutionError(
+                    "Cannot resolve path element for source resource"
+                    + f" '{source_resource}' because the target resource with ID"
+                    + f" '{target_id}' could not be found."
+                ) from error
+        adjacency[source_id] = target_ids
+
+    return adjacency
+
+
+def resolve_reference_for_metadata(
+    *,
+    global_metadata: Json,
+    plan: ResolutionPlan,
+    index: ResolutionIndex | None = None,
+) -> dict[str, list[str]]:
+    """Resolve an inferred reference for all resources of the source class at once.
+
+    Instead of walking the path separately for every source resource, the path is
+    evaluated as a sequence of relational joins over id->ids adjacency maps: A forward
+    pass determines which resources are reachable at each step of the path and
+    resolves the path elements only for those. A backward pass then composes the
+    adjacency maps starting from the target class, so that the targets reachable from
+    an intermediate resource are computed only once, no matter by how many source
+    resources it is shared.
+
+    Args:
+        global_metadata: The global metadata context to look up references in.
+        plan: The compiled resolution plan of the path of the inferred reference.
+        index:
+            A resolution index for ``global_metadata``. If omitted, a fresh index is
+            built (valid since ``global_metadata`` is only read here).
+
+    Returns:
+        A mapping from the IDs of all resources of the source class to the sorted IDs
+        of the target resources that are targeted by the reference.
+
+    Raises:
+        PathElementResolutionError:
+            if the reference resolution fails.
+    """
+    if index is None:
+        index = ResolutionIndex(global_metadata=global_metadata)
+
+    source_ids = index.identifiers(anchor_point=plan.source_anchor_point)
+
+    # forward pass, only resolve resources that are actually reachable:
+    adjacencies: list[dict[str, set[str]]] = []
+    reachable_ids = set(source_ids)
+    for step in plan.steps:
+        adjacency = resolve_adjacency_for_path_element(
+            source_ids=reachable_ids, step=step, index=index
+        )
+        adjacencies.append(adjacency)
+        reachable_ids = set().union(*adjacency.values())
+
+    # backward pass, compose the adjacency maps starting from the target class:
+    target_ids_by_id = adjacencies.pop()
+    for adjacency in reversed(adjacencies):
+        composed: dict[str, set[str]] = {}
+        for source_id, intermediate_ids in adjacency.items():
+            target_ids: set[str] = set()
+            for intermediate_id in intermediate_ids:
+                target_ids.update(target_ids_by_id[intermediate_id])
+            composed[source_id] = target_ids
+        target_ids_by_id = composed
+
+    return {source_id: sorted(target_ids_by_id[source_id]) for source_id in source_ids}
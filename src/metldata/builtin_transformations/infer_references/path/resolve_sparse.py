@@ -0,0 +1,292 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""A sparse-matrix backend for resolving reference paths for existing metadata.
+
+This backend requires the optional dependencies NumPy and SciPy, which can be installed
+via the "sparse" extra of this package.
+"""
+
+from metldata.builtin_transformations.infer_references.path.path_elements import (
+    ReferencePathElementType,
+)
+from metldata.builtin_transformations.infer_references.path.plan import (
+    ResolutionPlan,
+    ResolutionStep,
+)
+from metldata.builtin_transformations.infer_references.path.resolve import (
+    PathElementResolutionError,
+)
+from metldata.custom_types import Json
+from metldata.metadata_utils import (
+    ForeignIdLookUpError,
+    MetadataAnchorMismatchError,
+    lookup_foreign_ids,
+    lookup_self_id,
+)
+from metldata.model_utils.anchors import AnchorPoint
+
+try:
+    import numpy
+    from scipy import sparse
+except ImportError:
+    SPARSE_BACKEND_AVAILABLE = False
+else:
+    SPARSE_BACKEND_AVAILABLE = True
+
+
+class SparseBackendNotAvailableError(RuntimeError):
+    """Raised when the sparse-matrix backend is used but NumPy or SciPy are not
+    installed.
+    """
+
+
+def check_sparse_backend() -> None:
+    """Check that the optional dependencies of the sparse-matrix backend are installed.
+
+    Raises:
+        SparseBackendNotAvailableError: if NumPy or SciPy cannot be imported.
+    """
+    if not SPARSE_BACKEND_AVAILABLE:
+        raise SparseBackendNotAvailableError(
+            "The sparse-matrix backend for reference inference requires NumPy and"
+            + " SciPy. Please install them using the 'sparse' extra of metldata."
+        )
+
+
+class SparseResolutionIndex:
+    """Per-metadata-snapshot indexes for resolving reference paths using sparse
+    matrices.
+
+    The resources of each class are mapped to dense integer indexes following the
+    sorted order of their identifiers, so that the column indexes of a resolved row
+    directly translate into a sorted list of identifiers. Each path element is
+    represented as a sparse boolean adjacency matrix with one row per resource of its
+    source class and one column per resource of its target class.
+
+    As for the ``ResolutionIndex``, the index is only valid while the underlying
+    metadata is unchanged.
+    """
+
+    def __init__(self, *, global_metadata: Json):
+        check_sparse_backend()
+        self._global_metadata = global_metadata
+        self._resources: dict[str, list[Json]] = {}
+        self._ids: dict[str, numpy.ndarray] = {}
+        self._positions: dict[str, dict[str, int]] = {}
+
+    def _index_class(self, *, anchor_point: AnchorPoint) -> None:
+        """Assign integer indexes to the resources of the anchored class in the sorted
+        order of their identifiers.
+        """
+        if anchor_point.root_slot not in self._global_metadata:
+            raise MetadataAnchorMismatchError(
+                "Could not find root slot of the anchor point"
+                + f" '{anchor_point.root_slot}' in the global metadata."
+            )
+
+        resources_by_id = {
+            lookup_self_id(
+                resource=resource, identifier_slot=anchor_point.identifier_slot
+            ): resource
+            for resource in self._global_metadata[anchor_point.root_slot]
+        }
+        ids = sorted(resources_by_id)
+
+        class_name = anchor_point.target_class
+        self._resources[class_name] = [resources_by_id[id_] for id_ in ids]
+        self._ids[class_name] = numpy.array(ids, dtype=object)
+        self._positions[class_name] = {
+            id_: position for position, id_ in enumerate(ids)
+        }
+
+    def resources(self, *, anchor_point: AnchorPoint) -> list[Json]:
+        """Return the resources of the anchored class ordered by their integer
+        index.
+        """
+        if anchor_point.target_class not in self._resources:
+            self._index_class(anchor_point=anchor_point)
+        return self._resources[anchor_point.target_class]
+
+    def ids(self, *, anchor_point: AnchorPoint) -> "numpy.ndarray":
+        """Return the sorted identifiers of the anchored class as an array, i.e. the
+        identifier of each integer index.
+        """
+        if anchor_point.target_class not in self._ids:
+            self._index_class(anchor_point=anchor_point)
+        return self._ids[anchor_point.target_class]
+
+    def positions(self, *, anchor_point: AnchorPoint) -> dict[str, int]:
+        """Return a mapping from identifier to integer index for the anchored
+        class.
+        """
+        if anchor_point.target_class not in self._positions:
+            self._index_class(anchor_point=anchor_point)
+        return self._positions[anchor_point.target_class]
+
+    def _adjacency_matrix(
+        self,
+        *,
+        row_resources: list[Json],
+        slot: str,
+        column_positions: dict[str, int],
+        shape: tuple[int, int],
+        skip_unknown: bool,
+    ) -> tuple["sparse.csr_array", dict[int, PathElementResolutionError]]:
+        """Build a boolean adjacency matrix from the references held by the given
+        resources in the given slot.
+
+        Returns:
+            A tuple of the adjacency matrix and of errors that occurred while
+            processing individual rows. Rows with errors are left empty.
+        """
+        rows: list[int] = []
+        columns: list[int] = []
+        errors: dict[int, PathElementResolutionError] = {}
+        for row, resource in enumerate(row_resources):
+            try:
+                foreign_ids = lookup_foreign_ids(resource=resource, slot=slot)
+            except ForeignIdLookUpError as error:
+                errors[row] = PathElementResolutionError(
+                    "Failed to resolve the path element applied to the"
+                    + f" resource '{resource}': {error}"
+                )
+                continue
+
+            row_columns: list[int] = []
+            for foreign_id in foreign_ids:
+                column = column_positions.get(foreign_id)
+                if column is None:
+                    if skip_unknown:
+                        continue
+                    errors[row] = PathElementResolutionError(
+                        f"Cannot resolve path element for source resource '{resource}'"
+                        + f" because the target resource with ID '{foreign_id}' could"
+                        + " not be found."
+                    )
+                    break
+                row_columns.append(column)
+            else:
+                rows.extend([row] * len(row_columns))
+                columns.extend(row_columns)
+
+        matrix = sparse.csr_array(
+            (numpy.ones(len(rows), dtype=bool), (rows, columns)), shape=shape
+        )
+        return matrix, errors
+
+    def adjacency(
+        self, *, step: ResolutionStep
+    ) -> tuple["sparse.csr_array", dict[int, PathElementResolutionError]]:
+        """Return the adjacency matrix of the path element of the given step.
+
+        Returns:
+            A tuple of the adjacency matrix and of errors that occurred for individual
+            resources of the source class. These errors must only be raised if the
+            corresponding resource is actually reached when resolving a path.
+
+        Raises:
+            PathElementResolutionError:
+                if the path element cannot be resolved for any resource.
+        """
+        source_positions = self.positions(anchor_point=step.source_anchor_point)
+        target_positions = self.positions(anchor_point=step.target_anchor_point)
+        shape = (len(source_positions), len(target_positions))
+
+        if step.element.type_ == ReferencePathElementType.ACTIVE:
+            return self._adjacency_matrix(
+                row_resources=self.resources(anchor_point=step.source_anchor_point),
+                slot=step.element.slot,
+                column_positions=target_positions,
+                shape=shape,
+                skip_unknown=False,
+            )
+
+        # resources of the target class reference the source class, so build the
+        # matrix from the target side and transpose it:
+        transposed_matrix, errors = self._adjacency_matrix(
+            row_resources=self.resources(anchor_point=step.target_anchor_point),
+            slot=step.element.slot,
+            column_positions=source_positions,
+            shape=(shape[1], shape[0]),
+            skip_unknown=True,
+        )
+        if errors:
+            raise next(iter(errors.values()))
+
+        return transposed_matrix.T.tocsr(), {}
+
+
+def resolve_reference_for_metadata_sparse(
+    *,
+    global_metadata: Json,
+    plan: ResolutionPlan,
+    index: SparseResolutionIndex | None = None,
+) -> dict[str, list[str]]:
+    """Resolve an inferred reference for all resources of the source class at once
+    using sparse matrix products.
+
+    This is equivalent to ``resolve_reference_for_metadata`` but scales to submissions
+    with millions of links between resources.
+
+    Args:
+        global_metadata: The global metadata context to look up references in.
+        plan: The compiled resolution plan of the path of the inferred reference.
+        index:
+            A sparse resolution index for ``global_metadata``. If omitted, a fresh
+            index is built.
+
+    Returns:
+        A mapping from the IDs of all resources of the source class to the sorted IDs
+        of the target resources that are targeted by the reference.
+
+    Raises:
+        SparseBackendNotAvailableError:
+            if NumPy or SciPy are not installed.
+        PathElementResolutionError:
+            if the reference resolution fails.
+    """
+    if index is None:
+        index = SparseResolutionIndex(global_metadata=global_metadata)
+
+    source_ids = index.ids(anchor_point=plan.source_anchor_point)
+
+    product: sparse.csr_array | None = None
+    for step in plan.steps:
+        adjacency, errors = index.adjacency(step=step)
+
+        # only raise errors for resources that are reachable from any source:
+        if errors:
+            reachable = (
+                numpy.diff(product.tocsc().indptr) > 0 if product is not None else None
+            )
+            for row, error in errors.items():
+                if reachable is None or reachable[row]:
+                    raise error
+
+        product = adjacency if product is None else (product @ adjacency).tocsr()
+
+    assert product is not None  # noqa: S101
+    product.sort_indices()
+    target_ids = index.ids(anchor_point=plan.target_anchor_point)
+
+    return {
+        source_id: target_ids[
+            product.indices[product.indptr[row] : product.indptr[row + 1]]
+        ].tolist()
+        for row, source_id in enumerate(source_ids.tolist())
+    }
@@ -22,6 +22,7 @@ from metldata.builtin_transformations.merge_slots.assumptions import (
 from metldata.builtin_transformations.merge_slots.config import SlotMergingConfig
 from metldata.builtin_transformations.merge_slots.metadata_transform import (
     apply_merge_instructions_to_metadata,
+    compile_merge_instructions,
 )
 from metldata.builtin_transformations.merge_slots.model_transform import (
     merge_slots_in_model,
@@ -69,6 +70,9 @@ class SlotMergingMetadataTransformer(MetadataTransformer[SlotMergingConfig]):
         self._anchor_points_by_target = get_anchors_points_by_target(
             model=self._original_model
         )
+        self._merges_by_class = compile_merge_instructions(
+            self._config.merge_instructions
+        )
 
     def transform(self, *, metadata: Json, annotation: SubmissionAnnotation) -> Json:
         """Transforms metadata.
@@ -83,7 +87,7 @@ class SlotMergingMetadataTransformer(MetadataTransformer[SlotMergingConfig]):
         """
         return apply_merge_instructions_to_metadata(
             metadata=metadata,
-            merge_instructions=self._config.merge_instructions,
+            merges_by_class=self._merges_by_class,
             anchor_points_by_target=self._anchor_points_by_target,
         )
 
@@ -16,118 +16,145 @@
 
 """Logic for transforming metadata."""
 
-from copy import deepcopy
+from collections import defaultdict
+from dataclasses import dataclass
 
 from metldata.builtin_transformations.merge_slots.models import SlotMergeInstruction
 from metldata.custom_types import Json
 from metldata.metadata_utils import (
+    MetadataAnchorMismatchError,
     SlotNotFoundError,
-    get_resources_of_class,
     lookup_slot_in_resource,
-    upsert_resources_in_metadata,
 )
-from metldata.model_utils.anchors import AnchorPoint
+from metldata.model_utils.anchors import AnchorPoint, lookup_anchor_point
 from metldata.transform.base import MetadataTransformationError
 
 
-def apply_merge_instruction_to_resource(
-    *, resource: Json, merge_instruction: SlotMergeInstruction
-) -> Json:
-    """Merge slots in a metadata resource according to the given instruction. Duplicate
-    values are removed.
-
-    Args:
-        resource: The resource to transform.
-        merge_instruction: The merge instruction to apply.
+@dataclass(frozen=True)
+class CompiledSlotMerge:
+    """A slot merge instruction compiled for repeated application to resources.
 
-    Returns:
-        The transformed resource.
+    Attributes:
+        class_name: The class to which the slots belong.
+        source_slots: The slots that are merged, in the order of the instruction.
+        target_slot: The slot into which the source slots are merged.
     """
-    modified_resource = deepcopy(resource)
 
-    try:
-        lookup_slot_in_resource(
-            resource=resource, slot_name=merge_instruction.target_slot
-        )
-    except SlotNotFoundError:
-        # this is expected
-        pass
-    else:
-        raise MetadataTransformationError(
-            f"Target slot {merge_instruction.target_slot} already exists in resource"
-            + f" of target class {merge_instruction.class_name}."
+    class_name: str
+    source_slots: tuple[str, ...]
+    target_slot: str
+
+    @classmethod
+    def from_instruction(cls, merge_instruction: SlotMergeInstruction):
+        """Compile the given merge instruction."""
+        return cls(
+            class_name=merge_instruction.class_name,
+            source_slots=tuple(merge_instruction.source_slots),
+            target_slot=merge_instruction.target_slot,
         )
 
-    merged = []
-    for source_slot in merge_instruction.source_slots:
-        content = lookup_slot_in_resource(resource=resource, slot_name=source_slot)
-        if isinstance(content, list):
-            merged.extend(content)
+    def merge(self, resource: Json) -> list:
+        """Merge the source slots of the given resource. Duplicate values are removed
+        while the order of first occurrence is retained.
+
+        Raises:
+            MetadataTransformationError:
+                if the target slot already exists in the resource.
+            SlotNotFoundError:
+                if a source slot does not exist in the resource.
+        """
+        try:
+            lookup_slot_in_resource(resource=resource, slot_name=self.target_slot)
+        except SlotNotFoundError:
+            # this is expected
+            pass
         else:
-            merged.append(content)
+            raise MetadataTransformationError(
+                f"Target slot {self.target_slot} already exists in resource"
+                + f" of target class {self.class_name}."
+            )
 
-    # Remove duplicates and assign to target slot
-    modified_resource[merge_instruction.target_slot] = list(dict.fromkeys(merged))
+        # a dict is used as an insertion-ordered set to remove duplicates on the fly:
+        merged: dict = {}
+        for source_slot in self.source_slots:
+            content = lookup_slot_in_resource(resource=resource, slot_name=source_slot)
+            if isinstance(content, list):
+                merged.update(dict.fromkeys(content))
+            else:
+                merged[content] = None
 
-    return modified_resource
+        return list(merged)
 
 
-def apply_merge_instruction_to_metadata(
-    *,
-    metadata: Json,
-    merge_instruction: SlotMergeInstruction,
-    anchor_points_by_target: dict[str, AnchorPoint],
+def compile_merge_instructions(
+    merge_instructions: list[SlotMergeInstruction],
+) -> dict[str, list[CompiledSlotMerge]]:
+    """Compile the given merge instructions and group them by class. The order of the
+    instructions is retained within each class.
+    """
+    merges_by_class: dict[str, list[CompiledSlotMerge]] = defaultdict(list)
+    for merge_instruction in merge_instructions:
+        merges_by_class[merge_instruction.class_name].append(
+            CompiledSlotMerge.from_instruction(merge_instruction)
+        )
+    return dict(merges_by_class)
+
+
+def apply_merges_to_resource(
+    *, resource: Json, merges: list[CompiledSlotMerge]
 ) -> Json:
-    """Merge slots in metadata according to the given instruction.
+    """Merge slots in a metadata resource according to the given compiled merge
+    instructions.
 
     Args:
-        metadata: The metadata to transform.
-        merge_instruction: The merge instruction to apply.
+        resource: The resource to transform.
+        merges: The compiled merge instructions to apply.
 
     Returns:
-        The transformed metadata.
+        A shallow copy of the resource that additionally contains the target slots.
     """
-    resources = get_resources_of_class(
-        class_name=merge_instruction.class_name,
-        global_metadata=metadata,
-        anchor_points_by_target=anchor_points_by_target,
-    )
-
-    modified_resources = [
-        apply_merge_instruction_to_resource(
-            resource=resource, merge_instruction=merge_instruction
-        )
-        for resource in resources
-    ]
+    modified_resource = resource.copy()
+    for merge in merges:
+        modified_resource[merge.target_slot] = merge.merge(modified_resource)
 
-    return upsert_resources_in_metadata(
-        resources=modified_resources,
-        class_name=merge_instruction.class_name,
-        global_metadata=metadata,
-        anchor_points_by_target=anchor_points_by_target,
-    )
+    return modified_resource
 
 
 def apply_merge_instructions_to_metadata(
     *,
     metadata: Json,
-    merge_instructions: list[SlotMergeInstruction],
+    merges_by_class: dict[str, list[CompiledSlotMerge]],
     anchor_points_by_target: dict[str, AnchorPoint],
 ) -> Json:
     """Merge slots in metadata according to the given instructions.
 
+    All instructions of a class are applied in a single pass over its resources.
+    Only the top level of the metadata and the resources of the affected classes are
+    copied, all other content is shared with the provided metadata.
+
     Args:
         metadata: The metadata to transform.
-        merge_instructions: The merge instructions to apply.
+        merges_by_class: The compiled merge instructions to apply grouped by class,
+            as returned by `compile_merge_instructions`.
+        anchor_points_by_target: The anchor points by target class.
 
     Returns:
         The transformed metadata.
     """
-    for merge_instruction in merge_instructions:
-        metadata = apply_merge_instruction_to_metadata(
-            metadata=metadata,
-            merge_instruction=merge_instruction,
-            anchor_points_by_target=anchor_points_by_target,
-        )
-
-    return metadata
+    modified_metadata = metadata.copy()
+    for class_name, merges in merges_by_class.items():
+        root_slot = lookup_anchor_point(
+            class_name=class_name, anchor_points_by_target=anchor_points_by_target
+        ).root_slot
+        if root_slot not in metadata:
+            raise MetadataAnchorMismatchError(
+                f"Could not find root slot of the anchor point '{root_slot}'"
+                + " in the global metadata."
+            )
+
+        modified_metadata[root_slot] = [
+            apply_merges_to_resource(resource=resource, merges=merges)
+            for resource in metadata[root_slot]
+        ]
+
+    return modified_metadata
@@ -16,17 +16,177 @@
 
 """A transformation that normalizes a model to a canonical form."""
 
+import json
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+from hashlib import sha256
+from typing import Any
+
 from linkml_runtime import SchemaView
 from linkml_runtime.linkml_model.meta import SlotDefinition
+from linkml_runtime.utils.formatutils import underscore
 
 from metldata.model_utils.essentials import MetadataModel
 
+# The maximum number of normalized models kept in memory:
+NORMALIZED_MODEL_CACHE_SIZE = 16
+
+# The metaslots inherited from ancestor slot definitions. The metamodel exposes them
+# only as a private attribute, so the SchemaView is used instead if it disappears:
+_INHERITED_METASLOTS: list[str] | None = getattr(
+    SlotDefinition, "_inherited_slots", None
+)
+
+# Slot-usage values of these metaslots are combined across the class hierarchy
+# rather than overridden, consistent with the SchemaView:
+_COMBINE_METASLOTS = {
+    "maximum_value": min,
+    "minimum_value": max,
+}
+
+
+class ClassSlotInducer:
+    """Induces the slots of all classes of a schema in a single pass.
+
+    This yields the same slot definitions as `SchemaView.class_induced_slots`.
+    However, the schema-wide information the SchemaView recomputes for every
+    (class, slot) pair is computed only once per schema. This includes the metaslot
+    names and the classes using each slot. Moreover, only the metaslots actually
+    set in the slot usage of an ancestor class are considered when propagating slot
+    usages along the class hierarchy.
+
+    Unlike the SchemaView, the inducer does not modify the schema. If the installed
+    LinkML version does not expose the inherited metaslots, the slots are induced by
+    a SchemaView on a copy of the schema instead.
+    """
+
+    def __init__(self, schema_view: SchemaView):
+        """Initialize the inducer for the given schema."""
+        self._schema_view = schema_view
+        self._fallback_schema_view = (
+            SchemaView(deepcopy(schema_view.schema))
+            if _INHERITED_METASLOTS is None
+            else None
+        )
+        self._metaslot_names = list(vars(SlotDefinition(name="metaslots")))
+        self._domains: dict[str, list[str]] = {}
+        for cls in schema_view.all_classes().values():
+            for slot_name in (*cls.slots, *cls.attributes):
+                domain = self._domains.setdefault(slot_name, [])
+                if cls.name not in domain:
+                    domain.append(cls.name)
+
+    def _base_slot(self, *, slot_name: str, ancestors: list[str]) -> SlotDefinition:
+        """Get a copy of the attribute or schema-level definition of the given slot
+        that is the starting point for inducing it in a class with the given
+        ancestors.
+        """
+        schema_view = self._schema_view
+        for ancestor in ancestors:
+            attributes = schema_view.get_class(ancestor).attributes
+            if slot_name in attributes:
+                source_slot = attributes[slot_name]
+                base_slot = deepcopy(source_slot)
+                break
+        else:
+            source_slot = schema_view.get_slot(slot_name, attributes=False)
+            if source_slot is None:
+                raise ValueError(
+                    f"No such slot {slot_name} as an attribute of {ancestors[0]}"
+                    + " ancestors or as a slot definition in the schema"
+                )
+            base_slot = deepcopy(source_slot)
+            for slot_ancestor in reversed(
+                schema_view.slot_ancestors(slot_name, reflexive=True)
+            ):
+                ancestor_slot = schema_view.get_slot(slot_ancestor, attributes=False)
+                for metaslot_name in _INHERITED_METASLOTS or ():
+                    value = getattr(ancestor_slot, metaslot_name, None)
+                    if value:
+                        setattr(base_slot, metaslot_name, deepcopy(value))
+
+        # the SchemaView applies these to the source definition instead:
+        if source_slot.inlined_as_list:
+            base_slot.inlined = True
+        if source_slot.identifier or source_slot.key:
+            base_slot.required = True
+
+        return base_slot
+
+    def _propagate_slot_usages(
+        self, *, slot_name: str, class_name: str, induced_slot: SlotDefinition
+    ) -> dict[str, Any]:
+        """Get the metaslot values of the given slot in the given class by applying
+        the slot usages of the ancestors of the class to the values of the given
+        induced slot.
+        """
+        schema_view = self._schema_view
+        values = {
+            metaslot_name: getattr(induced_slot, metaslot_name, None)
+            for metaslot_name in self._metaslot_names
+        }
+        # slot usages are applied from the most general to the most specific class:
+        for ancestor in reversed(
+            schema_view.class_ancestors(class_name, reflexive=True, mixins=True)
+        ):
+            slot_usage = schema_view.get_class(ancestor).slot_usage.get(slot_name)
+            if slot_usage is None:
+                continue
+            for metaslot_name, value in vars(slot_usage).items():
+                if value is None or metaslot_name not in values:
+                    continue
+                current_value = values[metaslot_name]
+                combine = _COMBINE_METASLOTS.get(metaslot_name)
+                values[metaslot_name] = (
+                    combine(current_value, value)
+                    if combine is not None and current_value is not None
+                    else deepcopy(value)
+                )
+
+        return values
+
+    def induce_slot(self, *, slot_name: str, class_name: str) -> SlotDefinition:
+        """Induce the given slot in the given class."""
+        if self._fallback_schema_view is not None:
+            return self._fallback_schema_view.induced_slot(slot_name, class_name)
+
+        schema_view = self._schema_view
+        ancestors = schema_view.class_ancestors(class_name)
+        induced_slot = self._base_slot(slot_name=slot_name, ancestors=ancestors)
+
+        values = self._propagate_slot_usages(
+            slot_name=slot_name, class_name=class_name, induced_slot=induced_slot
+        )
+        if values["range"] is None:
+            values["range"] = schema_view.schema.default_range
+
+        for metaslot_name, value in values.items():
+            if value is not None:
+                setattr(induced_slot, metaslot_name, value)
+        induced_slot.owner = class_name
+        if not induced_slot.alias:
+            induced_slot.alias = underscore(slot_name)
+        for domain_class in self._domains.get(induced_slot.name, []):
+            if domain_class not in induced_slot.domain_of:
+                induced_slot.domain_of.append(domain_class)
+
+        return induced_slot
+
+    def induce_class_slots(self, class_name: str) -> list[SlotDefinition]:
+        """Induce all slots of the given class."""
+        return [
+            self.induce_slot(slot_name=slot_name, class_name=class_name)
+            for slot_name in self._schema_view.class_slots(class_name)
+        ]
+
 
 def resolve_inheritance(output_model: dict, input_schema_view: SchemaView) -> None:
     """Resolve inheritance by embedding all slots into the derived classes."""
+    inducer = ClassSlotInducer(input_schema_view)
     all_slot_names = set()
     for cls_name, cls in output_model["classes"].items():
-        slot_usages = input_schema_view.class_induced_slots(cls_name)
+        slot_usages = inducer.induce_class_slots(cls_name)
         slot_names = [slot.name for slot in slot_usages]
         # Integrate all slot information
         cls["slot_usage"] = {slot_def.name: slot_def for slot_def in slot_usages}
@@ -65,15 +225,68 @@ def embed_types(output_model: dict, input_schema_view: SchemaView) -> None:
         output_model["imports"].remove("linkml:types")
 
 
+def get_model_fingerprint(model: MetadataModel) -> str:
+    """Get a fingerprint that identifies the content of the given model."""
+    model_json = json.dumps(model.as_dict(essential=False), sort_keys=True, default=str)
+    return sha256(model_json.encode()).hexdigest()
+
+
+class NormalizedModelCache:
+    """A thread-safe cache of normalized models by the fingerprint of the input
+    model, which evicts the least recently used model once it is full.
+    """
+
+    def __init__(self, *, maxsize: int):
+        """Initialize an empty cache holding up to the given number of models."""
+        self._maxsize = maxsize
+        self._models: OrderedDict[str, MetadataModel] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str) -> MetadataModel | None:
+        """Get the normalized model for the given fingerprint, if cached."""
+        with self._lock:
+            model = self._models.get(fingerprint)
+            if model is not None:
+                self._models.move_to_end(fingerprint)
+            return model
+
+    def put(self, fingerprint: str, model: MetadataModel) -> None:
+        """Cache the normalized model for the given fingerprint."""
+        with self._lock:
+            self._models[fingerprint] = model
+            self._models.move_to_end(fingerprint)
+            while len(self._models) > self._maxsize:
+                self._models.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached models."""
+        with self._lock:
+            self._models.clear()
+
+
+_normalized_models = NormalizedModelCache(maxsize=NORMALIZED_MODEL_CACHE_SIZE)
+
+
 def normalize_model(model: MetadataModel) -> MetadataModel:
     """Normalize model to canonical form with all slots being globally defined
     only as empty stubs and all slot definitions being defined in the slot_usage
     of the respective class.
+
+    Normalized models are memoized by the fingerprint of the input model, so that
+    normalizing the same model repeatedly, e.g. when resolving multiple workflows,
+    only requires copying the memoized result.
     """
-    output_model = model.as_dict()
-    schema_view = model.schema_view
+    fingerprint = get_model_fingerprint(model)
+    normalized_model = _normalized_models.get(fingerprint)
+
+    if normalized_model is None:
+        output_model = model.as_dict()
+        schema_view = model.schema_view
+
+        resolve_inheritance(output_model, schema_view)
+        embed_types(output_model, schema_view)
 
-    resolve_inheritance(output_model, schema_view)
-    embed_types(output_model, schema_view)
+        normalized_model = MetadataModel(**output_model)
+        _normalized_models.put(fingerprint, normalized_model)
 
-    return MetadataModel(**output_model)
+    return deepcopy(normalized_model)
@@ -0,0 +1,229 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Reading and writing optionally compressed JSON files."""
+
+import gzip
+import io
+import json
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from enum import Enum
+from pathlib import Path
+from typing import IO, Any
+
+try:
+    import zstandard
+except ImportError:
+    ZSTD_AVAILABLE = False
+else:
+    ZSTD_AVAILABLE = True
+
+
+class StorageCompression(Enum):
+    """Compression formats for stored JSON files."""
+
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+COMPRESSION_SUFFIXES = {
+    StorageCompression.NONE: "",
+    StorageCompression.GZIP: ".gz",
+    StorageCompression.ZSTD: ".zst",
+}
+
+GZIP_COMPRESSION_LEVEL = 6
+
+TEMPORARY_SUFFIX = ".tmp"
+
+
+class CompressionUnavailableError(RuntimeError):
+    """Raised when a compression format is used that requires an optional dependency
+    which is not installed.
+    """
+
+    def __init__(self, *, compression: StorageCompression):
+        message = (
+            f"The compression format '{compression.value}' requires the optional"
+            + " dependency 'zstandard', which can be installed using the 'zstd'"
+            + " extra of metldata."
+        )
+        super().__init__(message)
+
+
+def get_compressed_path(path: Path, *, compression: StorageCompression) -> Path:
+    """Get the path of the file storing the JSON file at the given path with the
+    given compression.
+    """
+    return path.with_name(path.name + COMPRESSION_SUFFIXES[compression])
+
+
+def get_uncompressed_path(path: Path) -> Path:
+    """Get the path of the JSON file that is stored in the file at the given path,
+    i.e. remove the suffix of the compression format, if any.
+    """
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if suffix and path.name.endswith(suffix):
+            return path.with_name(path.name.removesuffix(suffix))
+    return path
+
+
+def _get_modification_time(path: Path) -> int | None:
+    """Get the modification time of the file at the given path in nanoseconds or
+    None if it does not exist.
+    """
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def find_stored_path(path: Path) -> Path | None:
+    """Find the file storing the JSON file at the given path with any compression.
+    If it is stored with multiple compressions, which happens briefly while it is
+    rewritten with another compression, the most recently modified file is used.
+    Returns None if no such file exists.
+    """
+    stored_path = None
+    newest_time = -1
+    for compression in StorageCompression:
+        compressed_path = get_compressed_path(path, compression=compression)
+        modification_time = _get_modification_time(compressed_path)
+        if modification_time is not None and modification_time > newest_time:
+            stored_path = compressed_path
+            newest_time = modification_time
+    return stored_path
+
+
+def find_stored_paths(directory: Path) -> list[Path]:
+    """Find the JSON files stored in the given directory with any compression.
+    Each JSON file is listed once, even if it is briefly stored with multiple
+    compressions while being rewritten. Temporary files are ignored.
+
+    Returns:
+        The sorted paths of the JSON files without the suffix of their compression.
+    """
+    return sorted(
+        {
+            get_uncompressed_path(stored_path)
+            for stored_path in directory.iterdir()
+            if not stored_path.name.endswith(TEMPORARY_SUFFIX)
+        }
+    )
+
+
+def _get_compression(stored_path: Path) -> StorageCompression:
+    """Determine the compression format of the file at the given path from its
+    suffix.
+    """
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if suffix and stored_path.name.endswith(suffix):
+            return compression
+    return StorageCompression.NONE
+
+
+@contextmanager
+def _open_text(
+    stored_path: Path, *, mode: str, compression: StorageCompression
+) -> Iterator[IO[str]]:
+    """Open a text stream for the file at the given path that is transparently
+    compressed or decompressed in chunks using the given format.
+    """
+    if compression == StorageCompression.NONE:
+        with open(stored_path, mode, encoding="utf-8") as file:
+            yield file
+    elif compression == StorageCompression.GZIP:
+        with (
+            gzip.GzipFile(
+                stored_path, mode + "b", compresslevel=GZIP_COMPRESSION_LEVEL
+            ) as gzip_file,
+            io.TextIOWrapper(gzip_file, encoding="utf-8") as file,
+        ):
+            yield file
+    else:
+        if not ZSTD_AVAILABLE:
+            raise CompressionUnavailableError(compression=compression)
+        with open(stored_path, mode + "b") as raw_file:
+            stream: IO[bytes] = (
+                zstandard.ZstdCompressor().stream_writer(raw_file)
+                if mode == "w"
+                else zstandard.ZstdDecompressor().stream_reader(raw_file)
+            )
+            with io.TextIOWrapper(stream, encoding="utf-8") as file:
+                yield file
+
+
+def write_json(
+    value: Any,
+    *,
+    path: Path,
+    compression: StorageCompression,
+    indent: int | None = None,
+) -> Path:
+    """Write the given value as JSON to the given path using the given compression.
+    The suffix of the compression format is appended to the path. The file is
+    replaced atomically, so that readers never observe a partially written file.
+    Files storing the same JSON file with another compression are removed
+    afterwards.
+
+    Returns:
+        The path of the written file.
+    """
+    stored_path = get_compressed_path(path, compression=compression)
+    temporary_path = stored_path.with_name(
+        f"{stored_path.name}.{os.getpid()}.{threading.get_ident()}{TEMPORARY_SUFFIX}"
+    )
+    try:
+        with _open_text(temporary_path, mode="w", compression=compression) as file:
+            json.dump(
+                value,
+                file,
+                indent=indent,
+                separators=None if indent else (",", ":"),
+            )
+        os.replace(temporary_path, stored_path)
+    except BaseException:
+        temporary_path.unlink(missing_ok=True)
+        raise
+
+    for other_compression in StorageCompression:
+        if other_compression != compression:
+            get_compressed_path(path, compression=other_compression).unlink(
+                missing_ok=True
+            )
+
+    return stored_path
+
+
+def read_json(path: Path) -> Any:
+    """Read the JSON file at the given path, which may be stored with any
+    compression. The file is decompressed while it is parsed.
+
+    Raises:
+        FileNotFoundError: if no file storing the JSON file exists.
+    """
+    stored_path = find_stored_path(path)
+    if stored_path is None:
+        raise FileNotFoundError(f"No such JSON file: {path}")
+
+    with _open_text(
+        stored_path, mode="r", compression=_get_compression(stored_path)
+    ) as file:
+        return json.load(file)
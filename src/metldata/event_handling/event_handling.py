@@ -16,8 +16,13 @@
 
 """Functionality to publish and consume events stored on the file system."""
 
-import json
-from collections.abc import Iterator, Mapping
+import asyncio
+from collections import deque
+from collections.abc import AsyncGenerator, Callable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from enum import Enum
+from functools import partial
 from pathlib import Path
 from uuid import uuid4
 
@@ -28,6 +33,22 @@ from hexkit.protocols.eventsub import EventSubscriberProtocol
 from pydantic import UUID4, BaseModel, Field
 from pydantic_settings import BaseSettings
 
+from metldata.compression import (
+    StorageCompression,
+    find_stored_paths,
+    get_uncompressed_path,
+    read_json,
+    write_json,
+)
+from metldata.event_handling.event_log import EventLog
+
+
+class EventStoreBackend(Enum):
+    """The layout in which events are stored on the file system."""
+
+    FILES = "files"
+    SEGMENTED_LOG = "segmented_log"
+
 
 class FileSystemEventConfig(BaseSettings):
     """Config paramters and their defaults."""
@@ -42,6 +63,61 @@ class FileSystemEventConfig(BaseSettings):
             + " the event file."
         ),
     )
+    event_store_compression: StorageCompression = Field(
+        default=StorageCompression.NONE,
+        description=(
+            "The compression used for writing event files. Compressed event files"
+            + " contain compact JSON and carry the suffix of the compression format,"
+            + " i.e. '.gz' or '.zst'. With 'zstd', the optional dependency 'zstandard'"
+            + " is required. Event files of any compression are readable."
+            + " Only applies to the 'files' backend."
+        ),
+    )
+    event_store_backend: EventStoreBackend = Field(
+        default=EventStoreBackend.FILES,
+        description=(
+            "The layout of the event store. With 'files', each event is stored as a"
+            + " separate file. With 'segmented_log', the events of a topic are"
+            + " appended to segment files in the sub-directory for the topic, which"
+            + " are accompanied by an index of the record offsets and compacted to"
+            + " retain only the last event per key. Both layouts cannot be mixed"
+            + " within the same event store."
+        ),
+    )
+    event_log_segment_size: int = Field(
+        default=64 * 1024 * 1024,
+        gt=0,
+        description=(
+            "The size in bytes after which a new segment file is started."
+            + " Only applies to the 'segmented_log' backend."
+        ),
+    )
+    event_log_compaction_ratio: float = Field(
+        default=0.5,
+        gt=0,
+        le=1,
+        description=(
+            "The share of superseded events among all events in a topic log at which"
+            + " the log is compacted. Only applies to the 'segmented_log' backend."
+        ),
+    )
+    event_read_ahead: int = Field(
+        default=16,
+        ge=1,
+        description=(
+            "The maximum number of events that the event subscriber reads and decodes"
+            + " ahead of the event currently being consumed. Bounds the number of"
+            + " events held in memory. A value of 1 disables reading ahead."
+        ),
+    )
+    event_read_workers: int = Field(
+        default=4,
+        ge=1,
+        description=(
+            "The number of threads used by the event subscriber to read and decode"
+            + " events ahead of consumption."
+        ),
+    )
 
 
 class Event(BaseModel):
@@ -66,22 +142,31 @@ def get_event_path(*, topic: str, key: str, event_store_path: Path) -> Path:
     )
 
 
-def write_event(*, event: Event, event_store_path: Path) -> None:
-    """Write an event to the file system."""
+def write_event(
+    *,
+    event: Event,
+    event_store_path: Path,
+    compression: StorageCompression = StorageCompression.NONE,
+) -> None:
+    """Write an event to the file system. Uncompressed events are pretty-printed."""
     event_path = get_event_path(
         topic=event.topic, key=event.key, event_store_path=event_store_path
     )
     event_content = {"type_": event.type_, "payload": event.payload}
 
     event_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(event_path, "w", encoding="utf-8") as event_file:
-        json.dump(event_content, event_file, indent=4)
+    write_json(
+        event_content,
+        path=event_path,
+        compression=compression,
+        indent=4 if compression == StorageCompression.NONE else None,
+    )
 
 
 def read_event_file(event_path: Path) -> Event:
-    """Read an event from a file."""
-    with open(event_path, encoding="utf-8") as event_file:
-        event_content = json.load(event_file)
+    """Read an event from a file, which may be compressed."""
+    event_path = get_uncompressed_path(event_path)
+    event_content = read_json(event_path)
 
     return Event(
         topic=event_path.parent.name,
@@ -96,20 +181,124 @@ def read_events_from_topic(*, topic: str, event_store_path: Path) -> Iterator[Ev
 
     topic_path.mkdir(parents=True, exist_ok=True)
 
-    for event_path in sorted(topic_path.iterdir()):
+    for event_path in find_stored_paths(topic_path):
         yield read_event_file(event_path)
 
 
+def get_event_log(
+    *, topic: str, config: FileSystemEventConfig, writable: bool = False
+) -> EventLog:
+    """Open the segmented log storing the events of the given topic.
+
+    Raises:
+        EventLog.LockedError:
+            if opened for writing while the log is already opened for writing.
+    """
+    return EventLog(
+        log_path=get_topic_path(topic=topic, event_store_path=config.event_store_path),
+        segment_size=config.event_log_segment_size,
+        compaction_ratio=config.event_log_compaction_ratio,
+        writable=writable,
+    )
+
+
+def read_events_from_log(
+    *, topic: str, config: FileSystemEventConfig
+) -> Iterator[Event]:
+    """Read all events for the given topic from its segmented log in the order in
+    which they were last published.
+    """
+    with get_event_log(topic=topic, config=config) as event_log:
+        for key, event_content in event_log:
+            yield Event.model_validate({"topic": topic, "key": key, **event_content})
+
+
+def read_events(*, topic: str, config: FileSystemEventConfig) -> Iterator[Event]:
+    """Read all events for the given topic using the configured backend."""
+    if config.event_store_backend == EventStoreBackend.SEGMENTED_LOG:
+        return read_events_from_log(topic=topic, config=config)
+
+    return read_events_from_topic(topic=topic, event_store_path=config.event_store_path)
+
+
+def get_event_loaders(
+    *, topic: str, config: FileSystemEventConfig
+) -> list[Callable[[], Event]]:
+    """Get a callable for each event of the given topic that reads and decodes the
+    event. The callables are independent of each other and can be called from any
+    thread. They are returned in the order in which `read_events` yields the events.
+
+    With the segmented log backend, the callables share a log reader, which is
+    closed once the callables are garbage collected.
+    """
+    if config.event_store_backend == EventStoreBackend.SEGMENTED_LOG:
+        event_log = get_event_log(topic=topic, config=config)
+        return [
+            partial(_read_event_from_log, event_log=event_log, topic=topic, key=key)
+            for key in event_log.get_keys()
+        ]
+
+    topic_path = get_topic_path(topic=topic, event_store_path=config.event_store_path)
+    topic_path.mkdir(parents=True, exist_ok=True)
+
+    return [
+        partial(read_event_file, event_path)
+        for event_path in find_stored_paths(topic_path)
+    ]
+
+
+def _read_event_from_log(*, event_log: EventLog, topic: str, key: str) -> Event:
+    """Read the event with the given key from the segmented log of a topic."""
+    event_content = event_log.get(key)
+    return Event.model_validate({"topic": topic, "key": key, **event_content})
+
+
+def count_events(*, topic: str, config: FileSystemEventConfig) -> int:
+    """Count the events stored for the given topic without reading them.
+
+    Returns 0 if the topic does not exist yet.
+    """
+    topic_path = get_topic_path(topic=topic, event_store_path=config.event_store_path)
+    if not topic_path.exists():
+        return 0
+
+    if config.event_store_backend == EventStoreBackend.SEGMENTED_LOG:
+        with get_event_log(topic=topic, config=config) as event_log:
+            return len(event_log)
+
+    return sum(1 for path in find_stored_paths(topic_path) if path.suffix == ".json")
+
+
 class FileSystemEventPublisher(EventPublisherProtocol):
     """An EventPublisher that stores events on the file system.
 
     Please note that this file system based event store mimics the behaviour of
     compacted topics. Only the last event with a given key is stored.
+
+    With the segmented log backend, the publisher holds the write lock of every
+    topic it published to until it is closed.
     """
 
     def __init__(self, config: FileSystemEventConfig):
         """Initialize with config."""
         self._config = config
+        self._event_logs: dict[str, EventLog] = {}
+
+    def _get_event_log(self, topic: str) -> EventLog:
+        """Get the segmented log of the given topic, which is kept open so that its
+        index is only loaded once.
+        """
+        if topic not in self._event_logs:
+            self._event_logs[topic] = get_event_log(
+                topic=topic, config=self._config, writable=True
+            )
+        return self._event_logs[topic]
+
+    def close(self) -> None:
+        """Close the segmented logs opened for publishing."""
+        for event_log in self._event_logs.values():
+            event_log.close()
+        self._event_logs.clear()
 
     async def _publish_validated(  # noqa: PLR0913
         self,
@@ -137,9 +326,16 @@ class FileSystemEventPublisher(EventPublisherProtocol):
             payload=payload,
             headers=headers,
         )
+        if self._config.event_store_backend == EventStoreBackend.SEGMENTED_LOG:
+            self._get_event_log(topic).append(
+                key=key, value={"type_": event.type_, "payload": event.payload}
+            )
+            return
+
         write_event(
             event=event,
             event_store_path=self._config.event_store_path,
+            compression=self._config.event_store_compression,
         )
 
 
@@ -170,17 +366,48 @@ class FileSystemEventSubscriber(InboundProviderBase):
         if not forever:
             raise NotImplementedError
 
-        for event in read_events_from_topic(
-            topic=self._topic_of_interest,
-            event_store_path=self._config.event_store_path,
-        ):
-            await self._translator.consume(
-                payload=event.payload,
-                type_=event.type_,
-                topic=event.topic,
-                key="",
-                event_id=uuid4(),
+        async with aclosing(self._read_events_ahead()) as events:
+            async for event in events:
+                await self._translator.consume(
+                    payload=event.payload,
+                    type_=event.type_,
+                    topic=event.topic,
+                    key="",
+                    event_id=uuid4(),
+                )
+
+    async def _read_events_ahead(self) -> AsyncGenerator[Event]:
+        """Read the events of the topic of interest in a thread pool, keeping up to
+        `event_read_ahead` events in flight ahead of the one being consumed.
+
+        The events are yielded in the same order as by `read_events`.
+        """
+        loop = asyncio.get_running_loop()
+        pending_events: deque[asyncio.Future[Event]] = deque()
+
+        with ThreadPoolExecutor(
+            max_workers=self._config.event_read_workers
+        ) as executor:
+            event_loaders = await loop.run_in_executor(
+                executor,
+                partial(
+                    get_event_loaders,
+                    topic=self._topic_of_interest,
+                    config=self._config,
+                ),
             )
+            try:
+                for event_loader in event_loaders:
+                    pending_events.append(loop.run_in_executor(executor, event_loader))
+                    if len(pending_events) >= self._config.event_read_ahead:
+                        yield await pending_events.popleft()
+
+                while pending_events:
+                    yield await pending_events.popleft()
+            finally:
+                # don't load further events if the consumption is aborted:
+                for pending_event in pending_events:
+                    pending_event.cancel()
 
 
 class FileSystemEventCollector:
@@ -197,10 +424,7 @@ class FileSystemEventCollector:
         self, *, topic: str, types: list[str] | None = None
     ) -> Iterator[Event]:
         """Collect all events for the given types from the given topic."""
-        events = read_events_from_topic(
-            topic=topic,
-            event_store_path=self._config.event_store_path,
-        )
+        events = read_events(topic=topic, config=self._config)
 
         for event in events:
             if not types or event.type_ in types:
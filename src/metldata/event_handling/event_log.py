@@ -0,0 +1,484 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""A segmented, append-only log for storing the events of a topic on the file
+system.
+"""
+
+import fcntl
+import json
+import os
+import weakref
+from collections.abc import Iterator
+from pathlib import Path
+
+from hexkit.custom_types import JsonObject
+
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".index"
+LOCK_FILE_NAME = "writer.lock"
+
+# compaction is not worth it for a few stale records, regardless of the ratio:
+MIN_STALE_RECORDS_FOR_COMPACTION = 1000
+
+# how often a reader retries loading a log that is concurrently being compacted:
+MAX_LOAD_ATTEMPTS = 5
+
+
+def get_segment_path(*, log_path: Path, segment: int) -> Path:
+    """Get the path of the segment file with the given number."""
+    return log_path / f"{segment:012d}{SEGMENT_SUFFIX}"
+
+
+def get_index_path(*, log_path: Path, segment: int) -> Path:
+    """Get the path of the index file belonging to the segment with the given
+    number.
+    """
+    return log_path / f"{segment:012d}{INDEX_SUFFIX}"
+
+
+def _encode_record(*, key: str, value: JsonObject) -> bytes:
+    """Encode a record as a line of compact JSON."""
+    return (
+        json.dumps({"key": key, "value": value}, separators=(",", ":")) + "\n"
+    ).encode("utf-8")
+
+
+def _decode_record_key(record: bytes) -> str | None:
+    """Get the key of an encoded record or None if the record is corrupt."""
+    try:
+        key = json.loads(record)["key"]
+    except (ValueError, TypeError, KeyError):
+        return None
+    return key if isinstance(key, str) else None
+
+
+def _encode_index_entry(*, key: str, offset: int, length: int) -> bytes:
+    """Encode the position of a record as a line of the index file."""
+    return (json.dumps([key, offset, length]) + "\n").encode("utf-8")
+
+
+def _read_index(index_path: Path) -> list[tuple[str, int, int]]:
+    """Read the key, offset, and length of the records from an index file.
+
+    Entries are read up to the first incomplete or corrupt entry, e.g. from an
+    append that is in progress or was interrupted. Returns an empty list if the
+    index file does not exist.
+    """
+    try:
+        content = index_path.read_text(encoding="utf-8", errors="replace")
+    except FileNotFoundError:
+        return []
+    lines = content[: content.rfind("\n") + 1].splitlines()
+
+    # parsing all entries as a single JSON array is much faster than line by line:
+    try:
+        return [
+            (key, offset, length)
+            for key, offset, length in json.loads("[" + ",".join(lines) + "]")
+        ]
+    except (ValueError, TypeError):
+        pass
+
+    entries: list[tuple[str, int, int]] = []
+    for line in lines:
+        try:
+            key, offset, length = json.loads(line)
+        except (ValueError, TypeError):
+            break
+        entries.append((key, offset, length))
+    return entries
+
+
+def _write_all(file_descriptor: int, data: bytes) -> None:
+    """Write all data to the given file descriptor."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(file_descriptor, view) :]
+
+
+def _close_files(*file_descriptor_maps: dict) -> None:
+    """Close all file descriptors contained as values in the given dicts."""
+    for file_descriptors in file_descriptor_maps:
+        for file_descriptor in file_descriptors.values():
+            os.close(file_descriptor)
+        file_descriptors.clear()
+
+
+class EventLog:
+    """An append-only log of keyed JSON records that is split into segment files.
+
+    Every record is appended as a line of compact JSON to the active segment. Once
+    the active segment would exceed the segment size, a new segment is started. Next
+    to each segment, an index file holds the key, offset, and length of every record
+    in that segment, so that the log can be opened without parsing the records.
+
+    Like a compacted topic, only the last record per key is live. Compaction copies
+    the live records into new segments and then deletes the old ones. It is triggered
+    automatically when appending once the share of stale records exceeds the
+    compaction ratio.
+
+    A log can be opened by a single writer, which holds an exclusive lock for as
+    long as it is open, and by any number of readers. Only the writer repairs the
+    log after an interrupted append. Readers keep all segments open that existed
+    when they were instantiated and thereby observe the records present at that
+    time, even if the log is compacted in the meantime. Records that are appended
+    but not yet indexed are ignored by readers.
+    """
+
+    class LockedError(RuntimeError):
+        """Raised when opening a log for writing that is already opened by another
+        writer.
+        """
+
+        def __init__(self, *, log_path: Path):
+            message = f"The event log at '{log_path}' is already opened for writing."
+            super().__init__(message)
+
+    def __init__(
+        self,
+        *,
+        log_path: Path,
+        segment_size: int,
+        compaction_ratio: float = 0.5,
+        writable: bool = False,
+    ):
+        """Open the log located in the given directory.
+
+        Args:
+            log_path:
+                The directory containing the segment and index files. It is created
+                when opened for writing. A missing directory is read as empty log.
+            segment_size: The size in bytes after which a new segment is started.
+            compaction_ratio:
+                The share of stale records among all records that triggers a
+                compaction when appending.
+            writable: Whether to open the log for writing.
+
+        Raises:
+            EventLog.LockedError:
+                if opened for writing while another writer holds the log open.
+        """
+        self._log_path = log_path
+        self._segment_size = segment_size
+        self._compaction_ratio = compaction_ratio
+        self._writable = writable
+
+        # the segment, offset, and length of the last record for each key:
+        self._positions: dict[str, tuple[int, int, int]] = {}
+        self._stale_records = 0
+        self._active_segment = 0
+        self._active_segment_size = 0
+
+        # open file descriptors of the segments and the lock and active index file:
+        self._segment_files: dict[int, int] = {}
+        self._other_files: dict[str, int] = {}
+        self._finalizer = weakref.finalize(
+            self, _close_files, self._segment_files, self._other_files
+        )
+
+        if writable:
+            self._log_path.mkdir(parents=True, exist_ok=True)
+            self._lock()
+            self._load()
+            if self._segment_files:
+                self._open_active_index()
+        else:
+            self._load_snapshot()
+
+    def _lock(self) -> None:
+        """Acquire the exclusive writer lock of the log."""
+        lock_file = os.open(self._log_path / LOCK_FILE_NAME, os.O_RDWR | os.O_CREAT)
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError as error:
+            os.close(lock_file)
+            raise self.LockedError(log_path=self._log_path) from error
+        self._other_files["lock"] = lock_file
+
+    def close(self) -> None:
+        """Close all files of the log and release the writer lock."""
+        self._finalizer()
+
+    def __enter__(self) -> "EventLog":
+        """Use the log as context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close the log."""
+        self.close()
+
+    def _get_segments(self) -> list[int]:
+        """Get the numbers of all existing segments in ascending order."""
+        if not self._log_path.exists():
+            return []
+        return sorted(
+            int(path.stem) for path in self._log_path.glob(f"*{SEGMENT_SUFFIX}")
+        )
+
+    def _reset(self) -> None:
+        """Forget all loaded positions and close all segment files."""
+        _close_files(self._segment_files)
+        self._positions = {}
+        self._stale_records = 0
+        self._active_segment = 0
+        self._active_segment_size = 0
+
+    def _load_snapshot(self) -> None:
+        """Load the log for reading.
+
+        If a concurrent compaction deletes a segment while loading, the loading is
+        retried, since the records of that segment were already copied to a newer
+        one.
+        """
+        for attempt in range(MAX_LOAD_ATTEMPTS):
+            try:
+                segments = self._load()
+            except FileNotFoundError:
+                if attempt == MAX_LOAD_ATTEMPTS - 1:
+                    raise
+            else:
+                if all(
+                    get_segment_path(log_path=self._log_path, segment=segment).exists()
+                    for segment in segments
+                ):
+                    return
+            self._reset()
+
+    def _load(self) -> list[int]:
+        """Open all segments and load the positions of their records from the index
+        files. Returns the numbers of the loaded segments.
+        """
+        segments = self._get_segments()
+        for segment in segments:
+            segment_path = get_segment_path(log_path=self._log_path, segment=segment)
+            segment_file = os.open(
+                segment_path,
+                os.O_RDWR | os.O_APPEND if self._writable else os.O_RDONLY,
+            )
+            self._segment_files[segment] = segment_file
+
+            segment_size = os.fstat(segment_file).st_size
+            indexed_size = 0
+            for key, offset, length in _read_index(
+                get_index_path(log_path=self._log_path, segment=segment)
+            ):
+                if offset + length > segment_size:
+                    break  # the record was not written completely
+                self._set_position(key=key, position=(segment, offset, length))
+                indexed_size = max(indexed_size, offset + length)
+
+            if self._writable and indexed_size < segment_size:
+                segment_size = self._recover_index(
+                    segment=segment, indexed_size=indexed_size
+                )
+
+            self._active_segment = segment
+            self._active_segment_size = segment_size
+
+        return segments
+
+    def _recover_index(self, *, segment: int, indexed_size: int) -> int:
+        """Index the records that were appended to a segment but are missing from
+        its index, e.g. after an interrupted append. Returns the new segment size.
+
+        Corrupt records are skipped and an incomplete record at the end of the
+        segment is truncated.
+        """
+        segment_file = self._segment_files[segment]
+        segment_size = os.fstat(segment_file).st_size
+        tail = os.pread(segment_file, segment_size - indexed_size, indexed_size)
+
+        recovered_entries: list[tuple[int, str, int]] = []
+        offset = indexed_size
+        # the part after the last line break is an incomplete record:
+        for line in (line + b"\n" for line in tail.split(b"\n")[:-1]):
+            key = _decode_record_key(line)
+            if key is not None:
+                self._set_position(key=key, position=(segment, offset, len(line)))
+                recovered_entries.append((offset, key, len(line)))
+            offset += len(line)
+
+        os.ftruncate(segment_file, offset)
+
+        # the index is replaced since it may end with an incomplete entry:
+        entries = sorted(
+            (entry_offset, key, length)
+            for key, (entry_segment, entry_offset, length) in self._positions.items()
+            if entry_segment == segment and entry_offset < indexed_size
+        )
+        entries.extend(recovered_entries)
+        index_path = get_index_path(log_path=self._log_path, segment=segment)
+        temporary_path = index_path.with_suffix(INDEX_SUFFIX + ".tmp")
+        temporary_path.write_bytes(
+            b"".join(
+                _encode_index_entry(key=key, offset=entry_offset, length=length)
+                for entry_offset, key, length in entries
+            )
+        )
+        os.replace(temporary_path, index_path)
+
+        return offset
+
+    def _set_position(self, *, key: str, position: tuple[int, int, int]) -> None:
+        """Record the position of the last record for the given key."""
+        if key in self._positions:
+            self._stale_records += 1
+        self._positions[key] = position
+
+    def __len__(self) -> int:
+        """Get the number of live records, i.e. the number of distinct keys."""
+        return len(self._positions)
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether a record with the given key exists."""
+        return key in self._positions
+
+    @property
+    def stale_records(self) -> int:
+        """The number of records that have been superseded by a later record with
+        the same key.
+        """
+        return self._stale_records
+
+    def _check_writable(self) -> None:
+        """Check that the log was opened for writing and is still open."""
+        if not self._writable or "lock" not in self._other_files:
+            raise RuntimeError("The event log is not open for writing.")
+
+    def _open_active_index(self) -> None:
+        """Open the index file of the active segment for appending."""
+        if "index" in self._other_files:
+            os.close(self._other_files.pop("index"))
+        self._other_files["index"] = os.open(
+            get_index_path(log_path=self._log_path, segment=self._active_segment),
+            os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+        )
+
+    def _start_segment(self, segment: int) -> None:
+        """Create a new segment and make it the active one."""
+        self._segment_files[segment] = os.open(
+            get_segment_path(log_path=self._log_path, segment=segment),
+            os.O_RDWR | os.O_CREAT | os.O_APPEND,
+        )
+        self._active_segment = segment
+        self._active_segment_size = 0
+        self._open_active_index()
+
+    def append(self, *, key: str, value: JsonObject) -> None:
+        """Append a record, superseding any earlier record with the same key."""
+        self._check_writable()
+        self._append_encoded(key=key, record=_encode_record(key=key, value=value))
+
+        total_records = len(self._positions) + self._stale_records
+        if (
+            self._stale_records >= MIN_STALE_RECORDS_FOR_COMPACTION
+            and self._stale_records > self._compaction_ratio * total_records
+        ):
+            self.compact()
+
+    def _append_encoded(self, *, key: str, record: bytes) -> None:
+        """Append an already encoded record and update the index."""
+        if self._active_segment not in self._segment_files or (
+            self._active_segment_size > 0
+            and self._active_segment_size + len(record) > self._segment_size
+        ):
+            self._start_segment(self._active_segment + 1 if self._segment_files else 0)
+
+        offset = self._active_segment_size
+
+        # the record is written before its index entry, so that an interrupted
+        # append can be recovered from the segment:
+        _write_all(self._segment_files[self._active_segment], record)
+        _write_all(
+            self._other_files["index"],
+            _encode_index_entry(key=key, offset=offset, length=len(record)),
+        )
+
+        self._active_segment_size += len(record)
+        self._set_position(
+            key=key, position=(self._active_segment, offset, len(record))
+        )
+
+    def _read_encoded(self, *, segment: int, offset: int, length: int) -> bytes:
+        """Read an encoded record. Safe to be called from multiple threads."""
+        return os.pread(self._segment_files[segment], length, offset)
+
+    def _get_sorted_positions(self) -> list[tuple[int, int, int, str]]:
+        """Get the segment, offset, length, and key of all live records in the order
+        in which they were appended.
+        """
+        return sorted(
+            (segment, offset, length, key)
+            for key, (segment, offset, length) in self._positions.items()
+        )
+
+    def get_keys(self) -> list[str]:
+        """Get the keys of all live records in the order in which they were
+        appended.
+        """
+        return [key for *_, key in self._get_sorted_positions()]
+
+    def __iter__(self) -> Iterator[tuple[str, JsonObject]]:
+        """Iterate over the keys and values of all live records in the order in
+        which they were appended.
+        """
+        for segment, offset, length, key in self._get_sorted_positions():
+            record = self._read_encoded(segment=segment, offset=offset, length=length)
+            yield key, json.loads(record)["value"]
+
+    def get(self, key: str) -> JsonObject:
+        """Get the value of the live record with the given key. Safe to be called
+        from multiple threads.
+
+        Raises:
+            KeyError: If no record with the given key exists.
+        """
+        segment, offset, length = self._positions[key]
+        record = self._read_encoded(segment=segment, offset=offset, length=length)
+        return json.loads(record)["value"]
+
+    def compact(self) -> None:
+        """Copy the live records into new segments and delete the old segments,
+        dropping all stale records.
+
+        If interrupted, the old segments are still intact, while the new ones
+        contain copies of their live records, which supersede the originals.
+        """
+        self._check_writable()
+
+        old_segments = sorted(self._segment_files)
+        live_positions = self._get_sorted_positions()
+
+        self._positions = {}
+        self._stale_records = 0
+        self._start_segment(self._active_segment + 1)
+        for segment, offset, length, key in live_positions:
+            self._append_encoded(
+                key=key,
+                record=self._read_encoded(
+                    segment=segment, offset=offset, length=length
+                ),
+            )
+
+        # readers loading the log meanwhile notice that a segment was deleted and
+        # retry, thus the index can be deleted afterwards:
+        for segment in old_segments:
+            get_segment_path(log_path=self._log_path, segment=segment).unlink()
+            get_index_path(log_path=self._log_path, segment=segment).unlink(
+                missing_ok=True
+            )
+            os.close(self._segment_files.pop(segment))
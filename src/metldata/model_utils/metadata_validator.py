@@ -16,6 +16,7 @@
 
 """Logic to validate submission metadata based on a LinkML model."""
 
+import hashlib
 import json
 from functools import lru_cache
 from typing import Any
@@ -25,6 +26,7 @@ from linkml.generators.jsonschemagen import JsonSchemaGenerator
 from linkml_validator.models import SeverityEnum, ValidationMessage
 
 from metldata.model_utils.essentials import ROOT_CLASS, MetadataModel
+from metldata.model_utils.validation_cache import ValidationCache, get_metadata_digest
 
 
 class InvalidMetadataError(RuntimeError):
@@ -48,6 +50,31 @@ class MetadataValidationError(InvalidMetadataError):
         super().__init__(message)
 
 
+@lru_cache
+def get_metadata_json_schema(model: MetadataModel) -> dict[str, Any]:
+    """Generate the JSON Schema for the root class of the given metadata model. The
+    result is cached per model and must not be modified.
+    """
+    generator = JsonSchemaGenerator(
+        schema=model,
+        top_class=ROOT_CLASS,
+        mergeimports=True,
+        not_closed=False,
+    )
+    return json.loads(generator.serialize())
+
+
+@lru_cache
+def get_metadata_schema_fingerprint(model: MetadataModel) -> str:
+    """Get a fingerprint of the JSON Schema generated for the given metadata model,
+    which identifies the validation behavior of the model.
+    """
+    schema_json = json.dumps(
+        get_metadata_json_schema(model), sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(schema_json.encode("utf-8")).hexdigest()
+
+
 @lru_cache
 def get_metadata_validator(model: MetadataModel) -> jsonschema.Draft7Validator:
     """Create a JSON Schema validator for the root class of the given metadata model.
@@ -61,14 +88,36 @@ def get_metadata_validator(model: MetadataModel) -> jsonschema.Draft7Validator:
     validating with `jsonschema` yields identical accept/reject behaviour at a fraction
     of the cost. The result is cached per model.
     """
-    generator = JsonSchemaGenerator(
-        schema=model,
-        top_class=ROOT_CLASS,
-        mergeimports=True,
-        not_closed=False,
-    )
-    schema = json.loads(generator.serialize())
-    return jsonschema.Draft7Validator(schema)
+    return jsonschema.Draft7Validator(get_metadata_json_schema(model))
+
+
+def check_metadata(
+    metadata: dict[str, Any], *, validator: jsonschema.Draft7Validator
+) -> None:
+    """Validate metadata using the given JSON Schema validator.
+
+    Raises:
+        MetadataValidationError: When validation failed.
+    """
+    errors = sorted(validator.iter_errors(metadata), key=str)
+
+    if errors:
+        issues = [
+            ValidationMessage(
+                severity=SeverityEnum.error,
+                message=error.message,
+                field=(
+                    ".".join(map(str, error.absolute_path))
+                    if error.absolute_path
+                    else None
+                ),
+                value=(
+                    error.instance if not isinstance(error.instance, dict) else None
+                ),
+            )
+            for error in errors
+        ]
+        raise MetadataValidationError(issues=issues)
 
 
 class MetadataValidator:
@@ -77,34 +126,47 @@ class MetadataValidator:
     # error shortcuts:
     ValidationError = MetadataValidationError
 
-    def __init__(self, *, model: MetadataModel):
-        """Initialize the validator with a metadata model."""
+    def __init__(self, *, model: MetadataModel, cache: ValidationCache | None = None):
+        """Initialize the validator with a metadata model and optionally a cache for
+        validation results.
+        """
         self._model = model
+        self._cache = cache
 
     def validate(self, metadata: dict[str, Any]) -> None:
-        """Validate metadata against the provided model.
+        """Validate metadata against the provided model. If a cache is used, the
+        result of validating the same metadata against the same model before is
+        used instead, if available.
 
         Raises:
             ValidationError: When validation failed.
         """
-        validator = get_metadata_validator(self._model)
-
-        errors = sorted(validator.iter_errors(metadata), key=str)
-
-        if errors:
-            issues = [
-                ValidationMessage(
-                    severity=SeverityEnum.error,
-                    message=error.message,
-                    field=(
-                        ".".join(map(str, error.absolute_path))
-                        if error.absolute_path
-                        else None
-                    ),
-                    value=(
-                        error.instance if not isinstance(error.instance, dict) else None
-                    ),
-                )
-                for error in errors
-            ]
+        if self._cache is None:
+            check_metadata(metadata, validator=get_metadata_validator(self._model))
+            return
+
+        model_fingerprint = get_metadata_schema_fingerprint(self._model)
+        metadata_digest = get_metadata_digest(metadata)
+        issues = self._cache.lookup(
+            model_fingerprint=model_fingerprint, metadata_digest=metadata_digest
+        )
+        if issues is None:
+            try:
+                check_metadata(metadata, validator=get_metadata_validator(self._model))
+            except MetadataValidationError as error:
+                issues = error.issues
+            else:
+                issues = []
+            self._cache.store(
+                model_fingerprint=model_fingerprint,
+                metadata_digest=metadata_digest,
+                issues=issues,
+            )
+
+        if issues:
             raise MetadataValidationError(issues=issues)
+
+    @property
+    def json_schema(self) -> dict[str, Any]:
+        """The JSON Schema used for validation, which must not be modified."""
+        return get_metadata_json_schema(self._model)
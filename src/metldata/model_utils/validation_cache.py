@@ -0,0 +1,185 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""A persistent cache for the results of validating metadata against models."""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+from linkml_validator.models import ValidationMessage
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class ValidationCacheConfig(BaseSettings):
+    """Config parameters and their defaults."""
+
+    validation_cache_path: Path | None = Field(
+        default=None,
+        description=(
+            "An SQLite database for caching the results of validating metadata against"
+            + " metadata models, so that metadata that has already been validated"
+            + " against a model does not need to be validated again. If not set, no"
+            + " cache is used."
+        ),
+    )
+    validation_cache_size: int = Field(
+        default=100_000,
+        description=(
+            "The maximum number of cached validation results. If exceeded, the least"
+            + " recently used results are removed."
+        ),
+        ge=1,
+    )
+    validation_cache_refresh_interval: float = Field(
+        default=60,
+        description=(
+            "The number of seconds after which the last use of a cached result is"
+            + " recorded again when it is looked up. Recording every use would turn"
+            + " each lookup into a write transaction."
+        ),
+        ge=0,
+    )
+
+
+def get_metadata_digest(metadata: dict[str, Any]) -> str:
+    """Get the SHA-256 hex digest of the canonical JSON representation of the given
+    metadata.
+    """
+    canonical_json = json.dumps(metadata, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
+
+
+class ValidationCache:
+    """A bounded cache of validation results persisted in an SQLite database.
+
+    Results are keyed by a fingerprint of the model and the digest of the validated
+    metadata. A result is the list of validation issues, which is empty if the
+    metadata is valid. The database may be shared by multiple processes.
+    """
+
+    def __init__(self, *, config: ValidationCacheConfig):
+        """Initialize with config parameters."""
+        if config.validation_cache_path is None:
+            raise ValueError("The path of the validation cache is not configured.")
+
+        self._max_size = config.validation_cache_size
+        self._refresh_interval_ns = int(config.validation_cache_refresh_interval * 1e9)
+        self._connection = sqlite3.connect(config.validation_cache_path, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS validation_results ("
+                " model_fingerprint TEXT NOT NULL,"
+                " metadata_digest TEXT NOT NULL,"
+                " issues TEXT NOT NULL,"
+                " last_used INTEGER NOT NULL,"
+                " PRIMARY KEY (model_fingerprint, metadata_digest)"
+                ") WITHOUT ROWID"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS validation_results_by_last_used"
+                " ON validation_results (last_used)"
+            )
+        self._size = self._count()
+
+    def _count(self) -> int:
+        """Count the cached results."""
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM validation_results"
+        ).fetchone()[0]
+
+    def lookup(
+        self, *, model_fingerprint: str, metadata_digest: str
+    ) -> list[ValidationMessage] | None:
+        """Get the cached validation issues for the given model and metadata. The
+        list is empty if the metadata is valid. Returns None if no result is cached.
+
+        The last use of the result is only recorded if the recorded one is older than
+        the configured refresh interval, so that most lookups do not write.
+        """
+        row = self._connection.execute(
+            "SELECT issues, last_used FROM validation_results"
+            " WHERE model_fingerprint = ? AND metadata_digest = ?",
+            (model_fingerprint, metadata_digest),
+        ).fetchone()
+        if row is None:
+            return None
+
+        issues_json, last_used = row
+        now = time.time_ns()
+        if now - last_used > self._refresh_interval_ns:
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE validation_results SET last_used = ?"
+                    " WHERE model_fingerprint = ? AND metadata_digest = ?"
+                    " AND last_used < ?",
+                    (now, model_fingerprint, metadata_digest, now),
+                )
+        return [ValidationMessage(**issue) for issue in json.loads(issues_json)]
+
+    def store(
+        self,
+        *,
+        model_fingerprint: str,
+        metadata_digest: str,
+        issues: list[ValidationMessage],
+    ) -> None:
+        """Cache the validation issues for the given model and metadata, which are
+        empty if the metadata is valid. If the cache is full, the least recently used
+        results are removed.
+        """
+        issues_json = json.dumps([issue.model_dump(mode="json") for issue in issues])
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO validation_results"
+                " (model_fingerprint, metadata_digest, issues, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                (model_fingerprint, metadata_digest, issues_json, time.time_ns()),
+            )
+        self._size += 1
+
+        if self._size > self._max_size:
+            # the size might be outdated if the cache is shared:
+            self._size = self._count()
+            excess = self._size - self._max_size
+            if excess > 0:
+                with self._connection:
+                    self._connection.execute(
+                        "DELETE FROM validation_results"
+                        " WHERE (model_fingerprint, metadata_digest) IN ("
+                        " SELECT model_fingerprint, metadata_digest"
+                        " FROM validation_results ORDER BY last_used LIMIT ?)",
+                        (excess,),
+                    )
+                self._size -= excess
+
+    def close(self) -> None:
+        """Close the connection to the database."""
+        self._connection.close()
+
+
+def get_validation_cache(*, config: ValidationCacheConfig) -> ValidationCache | None:
+    """Get the validation cache specified in the config or None if no cache is
+    configured.
+    """
+    if config.validation_cache_path is None:
+        return None
+    return ValidationCache(config=config)
@@ -0,0 +1,202 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Computing and applying structural deltas between versions of submission
+content.
+
+A delta maps the top-level keys (root slots) of the content that changed to one of:
+- None, if the key has been removed,
+- {"resources": [...]}, if the key has been added, containing all its resources,
+- {"key_slot": ..., "removed": [...], "patched": {...}, "added": {...}, "order": [...]}
+  otherwise. Thereby, resources are identified by the value of the key slot or, if
+  the key slot is None, by their position. "patched" maps resource keys to JSON
+  patches (RFC 6902) replacing, adding, or removing top-level slots of a resource.
+  "order" is only present if the order of resources cannot be derived from the
+  previous order.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+from metldata.custom_types import Json, SubmissionContent
+
+ContentDelta = dict[str, Any]
+
+
+def _escape_pointer(token: str) -> str:
+    """Escape a token of a JSON pointer according to RFC 6901."""
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape_pointer(token: str) -> str:
+    """Unescape a token of a JSON pointer according to RFC 6901."""
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _get_resource_keys(resources: list[Json], key_slot: str | None) -> list[str]:
+    """Get the keys identifying the given resources using the given key slot or their
+    positions if the key slot is None.
+    """
+    if key_slot is None:
+        return [str(position) for position in range(len(resources))]
+    return [str(resource[key_slot]) for resource in resources]
+
+
+def _is_key_slot(resources: list[Json], key_slot: str) -> bool:
+    """Check whether the given slot uniquely identifies the given resources."""
+    keys = set()
+    for resource in resources:
+        value = resource.get(key_slot)
+        if not isinstance(value, str | int) or str(value) in keys:
+            return False
+        keys.add(str(value))
+    return True
+
+
+def diff_resource(old: Json, new: Json) -> list[Json]:
+    """Get a JSON patch transforming the old into the new resource on the level of
+    its top-level slots.
+    """
+    patch: list[Json] = [
+        {"op": "remove", "path": "/" + _escape_pointer(slot)}
+        for slot in old
+        if slot not in new
+    ]
+    for slot, value in new.items():
+        if slot not in old:
+            patch.append(
+                {"op": "add", "path": "/" + _escape_pointer(slot), "value": value}
+            )
+        elif old[slot] != value:
+            patch.append(
+                {"op": "replace", "path": "/" + _escape_pointer(slot), "value": value}
+            )
+    return patch
+
+
+def apply_resource_patch(resource: Json, patch: list[Json]) -> Json:
+    """Apply a JSON patch created by `diff_resource` to a copy of the given
+    resource.
+    """
+    patched_resource = dict(resource)
+    for operation in patch:
+        slot = _unescape_pointer(operation["path"][1:])
+        if operation["op"] == "remove":
+            del patched_resource[slot]
+        else:
+            patched_resource[slot] = operation["value"]
+    return patched_resource
+
+
+def _diff_resources(
+    old: list[Json], new: list[Json], key_slot: str | None
+) -> dict[str, Any]:
+    """Get the delta for the resources of one top-level key of the content."""
+    old_resources = dict(zip(_get_resource_keys(old, key_slot), old, strict=True))
+    new_keys = _get_resource_keys(new, key_slot)
+    new_key_set = set(new_keys)
+
+    removed = [key for key in old_resources if key not in new_key_set]
+    patched: dict[str, list[Json]] = {}
+    added: dict[str, Json] = {}
+    for key, resource in zip(new_keys, new, strict=True):
+        if key not in old_resources:
+            added[key] = resource
+        elif old_resources[key] != resource:
+            patched[key] = diff_resource(old_resources[key], resource)
+
+    delta: dict[str, Any] = {
+        "key_slot": key_slot,
+        "removed": removed,
+        "patched": patched,
+        "added": added,
+    }
+    derived_order = [key for key in old_resources if key in new_key_set]
+    derived_order.extend(added)
+    if derived_order != new_keys:
+        delta["order"] = new_keys
+    return delta
+
+
+def diff_content(
+    old: SubmissionContent,
+    new: SubmissionContent,
+    *,
+    identifier_slots: Mapping[str, str],
+) -> ContentDelta:
+    """Get the delta transforming the old into the new content.
+
+    Args:
+        old: The old content.
+        new: The new content.
+        identifier_slots:
+            The identifier slots by top-level key of the content. Resources are
+            identified by these slots if they are unique in both versions and by
+            their position otherwise.
+    """
+    delta: ContentDelta = {key: None for key in old if key not in new}
+    for key, resources in new.items():
+        if key not in old:
+            delta[key] = {"resources": resources}
+            continue
+        if old[key] == resources:
+            continue
+
+        key_slot: str | None = identifier_slots.get(key)
+        if key_slot is None or not (
+            _is_key_slot(old[key], key_slot) and _is_key_slot(resources, key_slot)
+        ):
+            key_slot = None
+        delta[key] = _diff_resources(old[key], resources, key_slot)
+
+    return delta
+
+
+def apply_content_delta(
+    content: SubmissionContent, delta: ContentDelta
+) -> SubmissionContent:
+    """Apply a delta created by `diff_content` to the given content. The given
+    content is not modified.
+    """
+    updated_content = dict(content)
+    for key, resources_delta in delta.items():
+        if resources_delta is None:
+            del updated_content[key]
+            continue
+        if "resources" in resources_delta:
+            updated_content[key] = resources_delta["resources"]
+            continue
+
+        old = content[key]
+        resources = dict(
+            zip(
+                _get_resource_keys(old, resources_delta["key_slot"]),
+                old,
+                strict=True,
+            )
+        )
+        for resource_key in resources_delta["removed"]:
+            del resources[resource_key]
+        for resource_key, patch in resources_delta["patched"].items():
+            resources[resource_key] = apply_resource_patch(
+                resources[resource_key], patch
+            )
+        resources.update(resources_delta["added"])
+
+        order = resources_delta.get("order", resources)
+        updated_content[key] = [resources[resource_key] for resource_key in order]
+
+    return updated_content
@@ -17,7 +17,7 @@
 """Logic for the publication of source events."""
 
 import asyncio
-import json
+from collections.abc import Iterable
 
 from hexkit.protocols.eventpub import EventPublisherProtocol
 
@@ -30,8 +30,8 @@ class SourceEventPublisherConfig(SourceEventConfig):
     """Config parameters and their defaults."""
 
 
-class SourceEventPublisher:
-    """Handles publication of source events."""
+class AsyncSourceEventPublisher:
+    """Handles publication of source events from async code."""
 
     def __init__(
         self, *, config: SourceEventPublisherConfig, provider: EventPublisherProtocol
@@ -40,7 +40,7 @@ class SourceEventPublisher:
         self._config = config
         self._provider = provider
 
-    def publish_submission(self, submission: models.Submission):
+    async def publish_submission(self, submission: models.Submission) -> None:
         """Publish the current submission as source event"""
         if submission.content is None:
             raise ValueError("Submission content must be defined.")
@@ -51,11 +51,72 @@ class SourceEventPublisher:
             annotation=SubmissionAnnotation(accession_map=submission.accession_map),
         )
 
-        asyncio.run(
-            self._provider.publish(
-                topic=self._config.source_event_topic,
-                type_=self._config.source_event_type,
-                key=submission.id,
-                payload=json.loads(payload.model_dump_json()),
-            )
+        await self._provider.publish(
+            topic=self._config.source_event_topic,
+            type_=self._config.source_event_type,
+            key=submission.id,
+            payload=payload.model_dump(mode="json"),
+        )
+
+    async def publish_submissions(
+        self, submissions: Iterable[models.Submission]
+    ) -> int:
+        """Publish the given submissions as source events in the given order.
+
+        Returns:
+            The number of published submissions.
+        """
+        count = 0
+        for submission in submissions:
+            await self.publish_submission(submission)
+            count += 1
+
+        return count
+
+
+class SourceEventPublisher:
+    """Handles publication of source events from synchronous code.
+
+    This is an adapter to the AsyncSourceEventPublisher, which runs all publications
+    in a single event loop that is kept for the lifetime of this publisher. Thus, it
+    must not be used from within a running event loop. Use the
+    AsyncSourceEventPublisher there instead.
+    """
+
+    def __init__(
+        self, *, config: SourceEventPublisherConfig, provider: EventPublisherProtocol
+    ):
+        """Initialize with config parameters."""
+        self._async_publisher = AsyncSourceEventPublisher(
+            config=config, provider=provider
+        )
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the event loop of this publisher, which is created on first use."""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+
+    def publish_submission(self, submission: models.Submission) -> None:
+        """Publish the current submission as source event"""
+        self._get_loop().run_until_complete(
+            self._async_publisher.publish_submission(submission)
         )
+
+    def publish_submissions(self, submissions: Iterable[models.Submission]) -> int:
+        """Publish the given submissions as source events in the given order using
+        a single run of the event loop.
+
+        Returns:
+            The number of published submissions.
+        """
+        return self._get_loop().run_until_complete(
+            self._async_publisher.publish_submissions(submissions)
+        )
+
+    def close(self) -> None:
+        """Close the event loop of this publisher."""
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
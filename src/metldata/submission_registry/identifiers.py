@@ -16,8 +16,7 @@
 
 """Logic for handling identifiers and accessions."""
 
-from collections.abc import Iterable
-from functools import partial
+from collections.abc import Iterable, Sequence
 from uuid import uuid4
 
 from pydantic import Json
@@ -51,30 +50,6 @@ def lookup_accession(
     return accession_map.get(anchor, {}).get(alias, None)
 
 
-def get_accession(
-    *,
-    anchor: str,
-    alias: str,
-    accession_map: AccessionMap,
-    accession_registry: AccessionRegistry,
-    target_by_anchor_point: dict[str, str],
-) -> str:
-    """Get the accession for a resource with the provided user-defined alias of
-    the class with the provided anchor. If no entry can be found in the provided accession map,
-    a new accession is requested from the provided accession registry.
-    """
-    accession = lookup_accession(
-        anchor=anchor, alias=alias, accession_map=accession_map
-    )
-    if accession:
-        return accession
-
-    class_name = lookup_class_by_anchor_point(
-        root_slot=anchor, target_by_anchor_point=target_by_anchor_point
-    )
-    return accession_registry.get_accession(resource_type=class_name)
-
-
 def get_aliases_for_resources(
     *,
     resources: list[Json],
@@ -119,21 +94,101 @@ def generate_accession_map(
         anchor_points_by_target=anchor_points_by_target
     )
 
-    get_accession_ = partial(
-        get_accession,
-        accession_map=existing_accession_map,
-        accession_registry=accession_registry,
-        target_by_anchor_point=target_by_anchor_point,
-    )
-
-    return {
-        anchor: {
-            alias: get_accession_(anchor=anchor, alias=alias)
-            for alias in get_aliases_for_resources(
+    accession_map: AccessionMap = {}
+    for anchor, resources in content.items():
+        aliases = list(
+            get_aliases_for_resources(
                 resources=resources,
                 root_slot=anchor,
                 anchor_points_by_target=anchor_points_by_target,
             )
+        )
+        existing_accessions = existing_accession_map.get(anchor, {})
+
+        # request the accessions for all new aliases of this class at once:
+        new_aliases = list(
+            dict.fromkeys(
+                alias
+                for alias in aliases
+                if not lookup_accession(
+                    anchor=anchor, alias=alias, accession_map=existing_accession_map
+                )
+            )
+        )
+        new_accessions: dict[str, str] = {}
+        if new_aliases:
+            class_name = lookup_class_by_anchor_point(
+                root_slot=anchor, target_by_anchor_point=target_by_anchor_point
+            )
+            new_accessions = dict(
+                zip(
+                    new_aliases,
+                    accession_registry.get_accessions(
+                        resource_type=class_name, count=len(new_aliases)
+                    ),
+                    strict=True,
+                )
+            )
+
+        accession_map[anchor] = {
+            alias: existing_accessions.get(alias) or new_accessions[alias]
+            for alias in aliases
         }
-        for anchor, resources in content.items()
+
+    return accession_map
+
+
+def generate_accession_maps(
+    *,
+    contents: Sequence[SubmissionContent],
+    accession_registry: AccessionRegistry,
+    anchor_points_by_target: dict[str, AnchorPoint],
+) -> list[AccessionMap]:
+    """Generate accession maps for the provided contents of new submissions.
+
+    The accessions for all resources of a class are requested at once across all
+    contents. Thus, this is considerably faster than calling `generate_accession_map`
+    for each content.
+    """
+    target_by_anchor_point = invert_anchor_points_by_target(
+        anchor_points_by_target=anchor_points_by_target
+    )
+
+    aliases_by_content: list[dict[str, list[str]]] = []
+    counts_by_anchor: dict[str, int] = {}
+    for content in contents:
+        aliases_by_anchor = {
+            anchor: list(
+                dict.fromkeys(
+                    get_aliases_for_resources(
+                        resources=resources,
+                        root_slot=anchor,
+                        anchor_points_by_target=anchor_points_by_target,
+                    )
+                )
+            )
+            for anchor, resources in content.items()
+        }
+        aliases_by_content.append(aliases_by_anchor)
+        for anchor, aliases in aliases_by_anchor.items():
+            counts_by_anchor[anchor] = counts_by_anchor.get(anchor, 0) + len(aliases)
+
+    accessions_by_anchor = {
+        anchor: iter(
+            accession_registry.get_accessions(
+                resource_type=lookup_class_by_anchor_point(
+                    root_slot=anchor, target_by_anchor_point=target_by_anchor_point
+                ),
+                count=count,
+            )
+        )
+        for anchor, count in counts_by_anchor.items()
     }
+
+    return [
+        {
+            anchor: {alias: next(accessions_by_anchor[anchor]) for alias in aliases}
+            for anchor, aliases in aliases_by_anchor.items()
+        }
+        for aliases_by_anchor in aliases_by_content
+    ]
@@ -57,11 +57,34 @@ class SubmissionHeader(BaseModel):
     description: str | None = Field(None, description="An optional description.")
 
 
-class Submission(SubmissionHeader):
-    """A model for describing a submission."""
+class SubmissionRecord(SubmissionHeader):
+    """The stored information on a submission except for its potentially large
+    content and accession map.
+    """
 
     id: str
 
+    status_history: tuple[StatusChange, ...] = Field(
+        default_factory=lambda: (
+            StatusChange(timestamp=now_as_utc(), new_status=SubmissionStatus.PENDING),
+        ),
+        description="A history of status changes.",
+    )
+
+    @property
+    def current_status(self) -> SubmissionStatus:
+        """Extract the current submission status from the status history."""
+        if len(self.status_history) == 0:
+            raise RuntimeError("Status history is empty.")
+
+        sorted_history = sorted(self.status_history, key=attrgetter("timestamp"))
+
+        return sorted_history[-1].new_status
+
+
+class Submission(SubmissionRecord):
+    """A model for describing a submission."""
+
     content: SubmissionContent | None = Field(
         None,
         description=(
@@ -87,23 +110,6 @@ class Submission(SubmissionHeader):
         ),
     )
 
-    status_history: tuple[StatusChange, ...] = Field(
-        default_factory=lambda: (
-            StatusChange(timestamp=now_as_utc(), new_status=SubmissionStatus.PENDING),
-        ),
-        description="A history of status changes.",
-    )
-
-    @property
-    def current_status(self) -> SubmissionStatus:
-        """Extract the current submission status from the status history."""
-        if len(self.status_history) == 0:
-            raise RuntimeError("Status history is empty.")
-
-        sorted_history = sorted(self.status_history, key=attrgetter("timestamp"))
-
-        return sorted_history[-1].new_status
-
     @field_validator("accession_map")
     def check_accession_uniqueness(cls, value: AccessionMap) -> AccessionMap:  # noqa: N805
         """Check that no accessions are re-used accross classes."""
@@ -118,3 +124,55 @@ class Submission(SubmissionHeader):
             raise ValueError("Accessions are not unique.")
 
         return value
+
+
+class SubmissionSummary(BaseModel):
+    """A compact summary of a submission that does not include its content."""
+
+    id: str
+    title: str
+    status: SubmissionStatus = Field(
+        ..., description="The current status of the submission."
+    )
+    last_status_change: UTCDatetime = Field(
+        ..., description="The timestamp of the latest status change."
+    )
+    content_digest: str | None = Field(
+        default=None,
+        description=(
+            "The SHA-256 hex digest of the canonical JSON representation of the"
+            + " submission content or None if the content has not yet been specified."
+        ),
+    )
+
+
+class SubmissionImport(SubmissionHeader):
+    """A submission to be imported in bulk including its content."""
+
+    content: SubmissionContent = Field(
+        ..., description="The metadata content of the submission."
+    )
+
+
+class BulkImportReport(BaseModel):
+    """A report on a bulk import of submissions."""
+
+    imported: dict[str, str] = Field(
+        default_factory=dict,
+        description=(
+            "The IDs of the created submissions by the name of the file they have been"
+            + " imported from."
+        ),
+    )
+    failures: dict[str, str] = Field(
+        default_factory=dict,
+        description=(
+            "The error messages by the name of the files that could not be imported."
+        ),
+    )
+    duration: float = Field(..., description="The duration of the import in seconds.")
+
+    @property
+    def submissions_per_second(self) -> float:
+        """The number of imported submissions per second."""
+        return len(self.imported) / self.duration if self.duration else 0.0
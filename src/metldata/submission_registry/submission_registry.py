@@ -16,26 +16,83 @@
 
 """Logic for handling submissions."""
 
+import json
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+import jsonschema
 from ghga_service_commons.utils.utc_dates import now_as_utc
+from pydantic import ValidationError
 
 from metldata.accession_registry.accession_registry import AccessionRegistry
 from metldata.custom_types import SubmissionContent
 from metldata.model_utils.anchors import get_anchors_points_by_target
 from metldata.model_utils.config import MetadataModelConfig
-from metldata.model_utils.metadata_validator import MetadataValidator
+from metldata.model_utils.metadata_validator import (
+    MetadataValidationError,
+    MetadataValidator,
+    check_metadata,
+)
+from metldata.model_utils.validation_cache import (
+    ValidationCacheConfig,
+    get_validation_cache,
+)
 from metldata.submission_registry import models
 from metldata.submission_registry.event_publisher import SourceEventPublisher
 from metldata.submission_registry.identifiers import (
     generate_accession_map,
+    generate_accession_maps,
     generate_submission_id,
 )
-from metldata.submission_registry.submission_store import SubmissionStore
+from metldata.submission_registry.submission_store import (
+    LazySubmission,
+    SubmissionStore,
+)
 
 
-class SubmissionRegistryConfig(MetadataModelConfig):
+class SubmissionRegistryConfig(MetadataModelConfig, ValidationCacheConfig):
     """Config parameters and their defaults."""
 
 
+_import_validator: jsonschema.Draft7Validator | None = None
+
+
+def _init_import_worker(json_schema: dict[str, Any]) -> None:
+    """Initialize a process validating submissions to be imported with the JSON
+    Schema of the metadata model, which has been generated only once.
+    """
+    global _import_validator
+    _import_validator = jsonschema.Draft7Validator(json_schema)
+
+
+def _load_submission_import(path: Path) -> models.SubmissionImport | str:
+    """Load and validate a submission to be imported from a JSON file. Instead of
+    raising an error, the error message is returned.
+    """
+    if _import_validator is None:
+        raise RuntimeError("The import worker has not been initialized.")
+
+    try:
+        with open(path, encoding="utf-8") as file:
+            submission_import = models.SubmissionImport.model_validate(json.load(file))
+        check_metadata(submission_import.content, validator=_import_validator)
+    except (OSError, ValueError, ValidationError, MetadataValidationError) as error:
+        return f"{type(error).__name__}: {error}"
+
+    return submission_import
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    """Split the given iterable into lists of the given size."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
 class SubmissionRegistry:
     """A class for handling submissions."""
 
@@ -73,19 +130,42 @@ class SubmissionRegistry:
         event_publisher: SourceEventPublisher,
         accession_registry: AccessionRegistry,
     ):
-        """Initialize with dependencies and config parameters."""
+        """Initialize with dependencies and config parameters.
+
+        If a validation cache is configured, it is opened by the registry and must be
+        released using `close` or by using the registry as context manager.
+        """
         self._submission_store = submission_store
-        self._metadata_validator = MetadataValidator(model=config.metadata_model)
+        self._validation_cache = get_validation_cache(config=config)
+        self._metadata_validator = MetadataValidator(
+            model=config.metadata_model, cache=self._validation_cache
+        )
         self._event_publisher = event_publisher
         self._accession_registry = accession_registry
         self._anchor_points_by_target = get_anchors_points_by_target(
             model=config.metadata_model
         )
 
+    def close(self) -> None:
+        """Close the validation cache opened by the registry, if any. The injected
+        dependencies are not closed.
+        """
+        if self._validation_cache is not None:
+            self._validation_cache.close()
+
+    def __enter__(self) -> "SubmissionRegistry":
+        """Use the registry as context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close the registry."""
+        self.close()
+
     def _get_submission_with_status(
         self, *, id_: str, expected_status: models.SubmissionStatus
-    ) -> models.Submission:
+    ) -> LazySubmission:
         """Get details for a submission that is assumed to have the specified status.
+        The content and accession map of the submission are only loaded on access.
 
         Raises:
             SubmissionRegistry.SubmissionDoesNotExistError:
@@ -94,7 +174,7 @@ class SubmissionRegistry:
                 when the submission does not have the expected status.
         """
         # raises SubmissionDoesNotExistError if failed to get submission by id:
-        submission = self._submission_store.get_by_id(submission_id=id_)
+        submission = self._submission_store.get_lazy_by_id(submission_id=id_)
 
         if submission.current_status != expected_status:
             raise self.StatusError(
@@ -155,8 +235,10 @@ class SubmissionRegistry:
             anchor_points_by_target=self._anchor_points_by_target,
         )
 
-        updated_submission = submission.model_copy(
-            update={"content": content, "accession_map": updated_accession_map}
+        updated_submission = models.Submission(
+            **dict(submission.record),
+            content=content,
+            accession_map=updated_accession_map,
         )
         self._submission_store.update_existing(submission=updated_submission)
 
@@ -179,18 +261,152 @@ class SubmissionRegistry:
             id_=id_, expected_status=models.SubmissionStatus.PENDING
         )
 
-        if submission.content is None:
+        if not submission.has_content:
             raise self.ContentEmptyError(submission_id=id_)
 
         status_change = models.StatusChange(
             timestamp=now_as_utc(), new_status=models.SubmissionStatus.COMPLETED
         )
-        updated_submission = submission.model_copy(
+        updated_record = submission.record.model_copy(
             update={
                 "status_history": submission.status_history  # noqa: RUF005
                 + (status_change,)
             }
         )
-        self._submission_store.update_existing(submission=updated_submission)
+        # only the small record is rewritten, not the content:
+        self._submission_store.update_record(record=updated_record)
 
-        self._event_publisher.publish_submission(updated_submission)
+        self._event_publisher.publish_submission(
+            LazySubmission(record=updated_record, store=self._submission_store).load()
+        )
+
+    def import_submissions(
+        self,
+        *,
+        submission_dir: Path,
+        complete: bool = False,
+        batch_size: int = 100,
+        max_workers: int | None = None,
+    ) -> models.BulkImportReport:
+        """Import all submissions from the JSON files in the specified directory.
+        Each file must contain a title, an optional description, and the content of
+        a submission.
+
+        The files are loaded and validated in a pool of processes, which share the
+        JSON Schema of the metadata model. Valid submissions are then processed in
+        batches: The accessions for all resources of a batch are requested at once,
+        the submissions are saved together, and their source events are published
+        using a single event loop run. Files that fail to load or validate are
+        skipped and reported.
+
+        Errors while saving or publishing a batch abort the import. Batches
+        processed before remain imported, and the accessions already registered
+        for the failed batch are not released.
+
+        Args:
+            submission_dir: The directory containing the submission JSON files.
+            complete: Whether to complete the imported submissions.
+            batch_size: The number of submissions processed together.
+            max_workers:
+                The number of processes used for loading and validation. If 1, no
+                separate processes are used. Defaults to the number of CPUs.
+        """
+        start = time.perf_counter()
+        paths = sorted(submission_dir.glob("*.json"))
+        json_schema = self._metadata_validator.json_schema
+
+        imported: dict[str, str] = {}
+        failures: dict[str, str] = {}
+        if max_workers == 1:
+            _init_import_worker(json_schema)
+            self._import_batches(
+                paths=paths,
+                results=map(_load_submission_import, paths),
+                complete=complete,
+                batch_size=batch_size,
+                imported=imported,
+                failures=failures,
+            )
+        else:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_import_worker,
+                initargs=(json_schema,),
+            ) as executor:
+                self._import_batches(
+                    paths=paths,
+                    results=executor.map(
+                        _load_submission_import, paths, chunksize=batch_size
+                    ),
+                    complete=complete,
+                    batch_size=batch_size,
+                    imported=imported,
+                    failures=failures,
+                )
+
+        return models.BulkImportReport(
+            imported=imported,
+            failures=failures,
+            duration=time.perf_counter() - start,
+        )
+
+    def _import_batches(  # noqa: PLR0913
+        self,
+        *,
+        paths: list[Path],
+        results: Iterable[models.SubmissionImport | str],
+        complete: bool,
+        batch_size: int,
+        imported: dict[str, str],
+        failures: dict[str, str],
+    ) -> None:
+        """Import the loaded and validated submissions in batches and record the
+        created submission IDs and failures by file name.
+        """
+        for batch in _batched(zip(paths, results, strict=True), batch_size):
+            valid_imports: list[tuple[Path, models.SubmissionImport]] = []
+            for path, result in batch:
+                if isinstance(result, str):
+                    failures[path.name] = result
+                else:
+                    valid_imports.append((path, result))
+            if not valid_imports:
+                continue
+
+            accession_maps = generate_accession_maps(
+                contents=[
+                    submission_import.content for _, submission_import in valid_imports
+                ],
+                accession_registry=self._accession_registry,
+                anchor_points_by_target=self._anchor_points_by_target,
+            )
+
+            status_history = [
+                models.StatusChange(
+                    timestamp=now_as_utc(), new_status=models.SubmissionStatus.PENDING
+                )
+            ]
+            if complete:
+                status_history.append(
+                    models.StatusChange(
+                        timestamp=now_as_utc(),
+                        new_status=models.SubmissionStatus.COMPLETED,
+                    )
+                )
+
+            submissions = [
+                models.Submission(
+                    id=generate_submission_id(),
+                    **dict(submission_import),
+                    accession_map=accession_map,
+                    status_history=tuple(status_history),
+                )
+                for (_, submission_import), accession_map in zip(
+                    valid_imports, accession_maps, strict=True
+                )
+            ]
+            self._submission_store.insert_many(submissions=submissions)
+            self._event_publisher.publish_submissions(submissions)
+
+            for (path, _), submission in zip(valid_imports, submissions, strict=True):
+                imported[path.name] = submission.id
@@ -17,12 +17,45 @@
 """Logic for storing submission metadata."""
 
 import json
+import shutil
+import sqlite3
+from collections.abc import Mapping, Sequence
+from enum import Enum
+from functools import cached_property
+from operator import attrgetter
 from pathlib import Path
+from typing import Any
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
+from metldata.compression import (
+    StorageCompression,
+    find_stored_path,
+    find_stored_paths,
+    get_compressed_path,
+    read_json,
+    write_json,
+)
+from metldata.custom_types import SubmissionContent
+from metldata.model_utils.validation_cache import get_metadata_digest
 from metldata.submission_registry import models
+from metldata.submission_registry.content_deltas import (
+    apply_content_delta,
+    diff_content,
+)
+
+SUBMISSION_INDEX_FILENAME = "submission_index.sqlite"
+CONTENT_DIRNAME = "content"
+ACCESSION_MAP_DIRNAME = "accession_maps"
+CONTENT_HISTORY_DIRNAME = "content_history"
+
+
+class SubmissionStoreBackend(Enum):
+    """Backends for persisting submissions."""
+
+    JSON = "json"
+    INDEXED = "indexed"
 
 
 class SubmissionStoreConfig(BaseSettings):
@@ -31,10 +64,157 @@ class SubmissionStoreConfig(BaseSettings):
     submission_store_dir: Path = Field(
         ..., description="The directory where the submission JSONs will be stored."
     )
+    submission_store_backend: SubmissionStoreBackend = Field(
+        default=SubmissionStoreBackend.JSON,
+        description=(
+            "The backend used for storing submissions. With 'json', listing and"
+            + " filtering submissions requires loading every submission. With"
+            + " 'indexed', a compact index of the submissions is additionally kept in"
+            + " an SQLite database in the submission store directory, which is built"
+            + " from existing submissions on first use."
+        ),
+    )
+    submission_store_compression: StorageCompression = Field(
+        default=StorageCompression.NONE,
+        description=(
+            "The compression used for storing the content and accession map of"
+            + " submissions. With 'zstd', the optional dependency 'zstandard' is"
+            + " required. Files stored with another compression remain readable."
+        ),
+    )
+    submission_store_history: bool = Field(
+        default=False,
+        description=(
+            "Whether to keep all versions of the content of submissions. If enabled,"
+            + " each version is stored as a structural delta to the previous version"
+            + " or, periodically, as a full snapshot. Submissions that already have a"
+            + " content history keep it even if this is disabled."
+        ),
+    )
+    submission_history_snapshot_interval: int = Field(
+        default=10,
+        description=(
+            "The number of content versions after which a full snapshot is stored"
+            + " instead of a delta. Reconstructing a version requires reading at most"
+            + " this number of files."
+        ),
+        ge=1,
+    )
+    submission_index_timeout: float = Field(
+        default=30,
+        description=(
+            "The number of seconds to wait for a concurrent writer to release the"
+            + " SQLite database of the 'indexed' backend before failing."
+        ),
+        gt=0,
+    )
+
+
+def get_content_digest(content: SubmissionContent | None) -> str | None:
+    """Get the SHA-256 hex digest of the canonical JSON representation of the given
+    submission content or None if no content is given.
+    """
+    return None if content is None else get_metadata_digest(content)
+
+
+def get_last_status_change(record: models.SubmissionRecord) -> models.StatusChange:
+    """Get the latest status change of the given submission."""
+    if len(record.status_history) == 0:
+        raise RuntimeError("Status history is empty.")
+
+    return sorted(record.status_history, key=attrgetter("timestamp"))[-1]
+
+
+def get_submission_summary(submission: models.Submission) -> models.SubmissionSummary:
+    """Summarize the given submission."""
+    last_status_change = get_last_status_change(submission)
+
+    return models.SubmissionSummary(
+        id=submission.id,
+        title=submission.title,
+        status=last_status_change.new_status,
+        last_status_change=last_status_change.timestamp,
+        content_digest=get_content_digest(submission.content),
+    )
+
+
+class LazySubmission:
+    """A read-only view on a stored submission. The potentially large content and
+    accession map are only loaded from the store when they are accessed for the
+    first time.
+    """
+
+    def __init__(self, *, record: models.SubmissionRecord, store: "SubmissionStore"):
+        """Initialize with the record of the submission and the store holding it."""
+        self.record = record
+        self._store = store
+
+    @property
+    def id(self) -> str:
+        """The ID of the submission."""
+        return self.record.id
+
+    @property
+    def title(self) -> str:
+        """The title of the submission."""
+        return self.record.title
+
+    @property
+    def description(self) -> str | None:
+        """The description of the submission."""
+        return self.record.description
+
+    @property
+    def status_history(self) -> tuple[models.StatusChange, ...]:
+        """The history of status changes of the submission."""
+        return self.record.status_history
+
+    @property
+    def current_status(self) -> models.SubmissionStatus:
+        """The current status of the submission."""
+        return self.record.current_status
+
+    @property
+    def has_content(self) -> bool:
+        """Check whether the content has been specified without loading it."""
+        if "content" in self.__dict__:
+            return self.content is not None
+        return self._store.has_content(submission_id=self.id)
+
+    @cached_property
+    def content(self) -> SubmissionContent | None:
+        """The content of the submission, which is loaded on first access."""
+        return self._store.get_content(submission_id=self.id)
+
+    @cached_property
+    def accession_map(self) -> models.AccessionMap:
+        """The accession map of the submission, which is loaded on first access."""
+        return self._store.get_accession_map(submission_id=self.id)
+
+    def load(self) -> models.Submission:
+        """Load the complete submission."""
+        return models.Submission(
+            **dict(self.record),
+            content=self.content,
+            accession_map=self.accession_map,
+        )
 
 
 class SubmissionStore:
-    """A class for storing and retrieving submissions."""
+    """A class for storing and retrieving submissions.
+
+    Each submission is stored as a small JSON document containing its record, i.e.
+    everything but its content and accession map, which are stored as separate
+    JSON documents in the subdirectories "content" and "accession_maps" of the store
+    directory. Thus, the record of a submission can be read and updated without
+    touching its potentially large content. Submissions stored as a single JSON
+    document by earlier versions are still readable and can be migrated using
+    `migrate_layout`.
+
+    If the content history is enabled, the versions of the content of a submission
+    are instead stored in the subdirectory "content_history/<submission ID>", each
+    as a delta to its previous version or as a full snapshot.
+    """
 
     class SubmissionDoesNotExistError(RuntimeError):
         """Raised when an Submission does not exists."""
@@ -54,9 +234,47 @@ class SubmissionStore:
             )
             super().__init__(message)
 
-    def __init__(self, *, config: SubmissionStoreConfig):
-        """Initialize with config parameters."""
+    class ContentVersionDoesNotExistError(RuntimeError):
+        """Raised when a version of the content of a submission does not exist."""
+
+        def __init__(self, *, submission_id: str, version: int):
+            message = (
+                f"The content version {version} of the submission with the following"
+                + " ID does not exist: "
+                + submission_id
+            )
+            super().__init__(message)
+
+    class ContentHistoryCorruptError(RuntimeError):
+        """Raised when a version of the content of a submission cannot be
+        reconstructed since no snapshot precedes it.
+        """
+
+        def __init__(self, *, submission_id: str, version: int):
+            message = (
+                f"The content version {version} of the submission with the following"
+                + " ID cannot be reconstructed since no snapshot precedes it: "
+                + submission_id
+            )
+            super().__init__(message)
+
+    def __init__(
+        self,
+        *,
+        config: SubmissionStoreConfig,
+        identifier_slots: Mapping[str, str] | None = None,
+    ):
+        """Initialize with config parameters.
+
+        Args:
+            config: The config parameters.
+            identifier_slots:
+                The identifier slots by root slot of the content, which are used to
+                identify resources in deltas of the content history. Resources
+                without a known identifier slot are identified by their position.
+        """
         self._config = config
+        self._identifier_slots = identifier_slots or {}
 
     def _get_submission_json_path(self, *, submission_id: str) -> Path:
         """Get the path to the JSON file containing the submission with the specified
@@ -64,11 +282,183 @@ class SubmissionStore:
         """
         return self._config.submission_store_dir / f"{submission_id}.json"
 
+    def _get_blob_path(self, *, submission_id: str, dirname: str) -> Path:
+        """Get the path to the JSON file in the specified subdirectory that holds a
+        part of the submission with the specified ID.
+        """
+        return self._config.submission_store_dir / dirname / f"{submission_id}.json"
+
+    def _write_blob(self, *, submission_id: str, dirname: str, value: Any) -> None:
+        """Write a part of a submission to a JSON file. If the value is None, an
+        existing file is removed.
+        """
+        blob_path = self._get_blob_path(submission_id=submission_id, dirname=dirname)
+        if value is None:
+            for compression in StorageCompression:
+                get_compressed_path(blob_path, compression=compression).unlink(
+                    missing_ok=True
+                )
+            return
+
+        blob_path.parent.mkdir(exist_ok=True)
+        write_json(
+            value,
+            path=blob_path,
+            compression=self._config.submission_store_compression,
+        )
+
+    def _read_document(self, *, submission_id: str) -> dict[str, Any]:
+        """Read the JSON document containing the record of the submission with the
+        specified ID.
+
+        Raises:
+            SubmissionDoesNotExistError: Raised when the submission does not exist.
+        """
+        json_path = self._get_submission_json_path(submission_id=submission_id)
+
+        if not json_path.exists():
+            raise self.SubmissionDoesNotExistError(submission_id=submission_id)
+
+        with open(json_path, encoding="utf-8") as file:
+            return json.load(file)
+
+    def _read_blob(self, *, submission_id: str, dirname: str, legacy_key: str) -> Any:
+        """Read a part of a submission from its JSON file, which is decompressed while
+        it is parsed if needed. Falls back to the given key of the submission
+        document for submissions stored in a single document.
+
+        Raises:
+            SubmissionDoesNotExistError: Raised when the submission does not exist.
+        """
+        blob_path = self._get_blob_path(submission_id=submission_id, dirname=dirname)
+        try:
+            return read_json(blob_path)
+        except FileNotFoundError:
+            return self._read_document(submission_id=submission_id).get(legacy_key)
+
     def _save(self, *, submission: models.Submission) -> None:
-        """Save a submission to a JSON file."""
-        json_path = self._get_submission_json_path(submission_id=submission.id)
-        with open(json_path, "w", encoding="utf-8") as file:
-            file.write(submission.model_dump_json(indent=4))
+        """Save a submission to JSON files. The record is written last, so that it
+        only references complete content and accession map files.
+        """
+        self._write_content(submission_id=submission.id, content=submission.content)
+        self._write_blob(
+            submission_id=submission.id,
+            dirname=ACCESSION_MAP_DIRNAME,
+            value=submission.accession_map,
+        )
+        self._save_record(record=submission)
+
+    def _get_history_dir(self, *, submission_id: str) -> Path:
+        """Get the directory holding the content history of the submission with the
+        specified ID.
+        """
+        return (
+            self._config.submission_store_dir / CONTENT_HISTORY_DIRNAME / submission_id
+        )
+
+    def _get_version_paths(self, *, submission_id: str) -> dict[int, Path]:
+        """Get the paths of the files storing the content versions of the submission
+        with the specified ID by version, without the suffix of their compression.
+        """
+        history_dir = self._get_history_dir(submission_id=submission_id)
+        try:
+            stored_paths = find_stored_paths(history_dir)
+        except FileNotFoundError:
+            return {}
+
+        version_paths = {
+            int(version_path.name.split(".")[0]): version_path
+            for version_path in stored_paths
+        }
+        return dict(sorted(version_paths.items()))
+
+    def _write_content(
+        self, *, submission_id: str, content: SubmissionContent | None
+    ) -> None:
+        """Write the content of a submission. If the content history is used, a new
+        version is added unless the content did not change.
+
+        To compute the delta, the current content is reconstructed from the latest
+        snapshot and the deltas since then. Thus, the amount of data read is bounded
+        by the snapshot interval rather than proportional to the change.
+        """
+        version_paths = self._get_version_paths(submission_id=submission_id)
+        if not (self._config.submission_store_history or version_paths):
+            self._write_blob(
+                submission_id=submission_id, dirname=CONTENT_DIRNAME, value=content
+            )
+            return
+
+        history_dir = self._get_history_dir(submission_id=submission_id)
+        try:
+            current_content = self.get_content(submission_id=submission_id)
+        except self.SubmissionDoesNotExistError:
+            # a new submission:
+            current_content = None
+
+        if content is None:
+            shutil.rmtree(history_dir, ignore_errors=True)
+        elif not version_paths or current_content != content:
+            history_dir.mkdir(parents=True, exist_ok=True)
+            version = max(version_paths, default=0)
+            last_snapshot = max(
+                (
+                    snapshot_version
+                    for snapshot_version, path in version_paths.items()
+                    if path.name.endswith(".snapshot.json")
+                ),
+                default=0,
+            )
+            if last_snapshot == 0 and current_content is not None:
+                # the content was stored before the history was enabled, it is kept
+                # as base snapshot, which later deltas are applied to:
+                version += 1
+                last_snapshot = version
+                write_json(
+                    current_content,
+                    path=history_dir / f"{version:08}.snapshot.json",
+                    compression=self._config.submission_store_compression,
+                )
+
+            if current_content != content:
+                version += 1
+                if (
+                    current_content is None
+                    or version - last_snapshot
+                    >= self._config.submission_history_snapshot_interval
+                ):
+                    version_path = history_dir / f"{version:08}.snapshot.json"
+                    value = content
+                else:
+                    version_path = history_dir / f"{version:08}.delta.json"
+                    value = diff_content(
+                        current_content,
+                        content,
+                        identifier_slots=self._identifier_slots,
+                    )
+                write_json(
+                    value,
+                    path=version_path,
+                    compression=self._config.submission_store_compression,
+                )
+
+        # the content is stored in the history only:
+        self._write_blob(
+            submission_id=submission_id, dirname=CONTENT_DIRNAME, value=None
+        )
+
+    def _save_record(self, *, record: models.SubmissionRecord) -> None:
+        """Save the record of a submission to a JSON file. Since the record determines
+        whether the submission exists, the file is replaced atomically.
+        """
+        write_json(
+            record.model_dump(
+                mode="json", include=set(models.SubmissionRecord.model_fields)
+            ),
+            path=self._get_submission_json_path(submission_id=record.id),
+            compression=StorageCompression.NONE,
+            indent=4,
+        )
 
     def exists(self, *, submission_id: str) -> bool:
         """Check whether a submission with the specified ID exists."""
@@ -108,15 +498,106 @@ class SubmissionStore:
         Raises:
             SubmissionDoesNotExistError: Raised when the submission does not exist.
         """
-        json_path = self._get_submission_json_path(submission_id=submission_id)
+        return self.get_lazy_by_id(submission_id=submission_id).load()
 
-        if not json_path.exists():
-            raise self.SubmissionDoesNotExistError(submission_id=submission_id)
+    def get_lazy_by_id(self, *, submission_id: str) -> LazySubmission:
+        """Get a view on an existing submission by its ID, which only loads the
+        content and accession map when they are accessed.
 
-        with open(json_path, encoding="utf-8") as file:
-            submission_dict = json.load(file)
+        Raises:
+            SubmissionDoesNotExistError: Raised when the submission does not exist.
+        """
+        document = self._read_document(submission_id=submission_id)
+        return LazySubmission(record=models.SubmissionRecord(**document), store=self)
+
+    def get_content(self, *, submission_id: str) -> SubmissionContent | None:
+        """Get the content of an existing submission.
+
+        Raises:
+            SubmissionDoesNotExistError: Raised when the submission does not exist.
+        """
+        version_paths = self._get_version_paths(submission_id=submission_id)
+        if version_paths:
+            return self.get_content_version(
+                submission_id=submission_id, version=max(version_paths)
+            )
+
+        return self._read_blob(
+            submission_id=submission_id, dirname=CONTENT_DIRNAME, legacy_key="content"
+        )
+
+    def get_content_versions(self, *, submission_id: str) -> list[int]:
+        """Get the versions of the content of a submission stored in its content
+        history in ascending order. The list is empty if the submission has no
+        content history.
+        """
+        return list(self._get_version_paths(submission_id=submission_id))
+
+    def get_content_version(
+        self, *, submission_id: str, version: int
+    ) -> SubmissionContent:
+        """Reconstruct the specified version of the content of a submission from the
+        latest snapshot preceding it and the deltas since then.
+
+        Raises:
+            ContentVersionDoesNotExistError: when the version does not exist.
+            ContentHistoryCorruptError: when no snapshot precedes the version.
+        """
+        version_paths = self._get_version_paths(submission_id=submission_id)
+        if version not in version_paths:
+            raise self.ContentVersionDoesNotExistError(
+                submission_id=submission_id, version=version
+            )
+
+        snapshot_version = max(
+            (
+                snapshot_version
+                for snapshot_version, path in version_paths.items()
+                if snapshot_version <= version and path.name.endswith(".snapshot.json")
+            ),
+            default=None,
+        )
+        if snapshot_version is None:
+            raise self.ContentHistoryCorruptError(
+                submission_id=submission_id, version=version
+            )
+        content = read_json(version_paths[snapshot_version])
+        for delta_version in range(snapshot_version + 1, version + 1):
+            content = apply_content_delta(
+                content, read_json(version_paths[delta_version])
+            )
+        return content
 
-        return models.Submission(**submission_dict)
+    def has_content(self, *, submission_id: str) -> bool:
+        """Check whether the content of an existing submission has been specified
+        without loading it.
+
+        Raises:
+            SubmissionDoesNotExistError: Raised when the submission does not exist.
+        """
+        if self._get_version_paths(submission_id=submission_id):
+            return True
+
+        content_path = self._get_blob_path(
+            submission_id=submission_id, dirname=CONTENT_DIRNAME
+        )
+        return (
+            find_stored_path(content_path) is not None
+            or self.get_content(submission_id=submission_id) is not None
+        )
+
+    def get_accession_map(self, *, submission_id: str) -> models.AccessionMap:
+        """Get the accession map of an existing submission.
+
+        Raises:
+            SubmissionDoesNotExistError: Raised when the submission does not exist.
+        """
+        accession_map = self._read_blob(
+            submission_id=submission_id,
+            dirname=ACCESSION_MAP_DIRNAME,
+            legacy_key="accession_map",
+        )
+        return {} if accession_map is None else accession_map
 
     def insert_new(self, *, submission: models.Submission) -> None:
         """Save a new submission.
@@ -127,6 +608,23 @@ class SubmissionStore:
         self._assert_not_exists(submission_id=submission.id)
         self._save(submission=submission)
 
+    def insert_many(self, *, submissions: Sequence[models.Submission]) -> None:
+        """Save multiple new submissions.
+
+        The existence of all submissions is checked before any of them is saved.
+        Saving is not atomic though: if it fails midway, the submissions saved up to
+        that point remain in the store.
+
+        Raises:
+            SubmissionAlreadyExistError:
+                when one of the submissions already exists. In this case, none of the
+                submissions is saved.
+        """
+        for submission in submissions:
+            self._assert_not_exists(submission_id=submission.id)
+        for submission in submissions:
+            self._save(submission=submission)
+
     def update_existing(self, *, submission: models.Submission) -> None:
         """Update an existing submission.
 
@@ -135,3 +633,286 @@ class SubmissionStore:
         """
         self._assert_exists(submission_id=submission.id)
         self._save(submission=submission)
+
+    def update_record(self, *, record: models.SubmissionRecord) -> None:
+        """Update the record of an existing submission, e.g. its status history,
+        without rewriting its content and accession map.
+
+        Raises:
+            SubmissionDoesNotExistError: when the submission does not exist.
+        """
+        # make sure that a submission stored in a single document is split first,
+        # raises SubmissionDoesNotExistError if the submission does not exist:
+        self.migrate_submission(submission_id=record.id)
+        self._save_record(record=record)
+
+    def migrate_submission(self, *, submission_id: str) -> bool:
+        """Split an existing submission stored as a single document by an earlier
+        version into its record, content, and accession map.
+
+        Returns:
+            Whether the submission needed to be migrated.
+
+        Raises:
+            SubmissionDoesNotExistError: when the submission does not exist.
+        """
+        document = self._read_document(submission_id=submission_id)
+        if "content" not in document and "accession_map" not in document:
+            return False
+
+        self._save(submission=models.Submission(**document))
+        return True
+
+    def migrate_layout(self) -> int:
+        """Split all submissions stored as a single document by an earlier version.
+
+        Returns:
+            The number of migrated submissions.
+        """
+        return sum(
+            self.migrate_submission(submission_id=submission_id)
+            for submission_id in self.get_all_submission_ids()
+        )
+
+    def get_summaries(
+        self, *, status: models.SubmissionStatus | None = None
+    ) -> list[models.SubmissionSummary]:
+        """Get summaries of all existing submissions ordered by ID. If a status is
+        given, only submissions that currently have this status are included.
+        """
+        summaries = [
+            get_submission_summary(self.get_by_id(submission_id))
+            for submission_id in self.get_all_submission_ids()
+        ]
+        return [
+            summary
+            for summary in summaries
+            if status is None or summary.status == status
+        ]
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+
+
+class IndexedSubmissionStore(SubmissionStore):
+    """A class for storing and retrieving submissions that additionally keeps an
+    index of all submissions in an SQLite database.
+
+    The index holds the ID, title, current status, last status change, and content
+    digest of each submission, so that listing and filtering submissions does not
+    require loading any submission. If the index has not been built completely yet,
+    e.g. since the database is new or a previous build was interrupted, it is built
+    from the submissions already present in the store directory.
+    """
+
+    def __init__(
+        self,
+        *,
+        config: SubmissionStoreConfig,
+        identifier_slots: Mapping[str, str] | None = None,
+    ):
+        """Initialize with config parameters.
+
+        Args:
+            config: The config parameters.
+            identifier_slots:
+                The identifier slots by root slot of the content, which are used to
+                identify resources in deltas of the content history.
+        """
+        super().__init__(config=config, identifier_slots=identifier_slots)
+        index_path = config.submission_store_dir / SUBMISSION_INDEX_FILENAME
+        self._connection = sqlite3.connect(
+            index_path, timeout=config.submission_index_timeout
+        )
+        # allow concurrent readers while another process is writing:
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS submissions ("
+                " id TEXT PRIMARY KEY,"
+                " title TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " last_status_change TEXT NOT NULL,"
+                " content_digest TEXT"
+                ") WITHOUT ROWID"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS submissions_by_status"
+                " ON submissions (status)"
+            )
+            # holds a row once the index has been built completely:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS index_complete (complete INTEGER)"
+            )
+
+        if not self._is_index_complete():
+            self.rebuild_index()
+
+    def _is_index_complete(self) -> bool:
+        """Check whether the index has been built completely."""
+        cursor = self._connection.execute("SELECT 1 FROM index_complete")
+        return cursor.fetchone() is not None
+
+    def _index(self, *, summaries: list[models.SubmissionSummary]) -> None:
+        """Insert or replace the given summaries in the index in one transaction."""
+        with self._connection:
+            self._insert_summaries(summaries=summaries)
+
+    def _insert_summaries(self, *, summaries: list[models.SubmissionSummary]) -> None:
+        """Insert or replace the given summaries in the index within the current
+        transaction.
+        """
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO submissions"
+            " (id, title, status, last_status_change, content_digest)"
+            " VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    summary.id,
+                    summary.title,
+                    summary.status.value,
+                    summary.last_status_change.isoformat(),
+                    summary.content_digest,
+                )
+                for summary in summaries
+            ],
+        )
+
+    def _save(self, *, submission: models.Submission) -> None:
+        """Save a submission to a JSON file and update its index entry."""
+        super()._save(submission=submission)
+        self._index(summaries=[get_submission_summary(submission)])
+
+    def insert_many(self, *, submissions: Sequence[models.Submission]) -> None:
+        """Save multiple new submissions and index them in a single transaction.
+
+        The existence of all submissions is checked before any of them is saved.
+        Saving is not atomic though: if it fails midway, the submissions saved up to
+        that point remain in the store.
+
+        Raises:
+            SubmissionAlreadyExistError:
+                when one of the submissions already exists. In this case, none of the
+                submissions is saved.
+        """
+        for submission in submissions:
+            self._assert_not_exists(submission_id=submission.id)
+        for submission in submissions:
+            super()._save(submission=submission)
+        self._index(
+            summaries=[get_submission_summary(submission) for submission in submissions]
+        )
+
+    def update_record(self, *, record: models.SubmissionRecord) -> None:
+        """Update the record of an existing submission, e.g. its status history,
+        without rewriting its content and accession map, and update its index entry.
+
+        Raises:
+            SubmissionDoesNotExistError: when the submission does not exist.
+        """
+        super().update_record(record=record)
+        last_status_change = get_last_status_change(record)
+        with self._connection:
+            self._connection.execute(
+                "UPDATE submissions SET title = ?, status = ?, last_status_change = ?"
+                " WHERE id = ?",
+                (
+                    record.title,
+                    last_status_change.new_status.value,
+                    last_status_change.timestamp.isoformat(),
+                    record.id,
+                ),
+            )
+
+    def rebuild_index(self) -> int:
+        """Rebuild the index from the submissions in the store directory.
+
+        The index is replaced and marked as complete in a single transaction, so an
+        interrupted rebuild leaves either the previous index or no complete index
+        behind, in which case it is rebuilt on the next start.
+
+        Returns:
+            The number of indexed submissions.
+        """
+        summaries = [
+            get_submission_summary(self.get_by_id(submission_id))
+            for submission_id in super().get_all_submission_ids()
+        ]
+        with self._connection:
+            self._connection.execute("DELETE FROM submissions")
+            self._connection.execute("DELETE FROM index_complete")
+            self._insert_summaries(summaries=summaries)
+            self._connection.execute("INSERT INTO index_complete VALUES (1)")
+        return len(summaries)
+
+    def get_all_submission_ids(self) -> list[str]:
+        """Get all submission IDs from existing submissions"""
+        return [
+            submission_id
+            for (submission_id,) in self._connection.execute(
+                "SELECT id FROM submissions ORDER BY id"
+            )
+        ]
+
+    def get_summaries(
+        self, *, status: models.SubmissionStatus | None = None
+    ) -> list[models.SubmissionSummary]:
+        """Get summaries of all existing submissions ordered by ID. If a status is
+        given, only submissions that currently have this status are included.
+        """
+        query = (
+            "SELECT id, title, status, last_status_change, content_digest"
+            " FROM submissions"
+        )
+        parameters: tuple[str, ...] = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            parameters = (status.value,)
+
+        return [
+            models.SubmissionSummary(
+                id=id_,
+                title=title,
+                status=models.SubmissionStatus(status_value),
+                last_status_change=last_status_change,
+                content_digest=content_digest,
+            )
+            for (
+                id_,
+                title,
+                status_value,
+                last_status_change,
+                content_digest,
+            ) in self._connection.execute(query + " ORDER BY id", parameters)
+        ]
+
+    def close(self) -> None:
+        """Close the connection to the index database."""
+        self._connection.close()
+
+
+def get_submission_store(
+    *,
+    config: SubmissionStoreConfig,
+    identifier_slots: Mapping[str, str] | None = None,
+) -> SubmissionStore:
+    """Get a submission store using the backend specified in the config."""
+    if config.submission_store_backend == SubmissionStoreBackend.INDEXED:
+        return IndexedSubmissionStore(config=config, identifier_slots=identifier_slots)
+    return SubmissionStore(config=config, identifier_slots=identifier_slots)
+
+
+def migrate_submission_store(*, config: SubmissionStoreConfig) -> int:
+    """Index the submissions already present in the store directory specified in the
+    config for use with the indexed backend. Submissions stored as a single document
+    by earlier versions are split into record, content, and accession map first.
+
+    Returns:
+        The number of indexed submissions.
+    """
+    submission_store = IndexedSubmissionStore(config=config)
+    try:
+        submission_store.migrate_layout()
+        return submission_store.rebuild_index()
+    finally:
+        submission_store.close()
@@ -17,11 +17,15 @@
 """Config parameters and their defaults."""
 
 from metldata.event_handling.event_handling import FileSystemEventConfig
+from metldata.model_utils.validation_cache import ValidationCacheConfig
 from metldata.transform.artifact_publisher import ArtifactEventPublisherConfig
 from metldata.transform.source_event_subscriber import SourceEventSubscriberConfig
 
 
 class TransformationEventHandlingConfig(
-    FileSystemEventConfig, ArtifactEventPublisherConfig, SourceEventSubscriberConfig
+    FileSystemEventConfig,
+    ArtifactEventPublisherConfig,
+    SourceEventSubscriberConfig,
+    ValidationCacheConfig,
 ):
     """Config parameters for consuming source events and publishing artifacts."""
@@ -22,6 +22,7 @@ from metldata.custom_types import Json
 from metldata.event_handling.models import SubmissionAnnotation
 from metldata.model_utils.essentials import MetadataModel
 from metldata.model_utils.metadata_validator import MetadataValidator
+from metldata.model_utils.validation_cache import ValidationCache
 from metldata.transform.base import (
     Config,
     TransformationDefinition,
@@ -57,11 +58,13 @@ class TransformationHandler:
         transformation_definition: TransformationDefinition[Config],
         transformation_config: Config,
         original_model: MetadataModel,
+        validation_cache: ValidationCache | None = None,
     ):
         """Initialize the TransformationHandler by checking the assumptions made on the
         original model and transforming the model as described in the transformation
         definition. The transformed model is available at the `transformed_model`
-        attribute.
+        attribute. If a validation cache is provided, it is consulted when validating
+        metadata.
 
         Raises:
             ModelAssumptionError:
@@ -82,10 +85,10 @@ class TransformationHandler:
         )
 
         self._original_metadata_validator = MetadataValidator(
-            model=self._original_model
+            model=self._original_model, cache=validation_cache
         )
         self._transformed_metadata_validator = MetadataValidator(
-            model=self.transformed_model
+            model=self.transformed_model, cache=validation_cache
         )
 
     def transform_metadata(
@@ -155,13 +158,14 @@ def check_workflow_config(
         )
 
 
-def resolve_workflow_step(
+def resolve_workflow_step(  # noqa: PLR0913
     *,
     workflow_step: WorkflowStep,
     step_name: str,
     workflow_definition: WorkflowDefinition,
     workflow_config: WorkflowConfig,
     original_model: MetadataModel,
+    validation_cache: ValidationCache | None = None,
 ) -> ResolvedWorkflowStep:
     """Translates a workflow step given a workflow definition and a workflow config
     into a resolved workflow step.
@@ -175,6 +179,7 @@ def resolve_workflow_step(
         transformation_definition=workflow_step.transformation_definition,
         transformation_config=transformation_config,
         original_model=original_model,
+        validation_cache=validation_cache,
     )
     return ResolvedWorkflowStep(
         transformation_handler=transformation_handler,
@@ -187,6 +192,7 @@ def resolve_workflow(
     workflow_definition: WorkflowDefinition,
     original_model: MetadataModel,
     workflow_config: WorkflowConfig,
+    validation_cache: ValidationCache | None = None,
 ) -> ResolvedWorkflow:
     """Translates a workflow definition given an input model and a workflow config into
     a resolved workflow.
@@ -212,6 +218,7 @@ def resolve_workflow(
             workflow_definition=workflow_definition,
             workflow_config=workflow_config,
             original_model=input_model,
+            validation_cache=validation_cache,
         )
 
     return ResolvedWorkflow(
@@ -240,15 +247,18 @@ class WorkflowHandler:
         workflow_definition: WorkflowDefinition,
         workflow_config: WorkflowConfig,
         original_model: MetadataModel,
+        validation_cache: ValidationCache | None = None,
     ):
         """Initialize the WorkflowHandler with a workflow deinition, a matching
         config, and a metadata model. The workflow definition is translated into a
-        resolved workflow.
+        resolved workflow. If a validation cache is provided, it is consulted when
+        validating metadata.
         """
         self._resolved_workflow = resolve_workflow(
             workflow_definition=workflow_definition,
             original_model=original_model,
             workflow_config=workflow_config,
+            validation_cache=validation_cache,
         )
 
         self.artifact_models = get_model_artifacts_from_resolved_workflow(
@@ -22,10 +22,11 @@ from collections.abc import Awaitable, Callable
 from metldata.event_handling.event_handling import (
     FileSystemEventPublisher,
     FileSystemEventSubscriber,
-    get_topic_path,
+    count_events,
 )
 from metldata.event_handling.models import SubmissionEventPayload
 from metldata.model_utils.essentials import MetadataModel
+from metldata.model_utils.validation_cache import get_validation_cache
 from metldata.transform.artifact_publisher import ArtifactEvent, ArtifactEventPublisher
 from metldata.transform.base import WorkflowConfig, WorkflowDefinition
 from metldata.transform.config import TransformationEventHandlingConfig
@@ -40,13 +41,7 @@ def _count_source_events(*, event_config: TransformationEventHandlingConfig) ->
 
     Used only to display progress; returns 0 if the topic does not exist yet.
     """
-    topic_path = get_topic_path(
-        topic=event_config.source_event_topic,
-        event_store_path=event_config.event_store_path,
-    )
-    if not topic_path.exists():
-        return 0
-    return sum(1 for path in topic_path.iterdir() if path.suffix == ".json")
+    return count_events(topic=event_config.source_event_topic, config=event_config)
 
 
 async def run_workflow_on_source_event(
@@ -88,10 +83,12 @@ async def run_workflow_on_all_source_events(
     """Run a subscriber to hand source events to a transformation workflow and
     run a publisher for publishing artifacts.
     """
+    validation_cache = get_validation_cache(config=event_config)
     workflow_handler = WorkflowHandler(
         workflow_definition=workflow_definition,
         workflow_config=workflow_config,
         original_model=original_model,
+        validation_cache=validation_cache,
     )
     event_publisher = FileSystemEventPublisher(config=event_config)
     artifact_publisher = ArtifactEventPublisher(
@@ -124,5 +121,10 @@ async def run_workflow_on_all_source_events(
     event_subscriber = FileSystemEventSubscriber(
         config=event_config, translator=source_event_subscriber
     )
-    await event_subscriber.run()
+    try:
+        await event_subscriber.run()
+    finally:
+        event_publisher.close()
+        if validation_cache is not None:
+            validation_cache.close()
     log.info("Finished transforming %d submission(s).", processed)
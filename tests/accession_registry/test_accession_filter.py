@@ -0,0 +1,113 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Testing the accession filter."""
+
+from pathlib import Path
+
+from metldata.accession_registry.accession_filter import AccessionFilter
+from metldata.accession_registry.accession_store import (
+    AccessionStoreBackend,
+    get_accession_store,
+)
+from metldata.config import SubmissionConfig
+from tests.fixtures.config import config_sub_fixture  # noqa: F401
+
+
+def test_accession_filter_persistence(tmp_path: Path):
+    """Test that a persisted filter has no false negatives and a low false positive
+    rate.
+    """
+    accession_filter = AccessionFilter(capacity=10_000, error_rate=0.01)
+    for index in range(10_000):
+        accession_filter.add(f"GHGAF{index:08}")
+    accession_filter.save(tmp_path / "accessions.filter")
+
+    loaded_filter = AccessionFilter.load(tmp_path / "accessions.filter")
+
+    assert loaded_filter.count == 10_000
+    assert all(f"GHGAF{index:08}" in loaded_filter for index in range(10_000))
+    false_positives = sum(
+        f"GHGAF{index:08}" in loaded_filter for index in range(10_000, 20_000)
+    )
+    assert false_positives < 200
+
+
+def test_sqlite_accession_store_filter(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+    tmp_path: Path,
+):
+    """Test that an SQLite store with filter detects accessions saved by a store
+    without filter by rebuilding the outdated filter.
+    """
+    config = config_sub_fixture.model_copy(
+        update={
+            "accession_store_path": tmp_path / "accessions.db",
+            "accession_store_backend": AccessionStoreBackend.SQLITE,
+            "accession_store_filter": True,
+        }
+    )
+    accession_store = get_accession_store(config=config)
+    accession_store.save_many(accessions=["accession001", "accession002"])
+    accession_store.close()
+
+    unfiltered_store = get_accession_store(
+        config=config.model_copy(update={"accession_store_filter": False})
+    )
+    unfiltered_store.save(accession="accession003")
+    unfiltered_store.close()
+
+    accession_store = get_accession_store(config=config)
+    assert (tmp_path / "accessions.db.filter").exists()
+    assert accession_store.existing(
+        accessions=["accession001", "accession003", "accession004"]
+    ) == {"accession001", "accession003"}
+    assert not accession_store.exists(accession="accession004")
+    accession_store.close()
+
+
+def test_sqlite_accession_store_filter_concurrent(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+    tmp_path: Path,
+):
+    """Test that an SQLite store with filter detects accessions saved concurrently
+    by another store after its filter was loaded and that it refreshes its filter
+    after each such modification.
+    """
+    config = config_sub_fixture.model_copy(
+        update={
+            "accession_store_path": tmp_path / "accessions.db",
+            "accession_store_backend": AccessionStoreBackend.SQLITE,
+            "accession_store_filter": True,
+        }
+    )
+    accession_store = get_accession_store(config=config)
+    other_store = get_accession_store(config=config)
+    accession_store.save(accession="accession001")
+    other_store.save(accession="accession002")
+
+    assert accession_store.exists(accession="accession002")
+    assert accession_store.existing(
+        accessions=["accession001", "accession002", "accession003"]
+    ) == {"accession001", "accession002"}
+    assert not accession_store.exists(accession="accession003")
+    assert AccessionFilter.load(tmp_path / "accessions.db.filter").count == 2
+
+    other_store.save(accession="accession004")
+    assert accession_store.exists(accession="accession004")
+    assert AccessionFilter.load(tmp_path / "accessions.db.filter").count == 3
+
+    accession_store.close()
+    other_store.close()
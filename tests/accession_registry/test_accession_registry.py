@@ -15,8 +15,22 @@
 
 """Testing the accession registry."""
 
-from metldata.accession_registry.accession_registry import AccessionRegistry
-from metldata.accession_registry.accession_store import AccessionStore
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from metldata.accession_registry.accession_registry import (
+    AccessionRegistry,
+    ReservationLog,
+)
+from metldata.accession_registry.accession_store import (
+    AccessionStore,
+    AccessionStoreBackend,
+    get_accession_store,
+)
+from metldata.accession_registry.config import Config
 from metldata.config import SubmissionConfig
 from tests.fixtures.config import config_sub_fixture  # noqa: F401
 
@@ -47,3 +61,177 @@ def test_get_accession_happy(
     # check whether all theses accessions have been stored:
     for accession in accessions:
         assert accession_store.exists(accession=accession)
+
+
+def test_get_accessions_bulk(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+):
+    """Test getting multiple accessions at once."""
+    accession_store = AccessionStore(config=config_sub_fixture)
+    accession_registry = AccessionRegistry(
+        config=config_sub_fixture, accession_store=accession_store
+    )
+    existing_accession = accession_registry.get_accession(resource_type="File")
+
+    accessions = accession_registry.get_accessions(resource_type="File", count=100)
+
+    assert len(set(accessions)) == 100
+    assert existing_accession not in accessions
+    assert all(accession.startswith("GHGAF") for accession in accessions)
+    assert accession_store.existing(accessions=accessions) == set(accessions)
+    assert accession_registry.get_accessions(resource_type="File", count=0) == []
+
+
+def get_accessions_in_process(config_values: dict) -> list[str]:
+    """Get accessions from a registry using a store created in this process."""
+    config = Config(**config_values)
+    accession_store = get_accession_store(config=config)
+    accession_registry = AccessionRegistry(
+        config=config, accession_store=accession_store
+    )
+    accessions = [
+        accession
+        for _ in range(10)
+        for accession in accession_registry.get_accessions(
+            resource_type="File", count=5
+        )
+    ]
+    accession_store.close()
+    return accessions
+
+
+@pytest.mark.parametrize("backend", AccessionStoreBackend)
+def test_get_accessions_concurrently(
+    backend: AccessionStoreBackend,
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+):
+    """Test that registries in multiple processes sharing one store never hand out
+    the same accession, even if collisions are likely.
+    """
+    config = config_sub_fixture.model_copy(
+        update={
+            "suffix_length": 3,
+            "accession_store_path": config_sub_fixture.accession_store_path.with_suffix(
+                f".{backend.value}"
+            ),
+            "accession_store_backend": backend,
+        }
+    )
+    config.accession_store_path.touch()
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(
+            executor.map(
+                get_accessions_in_process,
+                [config.model_dump(include=set(Config.model_fields))] * 4,
+            )
+        )
+    config.accession_store_path.unlink()
+
+    accessions = [accession for result in results for accession in result]
+    assert len(accessions) == len(set(accessions)) == 200
+
+
+def test_accession_pools(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+):
+    """Test that accessions are taken from pre-registered pools and that unused
+    reservations are reclaimed by the next registry.
+    """
+    reservations_path = config_sub_fixture.accession_store_path.with_suffix(
+        ".reservations"
+    )
+    config = config_sub_fixture.model_copy(
+        update={
+            "accession_pool_size": 20,
+            "accession_pool_refill_threshold": 5,
+            "accession_reservations_path": reservations_path,
+        }
+    )
+    accession_store = AccessionStore(config=config)
+    accession_registry = AccessionRegistry(
+        config=config, accession_store=accession_store
+    )
+
+    accessions = accession_registry.get_accessions(resource_type="File", count=10)
+    accession_registry.close()
+    accessions += accession_registry.get_accessions(resource_type="File", count=10)
+    accession_registry.close()
+
+    assert len(set(accessions)) == 20
+    assert accession_store.existing(accessions=accessions) == set(accessions)
+
+    # the pool has been refilled with registered but unused accessions, which are
+    # tracked in the reservation log:
+    reserved = set(ReservationLog(path=reservations_path).unused()["File"])
+    assert len(reserved) == 10
+    assert not reserved & set(accessions)
+    assert accession_store.existing(accessions=reserved) == reserved
+
+    reclaiming_registry = AccessionRegistry(
+        config=config, accession_store=accession_store
+    )
+    next_accessions = reclaiming_registry.get_accessions(
+        resource_type="File", count=len(reserved)
+    )
+    reclaiming_registry.close()
+    reservations_path.unlink()
+
+    assert set(next_accessions) == reserved
+
+
+def test_accession_pool_refill_failure(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+    caplog: pytest.LogCaptureFixture,
+):
+    """Test that a failed refill of a pool is reported when closing the registry or
+    logged and replaced by a new refill.
+    """
+
+    class FailingAccessionStore(AccessionStore):
+        """An accession store that fails once to save accessions in a background
+        thread.
+        """
+
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.failed = threading.Event()
+
+        def save_many(self, *, accessions: list[str]) -> None:
+            if (
+                not self.failed.is_set()
+                and threading.current_thread() is not threading.main_thread()
+            ):
+                self.failed.set()
+                raise OSError("disk full")
+            super().save_many(accessions=accessions)
+
+    config = config_sub_fixture.model_copy(update={"accession_pool_size": 20})
+
+    accession_registry = AccessionRegistry(
+        config=config, accession_store=FailingAccessionStore(config=config)
+    )
+    accession_registry.get_accession(resource_type="File")
+    with pytest.raises(AccessionRegistry.AccessionGenerationError, match="disk full"):
+        accession_registry.close()
+
+    accession_store = FailingAccessionStore(config=config)
+    accession_registry = AccessionRegistry(
+        config=config, accession_store=accession_store
+    )
+    accession_registry.get_accession(resource_type="File")
+    assert accession_store.failed.wait(timeout=10)
+    for _ in range(100):
+        accession_registry.get_accession(resource_type="File")
+        if "Refilling the accession pool" in caplog.text:
+            break
+        time.sleep(0.01)
+    assert "Refilling the accession pool of resource type 'File' failed" in (
+        caplog.text
+    )
+    accession_registry.close()  # the replacing refill succeeded
+
+    # the pools are no longer refilled after closing:
+    accessions = accession_registry.get_accessions(resource_type="File", count=30)
+    assert accession_store.existing(accessions=accessions) == set(accessions)
+    accession_registry.close()
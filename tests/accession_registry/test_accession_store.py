@@ -15,7 +15,16 @@
 
 """Testing the accession handler."""
 
-from metldata.accession_registry.accession_store import AccessionStore
+from pathlib import Path
+
+import pytest
+
+from metldata.accession_registry.accession_store import (
+    AccessionStore,
+    AccessionStoreBackend,
+    get_accession_store,
+    migrate_accession_store,
+)
 from metldata.config import SubmissionConfig
 from tests.fixtures.config import config_sub_fixture  # noqa: F401
 
@@ -45,3 +54,42 @@ def test_accession_store_unkown_accession(
 
     accession_store = AccessionStore(config=config_sub_fixture)
     assert not accession_store.exists(accession=unknown_accession)
+
+
+def test_accession_store_shared_file(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+):
+    """Test that accessions saved by another store using the same file are found."""
+    accession_store = AccessionStore(config=config_sub_fixture)
+    assert not accession_store.exists(accession="accession001")
+
+    AccessionStore(config=config_sub_fixture).save(accession="accession001")
+
+    assert accession_store.exists(accession="accession001")
+
+
+def test_accession_store_sqlite_migration(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+    tmp_path: Path,
+):
+    """Test migrating accessions from a text file to an SQLite store."""
+    AccessionStore(config=config_sub_fixture).save(accession="accession001")
+    sqlite_config = config_sub_fixture.model_copy(
+        update={
+            "accession_store_path": tmp_path / "accessions.db",
+            "accession_store_backend": AccessionStoreBackend.SQLITE,
+        }
+    )
+
+    migrated = migrate_accession_store(
+        text_store_path=config_sub_fixture.accession_store_path, config=sqlite_config
+    )
+    accession_store = get_accession_store(config=sqlite_config)
+
+    assert migrated == 1
+    assert accession_store.exists(accession="accession001")
+    accession_store.save(accession="accession002")
+    assert accession_store.exists(accession="accession002")
+    with pytest.raises(AccessionStore.AccessionAlreadyExistsError):
+        accession_store.save(accession="accession001")
+    accession_store.close()
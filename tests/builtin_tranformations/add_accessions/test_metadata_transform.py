@@ -0,0 +1,157 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Test the metadata_transform module."""
+
+from typing import Any
+
+import pytest
+
+from metldata.builtin_transformations.add_accessions.metadata_transform import (
+    ClassRewritePlan,
+    add_accessions_to_metadata,
+    build_accession_table,
+    compile_rewrite_plans,
+)
+from metldata.model_utils.anchors import AnchorPoint
+from metldata.transform.base import MetadataTransformationError
+
+ANCHOR_POINTS_BY_TARGET = {
+    class_name: AnchorPoint(
+        target_class=class_name, identifier_slot="alias", root_slot=root_slot
+    )
+    for class_name, root_slot in (
+        ("Dataset", "datasets"),
+        ("File", "files"),
+        ("Sample", "samples"),
+    )
+}
+
+# datasets reference multiple files, samples a single file:
+REFERENCES = {"Dataset": {"files": "File"}, "Sample": {"file": "File"}}
+
+METADATA: dict[str, list[dict[str, Any]]] = {
+    "datasets": [{"alias": "dataset_1", "files": ["file_1", "file_2"], "title": "x"}],
+    "files": [{"alias": "file_1", "format": "bam"}, {"alias": "file_2"}],
+    "samples": [{"alias": "sample_1", "file": "file_2"}],
+}
+
+ACCESSION_MAP = {
+    "datasets": {"dataset_1": "GHGAD1"},
+    "files": {"file_1": "GHGAF1", "file_2": "GHGAF2"},
+    "samples": {"sample_1": "GHGAS1"},
+}
+
+
+def test_compile_rewrite_plans():
+    """Test that a plan is compiled for each anchored class, including classes
+    without references.
+    """
+    plans = compile_rewrite_plans(
+        references=REFERENCES, anchor_points_by_target=ANCHOR_POINTS_BY_TARGET
+    )
+
+    assert plans == [
+        ClassRewritePlan(
+            class_name="Dataset",
+            root_slot="datasets",
+            identifier_slot="alias",
+            references={"files": "File"},
+        ),
+        ClassRewritePlan(
+            class_name="File",
+            root_slot="files",
+            identifier_slot="alias",
+            references={},
+        ),
+        ClassRewritePlan(
+            class_name="Sample",
+            root_slot="samples",
+            identifier_slot="alias",
+            references={"file": "File"},
+        ),
+    ]
+
+
+def test_add_accessions_to_metadata():
+    """Test that accessions are added to all resources and that multivalued and
+    single-valued references are replaced by accessions while other slots are kept.
+    """
+    plans = compile_rewrite_plans(
+        references=REFERENCES, anchor_points_by_target=ANCHOR_POINTS_BY_TARGET
+    )
+
+    transformed = add_accessions_to_metadata(
+        metadata=METADATA,
+        accession_slot_name="accession",
+        accession_map=ACCESSION_MAP,
+        rewrite_plans=plans,
+        anchor_points_by_target=ANCHOR_POINTS_BY_TARGET,
+    )
+
+    assert transformed == {
+        "datasets": [
+            {
+                "accession": "GHGAD1",
+                "alias": "dataset_1",
+                "files": ["GHGAF1", "GHGAF2"],
+                "title": "x",
+            }
+        ],
+        "files": [
+            {"accession": "GHGAF1", "alias": "file_1", "format": "bam"},
+            {"accession": "GHGAF2", "alias": "file_2"},
+        ],
+        "samples": [{"accession": "GHGAS1", "alias": "sample_1", "file": "GHGAF2"}],
+    }
+
+
+@pytest.mark.parametrize(
+    "accession_map",
+    [
+        # the accession of a resource itself is missing:
+        {**ACCESSION_MAP, "samples": {}},
+        # the accession of a referenced resource is missing:
+        {**ACCESSION_MAP, "files": {"file_1": "GHGAF1"}},
+        # the accessions of a class are missing:
+        {"datasets": ACCESSION_MAP["datasets"], "files": ACCESSION_MAP["files"]},
+    ],
+)
+def test_add_accessions_missing_accession(accession_map: dict[str, dict[str, str]]):
+    """Test that missing accessions are reported."""
+    plans = compile_rewrite_plans(
+        references=REFERENCES, anchor_points_by_target=ANCHOR_POINTS_BY_TARGET
+    )
+
+    with pytest.raises(MetadataTransformationError):
+        add_accessions_to_metadata(
+            metadata=METADATA,
+            accession_slot_name="accession",
+            accession_map=accession_map,
+            rewrite_plans=plans,
+            anchor_points_by_target=ANCHOR_POINTS_BY_TARGET,
+        )
+
+
+def test_build_accession_table():
+    """Test that the accession table is keyed by class name instead of root slot."""
+    assert build_accession_table(
+        accession_map=ACCESSION_MAP, anchor_points_by_target=ANCHOR_POINTS_BY_TARGET
+    ) == {
+        "Dataset": ACCESSION_MAP["datasets"],
+        "File": ACCESSION_MAP["files"],
+        "Sample": ACCESSION_MAP["samples"],
+    }
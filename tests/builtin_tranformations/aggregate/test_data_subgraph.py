@@ -17,7 +17,10 @@
 """Test the data aggregation and subgraph"""
 
 from metldata.builtin_transformations.aggregate.cached_model import CachedMetadataModel
-from metldata.builtin_transformations.aggregate.data_subgraph import DataSubgraph
+from metldata.builtin_transformations.aggregate.data_subgraph import (
+    DataSubgraph,
+    DataSubgraphIndex,
+)
 
 
 def test_data_subgraph_sample_name(
@@ -37,3 +40,41 @@ def test_data_subgraph_sample_name(
     results = set(data_branch.terminal_nodes(data=dataset))
 
     assert results == {"GHGAS_tissue_sample1", "GHGAS_blood_sample1"}
+
+
+def test_data_subgraph_shared_index(
+    model_resolved_public, data_complete_1_resolved_public
+):
+    """Test that subgraphs sharing an index and common path prefixes yield the same
+    nodes as subgraphs with separate indexes.
+    """
+    model = CachedMetadataModel(model=model_resolved_public)
+    index = DataSubgraphIndex(
+        model=model, submission_data=data_complete_1_resolved_public
+    )
+    subgraph_args = [
+        (["sequencing_experiments.sequencing_processes.sample.name"], ["Sample"]),
+        (["sequencing_experiments.sequencing_processes.sample"], ["Sample"]),
+        (["sequencing_experiments.sequencing_processes.name"], None),
+    ]
+
+    for dataset in data_complete_1_resolved_public["sequencing_protocols"]:
+        for path_strings, visit_once_classes in subgraph_args:
+            expected = DataSubgraph(
+                model=model,
+                submission_data=data_complete_1_resolved_public,
+                origin="SequencingProtocol",
+                path_strings=path_strings,
+                visit_once_classes=visit_once_classes,
+            )
+            observed = DataSubgraph(
+                model=model,
+                submission_data=data_complete_1_resolved_public,
+                origin="SequencingProtocol",
+                path_strings=path_strings,
+                visit_once_classes=visit_once_classes,
+                index=index,
+            )
+            assert list(observed.terminal_nodes(data=dataset)) == list(
+                expected.terminal_nodes(data=dataset)
+            )
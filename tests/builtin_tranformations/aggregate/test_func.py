@@ -0,0 +1,60 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for the aggregation functions."""
+
+import pytest
+
+from metldata.builtin_transformations.aggregate import func
+from metldata.builtin_transformations.aggregate.func import (
+    CountAggregation,
+    IntegerElementCountAggregation,
+    IntegerSumAggregation,
+    StringElementCountAggregation,
+)
+
+VECTORIZED = [
+    False,
+    pytest.param(
+        True,
+        marks=pytest.mark.skipif(
+            not func.NUMPY_AVAILABLE, reason="NumPy is not installed"
+        ),
+    ),
+]
+
+
+@pytest.mark.parametrize("vectorized", VECTORIZED)
+def test_batch_aggregation_functions(vectorized: bool, monkeypatch: pytest.MonkeyPatch):
+    """Test that batch aggregation functions give the same results with and
+    without NumPy, also when consuming a generator.
+    """
+    monkeypatch.setattr(func, "NUMPY_AVAILABLE", vectorized)
+
+    assert CountAggregation.func(value for value in (1, 2, 3)) == 3
+    assert IntegerSumAggregation.func(value for value in (3, 4, 5)) == 12
+    assert IntegerSumAggregation.func_batch([]) == 0
+    assert IntegerSumAggregation.func_batch([2**62, 2**62, 2**70]) == 2**63 + 2**70
+    assert StringElementCountAggregation.func_batch(["b", None, "a", "b"]) == [
+        {"value": "a", "count": 1},
+        {"value": "b", "count": 2},
+        {"value": "unknown", "count": 1},
+    ]
+    assert IntegerElementCountAggregation.func_batch([10, None, 2, 10]) == [
+        {"value": 2, "count": 1},
+        {"value": 10, "count": 2},
+    ]
+    assert StringElementCountAggregation.func_batch([]) == []
@@ -0,0 +1,83 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for the metadata transformation of the aggregate transformation."""
+
+import pytest
+
+from metldata.builtin_transformations.aggregate.config import AggregationOperation
+from metldata.builtin_transformations.aggregate.metadata_transform import (
+    AggregationOperationError,
+    apply_operations,
+    group_operations,
+)
+
+
+def test_operations_grouped_and_applied():
+    """Test that operations with the same input paths are grouped and that all
+    functions of a group share a single pass over the values.
+    """
+    count, formats, names = (
+        AggregationOperation.model_validate(
+            {
+                "input_paths": input_paths,
+                "output_path": output_path,
+                "visit_only_once": visit_only_once,
+                "function": function,
+            }
+        )
+        for input_paths, output_path, visit_only_once, function in (
+            (["files.format"], "file_count", ["File"], "Count"),
+            (["files.format"], "formats", ["File"], "StringElementCount"),
+            (["files.format"], "format_list", None, "StringListCopy"),
+        )
+    )
+    assert group_operations([count, names, formats]) == [[count, formats], [names]]
+
+    consumed = []
+
+    def values():
+        for value in ("bam", "fastq", "bam"):
+            consumed.append(value)
+            yield value
+
+    assert apply_operations(operations=[count, formats, names], values=values()) == [
+        3,
+        [{"value": "bam", "count": 2}, {"value": "fastq", "count": 1}],
+        ["bam", "fastq", "bam"],
+    ]
+    assert consumed == ["bam", "fastq", "bam"]
+
+
+def test_failed_operation_reported():
+    """Test that the operation whose function failed is reported."""
+    count, single_format = (
+        AggregationOperation.model_validate(
+            {
+                "input_paths": ["files.format"],
+                "output_path": output_path,
+                "function": function,
+            }
+        )
+        for output_path, function in (
+            ("file_count", "Count"),
+            ("format", "StringCopy"),
+        )
+    )
+
+    with pytest.raises(AggregationOperationError) as error_info:
+        apply_operations(operations=[count, single_format], values=["bam", "fastq"])
+    assert error_info.value.operation is single_format
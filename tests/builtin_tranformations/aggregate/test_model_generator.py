@@ -17,11 +17,13 @@
 
 """Test the model generation"""
 
-from pytest import raises
+from pytest import mark, raises
 
 from metldata.builtin_transformations.aggregate.model_transform import (
+    PathMatrix,
     build_aggregation_model,
 )
+from metldata.builtin_transformations.aggregate.models import MinimalSlot
 from metldata.transform.base import MetadataModelTransformationError
 
 
@@ -40,3 +42,18 @@ def test_invalid_config(empty_model, invalid_config):
     """
     with raises(MetadataModelTransformationError):
         build_aggregation_model(model=empty_model, config=invalid_config)
+
+
+@mark.parametrize(
+    "path_strings",
+    [["a.b", "c", "a.b"], ["a.b.c", "d", "a.b"], ["a", "d.e", "a.b.c"]],
+)
+def test_conflicting_output_paths(path_strings: list[str]):
+    """Test that identical output paths and output paths that are prefixes of other
+    output paths are detected regardless of their order.
+    """
+    leaf_slot = MinimalSlot(range="integer", multivalued=False)
+    with raises(MetadataModelTransformationError):
+        PathMatrix(
+            path_strings=path_strings, leaf_slots=[leaf_slot] * len(path_strings)
+        )
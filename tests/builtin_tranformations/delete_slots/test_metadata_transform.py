@@ -0,0 +1,55 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Test the metadata_transform module."""
+
+from copy import deepcopy
+
+from metldata.builtin_transformations.delete_slots.metadata_transform import (
+    delete_class_slots,
+)
+from metldata.model_utils.anchors import AnchorPoint
+
+ANCHOR_POINTS_BY_TARGET = {
+    class_name: AnchorPoint(
+        target_class=class_name, identifier_slot="alias", root_slot=root_slot
+    )
+    for class_name, root_slot in (("File", "files"), ("Sample", "samples"))
+}
+
+
+def test_delete_class_slots():
+    """Test that slots are deleted without modifying the provided metadata and that
+    the resources of untouched classes are shared instead of copied.
+    """
+    metadata = {
+        "files": [{"alias": "file_1", "format": "bam", "size": 1}],
+        "samples": [{"alias": "sample_1", "files": ["file_1"]}],
+    }
+    original_metadata = deepcopy(metadata)
+
+    transformed = delete_class_slots(
+        metadata=metadata,
+        slots_to_delete={"File": ["format", "size"]},
+        anchor_points_by_target=ANCHOR_POINTS_BY_TARGET,
+    )
+
+    assert transformed == {
+        "files": [{"alias": "file_1"}],
+        "samples": [{"alias": "sample_1", "files": ["file_1"]}],
+    }
+    assert metadata == original_metadata
+    assert transformed["samples"] is metadata["samples"]
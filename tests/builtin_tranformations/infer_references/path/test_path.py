@@ -150,3 +150,14 @@ def test_reference_path_pydantic(path_str: str, is_valid: bool):
     if is_valid:
         expected_path = ReferencePath(path_str=path_str)
         assert observed_path == expected_path
+
+
+def test_reference_path_cached():
+    """Test that equivalent path strings are only parsed once."""
+    path_a = ReferencePath(path_str="class_a(class_b)>class_b<(class_b)class_c")
+    path_b = ReferencePath(path_str="class_a (class_b)> class_b <(class_b) class_c")
+
+    assert path_a == path_b
+    assert hash(path_a) == hash(path_b)
+    for element_a, element_b in zip(path_a.elements, path_b.elements, strict=True):
+        assert element_a is element_b
@@ -0,0 +1,186 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Test the resolution of reference paths for existing metadata."""
+
+from collections.abc import Callable
+from contextlib import nullcontext
+from typing import Any
+
+import pytest
+
+from metldata.builtin_transformations.infer_references.path.path import ReferencePath
+from metldata.builtin_transformations.infer_references.path.plan import (
+    compile_resolution_plan,
+)
+from metldata.builtin_transformations.infer_references.path.resolve import (
+    PathElementResolutionError,
+    resolve_reference_for_metadata,
+    resolve_reference_for_metadata_resource,
+)
+from metldata.model_utils.anchors import AnchorPoint
+
+ANCHOR_POINTS_BY_TARGET = {
+    class_name: AnchorPoint(
+        target_class=class_name, identifier_slot="alias", root_slot=root_slot
+    )
+    for class_name, root_slot in [
+        ("Dataset", "datasets"),
+        ("File", "files"),
+        ("Sample", "samples"),
+        ("Experiment", "experiments"),
+    ]
+}
+
+METADATA: dict[str, list[dict[str, Any]]] = {
+    "datasets": [
+        {"alias": "dataset_1", "files": ["file_1", "file_2", "file_3"]},
+        {"alias": "dataset_2", "files": ["file_3"]},
+        {"alias": "dataset_3", "files": []},
+    ],
+    "files": [{"alias": "file_1"}, {"alias": "file_2"}, {"alias": "file_3"}],
+    "samples": [
+        {"alias": "sample_1", "files": ["file_1"]},
+        {"alias": "sample_2", "files": ["file_2", "file_3"]},
+    ],
+    "experiments": [
+        {"alias": "experiment_1", "samples": ["sample_1", "sample_2"]},
+        {"alias": "experiment_2", "samples": ["sample_2"]},
+    ],
+}
+
+
+def resolve_reference_for_metadata_sparse(**kwargs) -> dict[str, list[str]]:
+    """Resolve using the sparse-matrix backend. Skips the test if the optional
+    dependencies of the backend are not installed.
+    """
+    pytest.importorskip("numpy")
+    pytest.importorskip("scipy")
+    from metldata.builtin_transformations.infer_references.path import (  # noqa: PLC0415
+        resolve_sparse,
+    )
+
+    return resolve_sparse.resolve_reference_for_metadata_sparse(**kwargs)
+
+
+ENGINES = [resolve_reference_for_metadata, resolve_reference_for_metadata_sparse]
+
+
+@pytest.mark.parametrize("resolve", ENGINES)
+@pytest.mark.parametrize(
+    "path_str, expected_target_ids",
+    [
+        (
+            "Dataset(files)>File",
+            {
+                "dataset_1": ["file_1", "file_2", "file_3"],
+                "dataset_2": ["file_3"],
+                "dataset_3": [],
+            },
+        ),
+        (
+            "Dataset(files)>File<(files)Sample<(samples)Experiment",
+            {
+                "dataset_1": ["experiment_1", "experiment_2"],
+                "dataset_2": ["experiment_1", "experiment_2"],
+                "dataset_3": [],
+            },
+        ),
+    ],
+)
+def test_resolve_reference_for_metadata(
+    path_str: str,
+    expected_target_ids: dict[str, list[str]],
+    resolve: Callable[..., dict[str, list[str]]],
+):
+    """Test resolving a reference for all source resources at once and make sure
+    that the result is consistent with resolving it resource by resource.
+    """
+    plan = compile_resolution_plan(
+        reference_path=ReferencePath(path_str=path_str),
+        anchor_points_by_target=ANCHOR_POINTS_BY_TARGET,
+    )
+
+    observed_target_ids = resolve(global_metadata=METADATA, plan=plan)
+    assert observed_target_ids == expected_target_ids
+
+    for resource in METADATA["datasets"]:
+        target_resources = resolve_reference_for_metadata_resource(
+            resource=resource,
+            global_metadata=METADATA,
+            plan=plan,
+        )
+        assert (
+            sorted({target["alias"] for target in target_resources})
+            == (observed_target_ids[resource["alias"]])
+        )
+
+
+@pytest.mark.parametrize("resolve", ENGINES)
+def test_resolve_reference_for_metadata_missing_target(
+    resolve: Callable[..., dict[str, list[str]]],
+):
+    """Test that a reference to a non-existing resource cannot be resolved."""
+    metadata = {**METADATA, "files": [{"alias": "file_1"}]}
+    plan = compile_resolution_plan(
+        reference_path=ReferencePath(path_str="Dataset(files)>File"),
+        anchor_points_by_target=ANCHOR_POINTS_BY_TARGET,
+    )
+
+    with pytest.raises(PathElementResolutionError):
+        resolve(global_metadata=metadata, plan=plan)
+
+
+@pytest.mark.parametrize("resolve", ENGINES)
+@pytest.mark.parametrize(
+    "dangling_file_alias, expected_target_ids",
+    [("file_2", {"dataset_1": ["sample_1"]}), ("file_1", None)],
+)
+def test_resolve_reference_for_metadata_dangling_intermediate(
+    dangling_file_alias: str,
+    expected_target_ids: dict[str, list[str]] | None,
+    resolve: Callable[..., dict[str, list[str]]],
+):
+    """Test that a dangling reference of an intermediate resource of a multi-hop path
+    only fails the resolution if the resource is reachable, consistently across
+    engines.
+    """
+    metadata = {
+        "datasets": [{"alias": "dataset_1", "files": ["file_1"]}],
+        "files": [
+            {
+                "alias": alias,
+                "samples": ["sample_1", "sample_0"]
+                if alias == dangling_file_alias
+                else ["sample_1"],
+            }
+            for alias in ("file_1", "file_2")
+        ],
+        "samples": [{"alias": "sample_1"}],
+    }
+    plan = compile_resolution_plan(
+        reference_path=ReferencePath(path_str="Dataset(files)>File(samples)>Sample"),
+        anchor_points_by_target=ANCHOR_POINTS_BY_TARGET,
+    )
+
+    with (
+        nullcontext()
+        if expected_target_ids is not None
+        else pytest.raises(PathElementResolutionError)
+    ):
+        observed_target_ids = resolve(global_metadata=metadata, plan=plan)
+        assert observed_target_ids == expected_target_ids
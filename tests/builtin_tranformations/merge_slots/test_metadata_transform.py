@@ -0,0 +1,137 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Test the metadata_transform module."""
+
+from copy import deepcopy
+from typing import Any
+
+import pytest
+
+from metldata.builtin_transformations.merge_slots.metadata_transform import (
+    apply_merge_instructions_to_metadata,
+    compile_merge_instructions,
+)
+from metldata.builtin_transformations.merge_slots.models import SlotMergeInstruction
+from metldata.model_utils.anchors import AnchorPoint
+from metldata.transform.base import MetadataTransformationError
+
+ANCHOR_POINTS_BY_TARGET = {
+    class_name: AnchorPoint(
+        target_class=class_name, identifier_slot="alias", root_slot=root_slot
+    )
+    for class_name, root_slot in (("File", "files"), ("Sample", "samples"))
+}
+
+
+def test_apply_merge_instructions_to_metadata():
+    """Test that all merge instructions of a class are applied in one pass without
+    modifying the provided metadata.
+    """
+    merges_by_class = compile_merge_instructions(
+        [
+            SlotMergeInstruction(
+                class_name="File",
+                source_slots=["a", "b"],
+                target_slot="ab",
+                target_description=None,
+            ),
+            SlotMergeInstruction(
+                class_name="File",
+                source_slots=["b", "c"],
+                target_slot="bc",
+                target_description=None,
+            ),
+        ]
+    )
+    metadata: dict[str, Any] = {
+        "files": [{"alias": "file_1", "a": ["x", "y"], "b": "y", "c": ["z", "y"]}],
+        "samples": [{"alias": "sample_1"}],
+    }
+    original_metadata = deepcopy(metadata)
+
+    transformed = apply_merge_instructions_to_metadata(
+        metadata=metadata,
+        merges_by_class=merges_by_class,
+        anchor_points_by_target=ANCHOR_POINTS_BY_TARGET,
+    )
+
+    assert list(merges_by_class) == ["File"]
+    assert transformed == {
+        "files": [
+            {
+                **original_metadata["files"][0],
+                "ab": ["x", "y"],
+                "bc": ["y", "z"],
+            }
+        ],
+        "samples": [{"alias": "sample_1"}],
+    }
+    assert metadata == original_metadata
+
+
+def test_apply_merge_instructions_sequentially():
+    """Test that merge instructions of a class are applied one after the other, so
+    that target slots of earlier instructions can be merged again but not
+    overwritten.
+    """
+    merges_by_class = compile_merge_instructions(
+        [
+            SlotMergeInstruction(
+                class_name="File",
+                source_slots=["a", "b"],
+                target_slot="ab",
+                target_description=None,
+            ),
+            SlotMergeInstruction(
+                class_name="File",
+                source_slots=["ab", "c"],
+                target_slot="abc",
+                target_description=None,
+            ),
+        ]
+    )
+    metadata = {"files": [{"alias": "file_1", "a": "x", "b": "y", "c": "z"}]}
+
+    transformed = apply_merge_instructions_to_metadata(
+        metadata=metadata,
+        merges_by_class=merges_by_class,
+        anchor_points_by_target=ANCHOR_POINTS_BY_TARGET,
+    )
+    assert transformed["files"][0]["abc"] == ["x", "y", "z"]
+
+    duplicate_merges_by_class = compile_merge_instructions(
+        [
+            SlotMergeInstruction(
+                class_name="File",
+                source_slots=["a", "b"],
+                target_slot="ab",
+                target_description=None,
+            ),
+            SlotMergeInstruction(
+                class_name="File",
+                source_slots=["b", "c"],
+                target_slot="ab",
+                target_description=None,
+            ),
+        ]
+    )
+    with pytest.raises(MetadataTransformationError, match="already exists"):
+        apply_merge_instructions_to_metadata(
+            metadata=metadata,
+            merges_by_class=duplicate_merges_by_class,
+            anchor_points_by_target=ANCHOR_POINTS_BY_TARGET,
+        )
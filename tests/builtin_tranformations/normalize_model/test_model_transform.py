@@ -0,0 +1,89 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Test the model_transform module."""
+
+from copy import deepcopy
+
+import pytest
+
+from metldata.builtin_transformations.normalize_model import model_transform
+from metldata.builtin_transformations.normalize_model.model_transform import (
+    ClassSlotInducer,
+    NormalizedModelCache,
+    normalize_model,
+)
+from metldata.model_utils.essentials import MetadataModel
+from tests.fixtures.utils import BASE_DIR
+
+ORIGINAL_MODEL_PATH = (
+    BASE_DIR / "transformations" / "normalize" / "default" / "original_model.yaml"
+)
+
+
+@pytest.mark.parametrize("inherited_metaslots_available", [True, False])
+def test_class_slot_inducer(
+    inherited_metaslots_available: bool, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that the inducer yields the same slots as the schema view, also if the
+    inherited metaslots are not available, without modifying the schema.
+    """
+    if not inherited_metaslots_available:
+        monkeypatch.setattr(model_transform, "_INHERITED_METASLOTS", None)
+
+    model = MetadataModel.init_from_path(ORIGINAL_MODEL_PATH)
+    # the schema view fills in some derived information when first listing elements:
+    model.schema_view.all_elements()
+    original_model = deepcopy(model)
+    inducer = ClassSlotInducer(model.schema_view)
+    schema_view = MetadataModel.init_from_path(ORIGINAL_MODEL_PATH).schema_view
+
+    for class_name in schema_view.all_classes():
+        assert inducer.induce_class_slots(class_name) == (
+            schema_view.class_induced_slots(class_name)
+        )
+    assert model == original_model
+
+
+def test_normalize_model_memoized():
+    """Test that normalizing the same model repeatedly yields equal but independent
+    models.
+    """
+    model = MetadataModel.init_from_path(ORIGINAL_MODEL_PATH)
+
+    normalized_model = normalize_model(model)
+    normalized_model_again = normalize_model(
+        MetadataModel.init_from_path(ORIGINAL_MODEL_PATH)
+    )
+
+    assert normalized_model == normalized_model_again
+    assert normalized_model is not normalized_model_again
+    assert normalized_model.classes is not normalized_model_again.classes
+
+
+def test_normalized_model_cache():
+    """Test that the cache evicts the least recently used model."""
+    model = MetadataModel.init_from_path(ORIGINAL_MODEL_PATH)
+    cache = NormalizedModelCache(maxsize=2)
+    cache.put("first", model)
+    cache.put("second", model)
+    assert cache.get("first") is model
+
+    cache.put("third", model)
+
+    assert cache.get("second") is None
+    assert cache.get("first") is model
+    assert cache.get("third") is model
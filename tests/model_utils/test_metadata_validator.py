@@ -15,12 +15,19 @@
 
 """Testing the metadata validator."""
 
+import sqlite3
 from contextlib import nullcontext
+from pathlib import Path
 from typing import Any
 
 import pytest
 
+from metldata.model_utils import metadata_validator
 from metldata.model_utils.metadata_validator import MetadataValidator
+from metldata.model_utils.validation_cache import (
+    ValidationCache,
+    ValidationCacheConfig,
+)
 from tests.fixtures.metadata import (
     INVALID_MINIMAL_METADATA_EXAMPLES,
     VALID_MINIMAL_METADATA_EXAMPLES,
@@ -44,3 +51,70 @@ def test_validate_against_model(metadata: dict[str, Any], is_valid: bool):
         nullcontext() if is_valid else pytest.raises(MetadataValidator.ValidationError)
     ):
         validator.validate(metadata)
+
+
+def test_validation_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test that cached validation results are used instead of validating again and
+    that the size of the cache is bounded.
+    """
+    config = ValidationCacheConfig(
+        validation_cache_path=tmp_path / "validation_cache.sqlite",
+        validation_cache_size=2,
+    )
+    valid_metadata = VALID_MINIMAL_METADATA_EXAMPLES[0]
+    invalid_metadata = INVALID_MINIMAL_METADATA_EXAMPLES[0]
+
+    validator = MetadataValidator(
+        model=VALID_MINIMAL_METADATA_MODEL, cache=ValidationCache(config=config)
+    )
+    validator.validate(valid_metadata)
+    with pytest.raises(MetadataValidator.ValidationError) as error:
+        validator.validate(invalid_metadata)
+    expected_issues = error.value.issues
+
+    # a new validator using the persisted cache does not need to validate:
+    def fail_validation(*args, **kwargs):
+        raise AssertionError("Validation was not skipped.")
+
+    monkeypatch.setattr(metadata_validator, "check_metadata", fail_validation)
+    cache = ValidationCache(config=config)
+    validator = MetadataValidator(model=VALID_MINIMAL_METADATA_MODEL, cache=cache)
+    validator.validate(valid_metadata)
+    with pytest.raises(MetadataValidator.ValidationError) as error:
+        validator.validate(invalid_metadata)
+    assert error.value.issues == expected_issues
+
+    # the least recently used result is removed when exceeding the size:
+    cache.store(model_fingerprint="other", metadata_digest="other", issues=[])
+    with pytest.raises(AssertionError):
+        validator.validate(valid_metadata)
+
+
+@pytest.mark.parametrize("refresh_interval, is_refreshed", [(3600, False), (0, True)])
+def test_validation_cache_refresh_interval(
+    tmp_path: Path, refresh_interval: float, is_refreshed: bool
+):
+    """Test that the last use of a cached result is only recorded on lookup if it is
+    older than the refresh interval.
+    """
+    cache_path = tmp_path / "validation_cache.sqlite"
+    config = ValidationCacheConfig(
+        validation_cache_path=cache_path,
+        validation_cache_refresh_interval=refresh_interval,
+    )
+
+    def get_last_used() -> int:
+        connection = sqlite3.connect(cache_path)
+        last_used = connection.execute(
+            "SELECT last_used FROM validation_results"
+        ).fetchone()[0]
+        connection.close()
+        return last_used
+
+    cache = ValidationCache(config=config)
+    cache.store(model_fingerprint="model", metadata_digest="metadata", issues=[])
+    last_used = get_last_used()
+
+    assert cache.lookup(model_fingerprint="model", metadata_digest="metadata") == []
+    assert (get_last_used() > last_used) == is_refreshed
+    cache.close()
@@ -0,0 +1,104 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Testing the computation of deltas between versions of submission content."""
+
+import pytest
+
+from metldata.custom_types import SubmissionContent
+from metldata.submission_registry.content_deltas import (
+    apply_content_delta,
+    diff_content,
+)
+
+OLD_CONTENT: SubmissionContent = {
+    "files": [
+        {"alias": "file1", "size": 1, "format": "bam"},
+        {"alias": "file2", "size": 2, "format": "bam"},
+        {"alias": "file3", "size": 3},
+    ],
+    "samples": [{"alias": "sample1"}],
+    "studies": [{"alias": "study1"}],
+}
+
+
+@pytest.mark.parametrize(
+    "new_content",
+    [
+        # unchanged:
+        OLD_CONTENT,
+        # slots replaced, added, and removed:
+        {
+            **OLD_CONTENT,
+            "files": [
+                {"alias": "file1", "size": 10, "format": "bam"},
+                {"alias": "file2", "size": 2},
+                {"alias": "file3", "size": 3, "format/type": "cram"},
+            ],
+        },
+        # resources removed, added, and reordered:
+        {
+            **OLD_CONTENT,
+            "files": [
+                {"alias": "file4", "size": 4},
+                {"alias": "file3", "size": 3},
+                {"alias": "file1", "size": 1, "format": "bam"},
+            ],
+        },
+        # top-level keys removed and added:
+        {
+            "files": OLD_CONTENT["files"],
+            "datasets": [{"alias": "dataset1"}],
+        },
+        # identifiers not unique, thus resources identified by position:
+        {
+            **OLD_CONTENT,
+            "samples": [{"alias": "sample1"}, {"alias": "sample1", "new": True}],
+        },
+    ],
+)
+def test_diff_and_apply(new_content: SubmissionContent):
+    """Test that applying the delta between two contents to the old content
+    reconstructs the new content.
+    """
+    identifier_slots = {"files": "alias", "samples": "alias"}
+
+    delta = diff_content(OLD_CONTENT, new_content, identifier_slots=identifier_slots)
+
+    assert apply_content_delta(OLD_CONTENT, delta) == new_content
+    assert (delta == {}) == (new_content == OLD_CONTENT)
+
+
+def test_delta_proportional_to_change():
+    """Test that a delta only contains the changed slots of changed resources."""
+    old_content: SubmissionContent = {
+        "files": [{"alias": f"file{number}", "size": number} for number in range(1000)]
+    }
+    new_content: SubmissionContent = {
+        "files": [resource.copy() for resource in old_content["files"]]
+    }
+    new_content["files"][500]["size"] = -1
+
+    delta = diff_content(old_content, new_content, identifier_slots={"files": "alias"})
+
+    assert delta == {
+        "files": {
+            "key_slot": "alias",
+            "removed": [],
+            "patched": {"file500": [{"op": "replace", "path": "/size", "value": -1}]},
+            "added": {},
+        }
+    }
@@ -17,13 +17,17 @@
 
 import json
 
+import pytest
 from ghga_service_commons.utils.utc_dates import now_as_utc
 
 from metldata.config import SubmissionConfig
 from metldata.event_handling.event_handling import FileSystemEventPublisher
 from metldata.event_handling.models import SubmissionAnnotation, SubmissionEventPayload
 from metldata.submission_registry import models
-from metldata.submission_registry.event_publisher import SourceEventPublisher
+from metldata.submission_registry.event_publisher import (
+    AsyncSourceEventPublisher,
+    SourceEventPublisher,
+)
 from tests.fixtures.config import config_sub_fixture  # noqa: F401
 from tests.fixtures.event_handling import (
     Event,
@@ -96,3 +100,61 @@ def test_happy(
         source_event_type=config_sub_fixture.source_event_type,
         file_system_event_fixture=file_system_event_fixture,
     )
+
+
+def test_publish_submissions(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+    file_system_event_fixture: FileSystemEventFixture,  # noqa: F811
+):
+    """Test publishing multiple submissions at once."""
+    provider = FileSystemEventPublisher(config=file_system_event_fixture.config)
+    event_publisher = SourceEventPublisher(config=config_sub_fixture, provider=provider)
+
+    submissions = [
+        models.Submission(
+            id=f"submission{number:03}",
+            title="test",
+            description="test",
+            content={"test_class": [{"alias": f"test_alias{number}"}]},
+            accession_map={
+                "test_class": {f"test_alias{number}": f"test_accession{number}"}
+            },
+        )
+        for number in range(10)
+    ]
+    assert event_publisher.publish_submissions(submissions) == 10
+    event_publisher.close()
+
+    check_source_events(
+        expected_submissions=submissions,
+        source_event_topic=config_sub_fixture.source_event_topic,
+        source_event_type=config_sub_fixture.source_event_type,
+        file_system_event_fixture=file_system_event_fixture,
+    )
+
+
+@pytest.mark.asyncio
+async def test_publish_from_async_code(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+    file_system_event_fixture: FileSystemEventFixture,  # noqa: F811
+):
+    """Test publishing a submission from within a running event loop."""
+    provider = FileSystemEventPublisher(config=file_system_event_fixture.config)
+    event_publisher = AsyncSourceEventPublisher(
+        config=config_sub_fixture, provider=provider
+    )
+
+    submission = models.Submission(
+        id="submission001",
+        title="test",
+        description="test",
+        content={"test_class": [{"alias": "test_alias1"}]},
+    )
+    await event_publisher.publish_submission(submission)
+
+    check_source_events(
+        expected_submissions=[submission],
+        source_event_topic=config_sub_fixture.source_event_topic,
+        source_event_type=config_sub_fixture.source_event_type,
+        file_system_event_fixture=file_system_event_fixture,
+    )
@@ -26,12 +26,15 @@ class FakeAccessionRegistry:
         """Initialize with counter to generate predictable accessions."""
         self._counter = 1
 
-    def get_accession(self, *, resource_type: str) -> str:
-        """Generates and registers a new accession for a resource of the specified type."""
-        accession = f"generated_{resource_type.lower()}_accession{self._counter}"
-        self._counter += 1
+    def get_accessions(self, *, resource_type: str, count: int) -> list[str]:
+        """Generates and registers new accessions for resources of the specified type."""
+        accessions = [
+            f"generated_{resource_type.lower()}_accession{self._counter + offset}"
+            for offset in range(count)
+        ]
+        self._counter += count
 
-        return accession
+        return accessions
 
 
 def test_generate_accession_map():
@@ -16,6 +16,10 @@
 
 """Test the submission registry."""
 
+import json
+import sqlite3
+from pathlib import Path
+
 import pytest
 
 from metldata.accession_registry.accession_registry import AccessionRegistry
@@ -159,6 +163,37 @@ def test_failed_content_validation(
     assert observed_submission_original == observed_submission_updated
 
 
+def test_close_validation_cache(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+    file_system_event_fixture: FileSystemEventFixture,  # noqa: F811
+    tmp_path: Path,
+):
+    """Test that the validation cache opened by the registry is closed on exit."""
+    config = config_sub_fixture.model_copy(
+        update={"validation_cache_path": tmp_path / "validation_cache.sqlite"}
+    )
+    provider = FileSystemEventPublisher(config=file_system_event_fixture.config)
+    accession_store = AccessionStore(config=config)
+    with SubmissionRegistry(
+        config=config,
+        submission_store=SubmissionStore(config=config),
+        event_publisher=SourceEventPublisher(config=config, provider=provider),
+        accession_registry=AccessionRegistry(
+            config=config, accession_store=accession_store
+        ),
+    ) as submission_registry:
+        submission_header = models.SubmissionHeader(title="test", description="test")
+        submission_id = submission_registry.init_submission(header=submission_header)
+        submission_registry.upsert_submission_content(
+            submission_id=submission_id, content=VALID_MINIMAL_METADATA_EXAMPLES[0]
+        )
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        submission_registry.upsert_submission_content(
+            submission_id=submission_id, content=VALID_MINIMAL_METADATA_EXAMPLES[0]
+        )
+
+
 def test_update_after_completion(
     config_sub_fixture: SubmissionConfig,  # noqa: F811
     file_system_event_fixture: FileSystemEventFixture,  # noqa: F811
@@ -205,3 +240,79 @@ def test_update_after_completion(
     # check that the submission content did not change:
     observed_submission = submission_store.get_by_id(submission_id)
     assert observed_submission.content == submission_content
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_import_submissions(
+    max_workers: int,
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+    file_system_event_fixture: FileSystemEventFixture,  # noqa: F811
+    tmp_path: Path,
+):
+    """Test importing a directory of submissions in bulk."""
+    # inject dependencies:
+    submission_store = SubmissionStore(config=config_sub_fixture)
+    provider = FileSystemEventPublisher(config=file_system_event_fixture.config)
+    event_publisher = SourceEventPublisher(config=config_sub_fixture, provider=provider)
+    accession_store = AccessionStore(config=config_sub_fixture)
+    accession_registry = AccessionRegistry(
+        config=config_sub_fixture, accession_store=accession_store
+    )
+    submission_registry = SubmissionRegistry(
+        config=config_sub_fixture,
+        submission_store=submission_store,
+        event_publisher=event_publisher,
+        accession_registry=accession_registry,
+    )
+
+    # prepare submission files:
+    submission_dir = tmp_path / "submissions"
+    submission_dir.mkdir()
+    contents = VALID_MINIMAL_METADATA_EXAMPLES * 3
+    for number, content in enumerate(contents):
+        (submission_dir / f"valid{number}.json").write_text(
+            json.dumps({"title": f"test{number}", "content": content})
+        )
+    (submission_dir / "invalid.json").write_text(
+        json.dumps(
+            {"title": "invalid", "content": INVALID_MINIMAL_METADATA_EXAMPLES[0]}
+        )
+    )
+    (submission_dir / "malformed.json").write_text("{")
+    (submission_dir / "array.json").write_text("[]")
+
+    report = submission_registry.import_submissions(
+        submission_dir=submission_dir,
+        complete=True,
+        batch_size=2,
+        max_workers=max_workers,
+    )
+
+    assert sorted(report.failures) == ["array.json", "invalid.json", "malformed.json"]
+    assert len(report.imported) == len(contents)
+    assert report.submissions_per_second > 0
+
+    observed_submissions = []
+    all_accessions: list[str] = []
+    for number, content in enumerate(contents):
+        submission = submission_store.get_by_id(report.imported[f"valid{number}.json"])
+        assert submission.title == f"test{number}"
+        assert submission.content == content
+        assert submission.current_status == models.SubmissionStatus.COMPLETED
+        all_accessions.extend(
+            accession
+            for accessions in submission.accession_map.values()
+            for accession in accessions.values()
+        )
+        observed_submissions.append(submission)
+
+    # accessions are unique across submissions and registered:
+    assert len(all_accessions) == len(set(all_accessions))
+    assert accession_store.existing(accessions=all_accessions) == set(all_accessions)
+
+    check_source_events(
+        expected_submissions=observed_submissions,
+        source_event_topic=config_sub_fixture.source_event_topic,
+        source_event_type=config_sub_fixture.source_event_type,
+        file_system_event_fixture=file_system_event_fixture,
+    )
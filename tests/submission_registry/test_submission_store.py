@@ -15,16 +15,30 @@
 
 """Testing the submission store."""
 
+import json
+import sqlite3
+
 import pytest
 from ghga_service_commons.utils.utc_dates import now_as_utc
 
+from metldata import compression
+from metldata.compression import StorageCompression
 from metldata.config import SubmissionConfig
 from metldata.submission_registry.models import (
     StatusChange,
     Submission,
     SubmissionStatus,
 )
-from metldata.submission_registry.submission_store import SubmissionStore
+from metldata.submission_registry.submission_store import (
+    SUBMISSION_INDEX_FILENAME,
+    IndexedSubmissionStore,
+    SubmissionStore,
+    SubmissionStoreBackend,
+    get_content_digest,
+    get_submission_store,
+    get_submission_summary,
+    migrate_submission_store,
+)
 from tests.fixtures.config import config_sub_fixture  # noqa: F401
 
 EXAMPLE_SUBMISSION = Submission(
@@ -91,3 +105,246 @@ def test_query_non_existing(
 
     with pytest.raises(SubmissionStore.SubmissionDoesNotExistError):
         _ = submission_store.get_by_id(submission_id="non-exisitng-id")
+
+
+def test_interrupted_record_update(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that an interrupted update of a record keeps the previous record."""
+    submission_store = SubmissionStore(config=config_sub_fixture)
+    submission_store.insert_new(submission=EXAMPLE_SUBMISSION)
+
+    def interrupted_dump(value, file, **kwargs):
+        file.write("{")
+        raise KeyboardInterrupt()
+
+    monkeypatch.setattr(compression.json, "dump", interrupted_dump)
+    with pytest.raises(KeyboardInterrupt):
+        submission_store.update_record(
+            record=EXAMPLE_SUBMISSION.model_copy(update={"title": "updated"})
+        )
+    monkeypatch.undo()
+
+    assert submission_store.get_by_id(EXAMPLE_SUBMISSION.id) == EXAMPLE_SUBMISSION
+    assert not list(config_sub_fixture.submission_store_dir.glob("*.tmp"))
+
+
+def test_indexed_store(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+):
+    """Test that the indexed store lists and filters submissions using its index and
+    that existing submissions are migrated into the index.
+    """
+    # submissions saved without index:
+    SubmissionStore(config=config_sub_fixture).insert_new(submission=EXAMPLE_SUBMISSION)
+
+    config = config_sub_fixture.model_copy(
+        update={"submission_store_backend": SubmissionStoreBackend.INDEXED}
+    )
+    submission_store = get_submission_store(config=config)
+    assert isinstance(submission_store, IndexedSubmissionStore)
+    pending_submission = Submission(
+        id="testsubmission002", title="pending", description="pending", content=None
+    )
+    submission_store.insert_new(submission=pending_submission)
+
+    assert submission_store.get_all_submission_ids() == [
+        "testsubmission001",
+        "testsubmission002",
+    ]
+    assert submission_store.get_summaries(status=SubmissionStatus.PENDING) == [
+        get_submission_summary(pending_submission)
+    ]
+    completed_summaries = submission_store.get_summaries(
+        status=SubmissionStatus.COMPLETED
+    )
+    assert completed_summaries == SubmissionStore(config=config).get_summaries(
+        status=SubmissionStatus.COMPLETED
+    )
+    assert completed_summaries[0].content_digest == get_content_digest(
+        EXAMPLE_SUBMISSION.content
+    )
+    submission_store.close()
+
+    assert migrate_submission_store(config=config) == 2
+
+
+def test_indexed_store_incomplete_index(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+):
+    """Test that an index whose initial build was interrupted is rebuilt."""
+    config = config_sub_fixture.model_copy(
+        update={"submission_store_backend": SubmissionStoreBackend.INDEXED}
+    )
+    submission_store = IndexedSubmissionStore(config=config)
+    submission_store.insert_new(submission=EXAMPLE_SUBMISSION)
+    submission_store.close()
+
+    # simulate a build that was interrupted before it was marked as complete:
+    index_path = config.submission_store_dir / SUBMISSION_INDEX_FILENAME
+    connection = sqlite3.connect(index_path)
+    with connection:
+        connection.execute("DELETE FROM submissions")
+        connection.execute("DELETE FROM index_complete")
+    connection.close()
+
+    submission_store = IndexedSubmissionStore(config=config)
+    assert submission_store.get_all_submission_ids() == [EXAMPLE_SUBMISSION.id]
+    submission_store.close()
+
+
+def test_lazy_submission(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+):
+    """Test that the record of a submission can be read and updated without loading
+    its content and that submissions stored as a single document are migrated.
+    """
+    submission_store = SubmissionStore(config=config_sub_fixture)
+    submission_store.insert_new(submission=EXAMPLE_SUBMISSION)
+
+    lazy_submission = submission_store.get_lazy_by_id(
+        submission_id=EXAMPLE_SUBMISSION.id
+    )
+    assert lazy_submission.current_status == SubmissionStatus.COMPLETED
+    assert lazy_submission.has_content
+    assert "content" not in lazy_submission.__dict__
+    assert lazy_submission.accession_map == EXAMPLE_SUBMISSION.accession_map
+    assert lazy_submission.load() == EXAMPLE_SUBMISSION
+
+    updated_record = lazy_submission.record.model_copy(update={"title": "updated"})
+    submission_store.update_record(record=updated_record)
+    assert submission_store.get_by_id(
+        submission_id=EXAMPLE_SUBMISSION.id
+    ) == EXAMPLE_SUBMISSION.model_copy(update={"title": "updated"})
+
+    # a submission stored as single document by an earlier version:
+    legacy_submission = EXAMPLE_SUBMISSION.model_copy(update={"id": "legacy001"})
+    legacy_path = config_sub_fixture.submission_store_dir / "legacy001.json"
+    legacy_path.write_text(legacy_submission.model_dump_json(), encoding="utf-8")
+
+    assert submission_store.get_by_id(submission_id="legacy001") == legacy_submission
+    assert submission_store.migrate_layout() == 1
+    assert "content" not in json.loads(legacy_path.read_text(encoding="utf-8"))
+    assert submission_store.get_by_id(submission_id="legacy001") == legacy_submission
+
+
+def test_compressed_submission(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+):
+    """Test that submissions stored with compression are readable and that
+    previously stored uncompressed submissions remain readable.
+    """
+    SubmissionStore(config=config_sub_fixture).insert_new(submission=EXAMPLE_SUBMISSION)
+
+    config = config_sub_fixture.model_copy(
+        update={"submission_store_compression": StorageCompression.GZIP}
+    )
+    submission_store = SubmissionStore(config=config)
+    assert submission_store.get_by_id(EXAMPLE_SUBMISSION.id) == EXAMPLE_SUBMISSION
+
+    submission_updated = EXAMPLE_SUBMISSION.model_copy(
+        update={"content": {"test_class": [{"alias": "test_alias2"}]}}
+    )
+    submission_store.update_existing(submission=submission_updated)
+
+    content_paths = list((config.submission_store_dir / "content").iterdir())
+    assert [path.name for path in content_paths] == [f"{EXAMPLE_SUBMISSION.id}.json.gz"]
+    assert submission_store.get_by_id(EXAMPLE_SUBMISSION.id) == submission_updated
+
+
+def test_content_history(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+):
+    """Test that content versions are stored as deltas between periodic snapshots
+    and can be reconstructed.
+    """
+    config = config_sub_fixture.model_copy(
+        update={
+            "submission_store_history": True,
+            "submission_history_snapshot_interval": 3,
+        }
+    )
+    submission_store = SubmissionStore(
+        config=config, identifier_slots={"test_class": "alias"}
+    )
+    submission_store.insert_new(submission=EXAMPLE_SUBMISSION)
+
+    contents = [EXAMPLE_SUBMISSION.content]
+    for number in range(2, 7):
+        content = {
+            "test_class": [
+                {"alias": f"test_alias{alias}", "version": number}
+                for alias in range(number)
+            ]
+        }
+        submission_store.update_existing(
+            submission=EXAMPLE_SUBMISSION.model_copy(update={"content": content})
+        )
+        contents.append(content)
+    # unchanged content does not create a new version:
+    submission_store.update_existing(
+        submission=EXAMPLE_SUBMISSION.model_copy(update={"content": contents[-1]})
+    )
+
+    assert submission_store.get_content_versions(
+        submission_id=EXAMPLE_SUBMISSION.id
+    ) == [1, 2, 3, 4, 5, 6]
+    history_dir = config.submission_store_dir / "content_history" / "testsubmission001"
+    assert sorted(path.name for path in history_dir.iterdir()) == [
+        "00000001.snapshot.json",
+        "00000002.delta.json",
+        "00000003.delta.json",
+        "00000004.snapshot.json",
+        "00000005.delta.json",
+        "00000006.delta.json",
+    ]
+    for version, expected_content in enumerate(contents, start=1):
+        assert (
+            submission_store.get_content_version(
+                submission_id=EXAMPLE_SUBMISSION.id, version=version
+            )
+            == expected_content
+        )
+    assert submission_store.get_by_id(EXAMPLE_SUBMISSION.id).content == contents[-1]
+
+    with pytest.raises(SubmissionStore.ContentVersionDoesNotExistError):
+        submission_store.get_content_version(
+            submission_id=EXAMPLE_SUBMISSION.id, version=7
+        )
+
+
+def test_content_history_enabled_later(
+    config_sub_fixture: SubmissionConfig,  # noqa: F811
+):
+    """Test that content stored before the content history was enabled is kept as
+    base snapshot of the history.
+    """
+    SubmissionStore(config=config_sub_fixture).insert_new(submission=EXAMPLE_SUBMISSION)
+
+    config = config_sub_fixture.model_copy(update={"submission_store_history": True})
+    submission_store = SubmissionStore(
+        config=config, identifier_slots={"test_class": "alias"}
+    )
+    content = {"test_class": [{"alias": "test_alias1", "version": 2}]}
+    submission_store.update_existing(
+        submission=EXAMPLE_SUBMISSION.model_copy(update={"content": content})
+    )
+
+    history_dir = config.submission_store_dir / "content_history" / "testsubmission001"
+    assert sorted(path.name for path in history_dir.iterdir()) == [
+        "00000001.snapshot.json",
+        "00000002.delta.json",
+    ]
+    assert (
+        submission_store.get_content_version(
+            submission_id=EXAMPLE_SUBMISSION.id, version=1
+        )
+        == EXAMPLE_SUBMISSION.content
+    )
+    assert submission_store.get_by_id(EXAMPLE_SUBMISSION.id).content == content
+
+    # a history without any snapshot cannot be reconstructed:
+    (history_dir / "00000001.snapshot.json").unlink()
+    with pytest.raises(SubmissionStore.ContentHistoryCorruptError):
+        submission_store.get_content(submission_id=EXAMPLE_SUBMISSION.id)
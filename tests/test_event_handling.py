@@ -17,13 +17,26 @@
 """Test the event_handling module."""
 
 import json
+import os
 
 import pytest
 from hexkit.custom_types import Ascii, JsonObject
 from hexkit.protocols.eventsub import EventSubscriberProtocol
 from pydantic import UUID4, BaseModel, ConfigDict, Field
 
-from metldata.event_handling.event_handling import FileSystemEventSubscriber
+from metldata.compression import (
+    COMPRESSION_SUFFIXES,
+    ZSTD_AVAILABLE,
+    StorageCompression,
+)
+from metldata.event_handling.event_handling import (
+    EventStoreBackend,
+    FileSystemEventCollector,
+    FileSystemEventPublisher,
+    FileSystemEventSubscriber,
+    count_events,
+    read_events,
+)
 from tests.fixtures.event_handling import (
     Event,
     FileSystemEventFixture,
@@ -121,3 +134,156 @@ async def test_pub_collect_workflow(
 
     # check published events with collector:
     file_system_event_fixture.expect_events(expected_events)
+
+
+@pytest.mark.parametrize(
+    "compression",
+    [
+        StorageCompression.GZIP,
+        pytest.param(
+            StorageCompression.ZSTD,
+            marks=pytest.mark.skipif(
+                not ZSTD_AVAILABLE, reason="zstandard is not installed"
+            ),
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_compressed_events(
+    compression: StorageCompression,
+    file_system_event_fixture: FileSystemEventFixture,  # noqa: F811
+):
+    """Test that compressed events are written and that events of any compression
+    are collected.
+    """
+    expected_events = EXAMPLE_EVENTS.copy()
+    del expected_events[0]  # remove event with same key
+
+    # publish the first events uncompressed and the rest compressed:
+    await file_system_event_fixture.publish_events(EXAMPLE_EVENTS[:2])
+    file_system_event_fixture.publisher._config = (
+        file_system_event_fixture.config.model_copy(
+            update={"event_store_compression": compression}
+        )
+    )
+    await file_system_event_fixture.publish_events(EXAMPLE_EVENTS[2:])
+
+    topic_path = file_system_event_fixture.config.event_store_path / "topic1"
+    assert sorted(path.name for path in topic_path.iterdir()) == [
+        "key1.json",
+        "key2.json" + COMPRESSION_SUFFIXES[compression],
+    ]
+    file_system_event_fixture.expect_events(expected_events)
+
+
+@pytest.mark.asyncio
+async def test_events_with_stale_files(
+    file_system_event_fixture: FileSystemEventFixture,  # noqa: F811
+):
+    """Test that an event that is briefly stored with multiple compressions while it
+    is rewritten and leftover temporary files are neither counted nor read twice.
+    """
+    config = file_system_event_fixture.config.model_copy(
+        update={"event_store_compression": StorageCompression.GZIP}
+    )
+    publisher = FileSystemEventPublisher(config=config)
+    event = EXAMPLE_EVENTS[1]
+    await publisher.publish(
+        payload=event.payload, type_=event.type_, key=event.key, topic=event.topic
+    )
+
+    # an older uncompressed version of the event and a leftover temporary file:
+    topic_path = config.event_store_path / event.topic
+    stale_path = topic_path / f"{event.key}.json"
+    stale_path.write_text(json.dumps({"type_": "type1", "payload": {}}))
+    os.utime(stale_path, ns=(0, 0))
+    (topic_path / f"{event.key}.json.gz.1.2.tmp").write_text("{")
+
+    assert count_events(topic=event.topic, config=config) == 1
+    assert list(read_events(topic=event.topic, config=config)) == [event]
+
+
+@pytest.mark.asyncio
+async def test_segmented_log_events(
+    file_system_event_fixture: FileSystemEventFixture,  # noqa: F811
+):
+    """Test publishing, counting, and collecting events with the segmented log
+    backend.
+    """
+    config = file_system_event_fixture.config.model_copy(
+        update={"event_store_backend": EventStoreBackend.SEGMENTED_LOG}
+    )
+    file_system_event_fixture.config = config
+    file_system_event_fixture.publisher = FileSystemEventPublisher(config=config)
+    file_system_event_fixture.collector = FileSystemEventCollector(config=config)
+
+    expected_events = EXAMPLE_EVENTS.copy()
+    del expected_events[0]  # remove event with same key
+
+    await file_system_event_fixture.publish_events(EXAMPLE_EVENTS)
+
+    topic_path = config.event_store_path / "topic1"
+    assert all(
+        path.suffix in (".jsonl", ".index", ".lock") for path in topic_path.iterdir()
+    )
+    assert count_events(topic="topic1", config=config) == 2
+    assert count_events(topic="topic3", config=config) == 0
+    file_system_event_fixture.expect_events(expected_events)
+    file_system_event_fixture.publisher.close()
+
+
+@pytest.mark.parametrize("backend", EventStoreBackend)
+@pytest.mark.parametrize("read_ahead", [1, 4])
+@pytest.mark.asyncio
+async def test_subscriber_read_ahead(
+    backend: EventStoreBackend,
+    read_ahead: int,
+    file_system_event_fixture: FileSystemEventFixture,  # noqa: F811
+):
+    """Test that the events read ahead by the subscriber are consumed in the order
+    in which they are stored.
+    """
+    config = file_system_event_fixture.config.model_copy(
+        update={
+            "event_store_backend": backend,
+            "event_read_ahead": read_ahead,
+            "event_read_workers": 3,
+        }
+    )
+    publisher = FileSystemEventPublisher(config=config)
+    for number in range(20):
+        await publisher.publish(
+            payload={"number": number},
+            type_="type1",
+            key=f"key{number:02}",
+            topic="topic1",
+        )
+    publisher.close()
+
+    class OrderTrackingTranslator(EventSubscriberProtocol):
+        """Tracks the payloads of consumed events in the order of consumption."""
+
+        def __init__(self):
+            self.consumed_payloads: list[JsonObject] = []
+            self.topics_of_interest = {"topic1"}  # type: ignore
+            self.types_of_interest = {"type1"}  # type: ignore
+
+        async def _consume_validated(
+            self,
+            *,
+            payload: JsonObject,
+            type_: Ascii,
+            topic: Ascii,
+            key: Ascii,
+            event_id: UUID4,
+        ) -> None:
+            self.consumed_payloads.append(payload)
+
+    translator = OrderTrackingTranslator()
+    subscriber = FileSystemEventSubscriber(config=config, translator=translator)
+    await subscriber.run()
+
+    assert translator.consumed_payloads == [
+        event.payload for event in read_events(topic="topic1", config=config)
+    ]
+    assert len(translator.consumed_payloads) == 20
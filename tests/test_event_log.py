@@ -0,0 +1,127 @@
+# Copyright 2021 - 2026 Universität Tübingen, DKFZ, EMBL, and Universität zu Köln
+# for the German Human Genome-Phenome Archive (GHGA)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Test the segmented event log."""
+
+from pathlib import Path
+
+import pytest
+
+from metldata.event_handling.event_log import (
+    EventLog,
+    get_index_path,
+    get_segment_path,
+)
+
+EXPECTED_RECORDS = [
+    ("key2", {"number": 6}),
+    ("key3", {"number": 7}),
+    ("key0", {"number": 8}),
+    ("key1", {"number": 9}),
+]
+
+
+def write_example_log(log_path: Path) -> EventLog:
+    """Open a log for writing and append ten records with four distinct keys."""
+    event_log = EventLog(log_path=log_path, segment_size=100, writable=True)
+    for number in range(10):
+        event_log.append(key=f"key{number % 4}", value={"number": number})
+    return event_log
+
+
+def test_append_and_read(tmp_path: Path):
+    """Test that only the last record per key is live and that records are read in
+    the order of their last append across segments.
+    """
+    log_path = tmp_path / "topic"
+    with write_example_log(log_path) as event_log:
+        assert len(event_log) == 4
+        assert event_log.stale_records == 6
+        assert event_log.get("key1") == {"number": 9}
+        assert len(list(log_path.glob("*.jsonl"))) > 1
+        assert list(event_log) == EXPECTED_RECORDS
+
+        # readers load the log from the index files while it is open for writing:
+        with EventLog(log_path=log_path, segment_size=100) as reader:
+            assert list(reader) == EXPECTED_RECORDS
+            assert reader.stale_records == 6
+
+        with pytest.raises(EventLog.LockedError):
+            EventLog(log_path=log_path, segment_size=100, writable=True)
+
+    with EventLog(log_path=tmp_path / "missing", segment_size=100) as reader:
+        assert len(reader) == 0
+    assert not (tmp_path / "missing").exists()
+
+
+def test_compact(tmp_path: Path):
+    """Test that compaction drops stale records but retains the live ones, also for
+    readers opened before the compaction.
+    """
+    log_path = tmp_path / "topic"
+    with write_example_log(log_path) as event_log:
+        reader = EventLog(log_path=log_path, segment_size=100)
+        old_segments = sorted(log_path.glob("*.jsonl"))
+
+        event_log.compact()
+
+        assert event_log.stale_records == 0
+        assert list(event_log) == EXPECTED_RECORDS
+        assert not any(path.exists() for path in old_segments)
+        assert list(reader) == EXPECTED_RECORDS
+        reader.close()
+
+        # appending continues after compaction:
+        event_log.append(key="key4", value={"number": 10})
+
+    with EventLog(log_path=log_path, segment_size=100) as reader:
+        assert list(reader) == [*EXPECTED_RECORDS, ("key4", {"number": 10})]
+        assert reader.stale_records == 0
+
+
+def test_recover_interrupted_append(tmp_path: Path):
+    """Test that readers ignore records missing from the index and that the writer
+    indexes them, skipping corrupt records and truncating an incomplete one.
+    """
+    log_path = tmp_path / "topic"
+    with EventLog(log_path=log_path, segment_size=1000, writable=True) as event_log:
+        event_log.append(key="key1", value={"number": 1})
+        event_log.append(key="key2", value={"number": 2})
+
+    # simulate an append interrupted before the index was written, a corrupt
+    # record, and an append in progress:
+    segment_path = get_segment_path(log_path=log_path, segment=0)
+    index_path = get_index_path(log_path=log_path, segment=0)
+    index_lines = index_path.read_bytes().splitlines(keepends=True)
+    index_path.write_bytes(index_lines[0] + index_lines[1][:5])
+    with open(segment_path, "ab") as segment_file:
+        segment_file.write(b'{"key":"key3","val\n{"key":"key4","value":{}}\n{"key"')
+    segment_size = segment_path.stat().st_size
+
+    with EventLog(log_path=log_path, segment_size=1000) as reader:
+        assert list(reader) == [("key1", {"number": 1})]
+    assert segment_path.stat().st_size == segment_size
+
+    with EventLog(log_path=log_path, segment_size=1000, writable=True) as event_log:
+        assert list(event_log) == [
+            ("key1", {"number": 1}),
+            ("key2", {"number": 2}),
+            ("key4", {}),
+        ]
+        event_log.append(key="key5", value={"number": 5})
+
+    with EventLog(log_path=log_path, segment_size=1000) as reader:
+        assert reader.get_keys() == ["key1", "key2", "key4", "key5"]